@@ -1,16 +1,40 @@
 # import the following libraries
+import argparse
+from array import array
+import bisect
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from enum import Enum
+from functools import lru_cache
+import hashlib
 import io
 from json import tool
+import multiprocessing
 import os
+import queue
+import random
 import re
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import unicodedata
 
 # will convert the image to text string
 import pytesseract
 from pytesseract import Output
 
+# optional, keeps the language data loaded between calls instead of
+# starting a new tesseract process for every scan
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
 # adds image processing capabilities
 from PIL import Image as ig, ImageTk, ImageDraw, ImageFont
+import numpy as np
 
 # translates into the mentioned language
 from googletrans import Translator
@@ -26,14 +50,41 @@ import json
 import glob
 
 
+# path where the tesseract module is installed, set once for every call
+# falls back to whatever tesseract is on the PATH
+TESSERACT_CMD = os.environ.get(
+    'TESSERACT_CMD', 'C:/Program Files/Tesseract-OCR/tesseract.exe')
+if os.path.isfile(TESSERACT_CMD):
+    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+HORIZONTAL_OCR_CONFIG = r'-l jpn+eng --psm 6'
+VERTICAL_OCR_CONFIG = r'-l jpn_vert --psm 5'
+
+
+def get_ocr_config(is_vertical: bool) -> str:
+    """
+    Returns the tesseract config string for horizontal or vertical text
+
+    Parameters
+    ----------
+    is_vertical : bool
+        whether the text being scanned is printed vertically
+    """
+    if is_vertical == True:
+        return VERTICAL_OCR_CONFIG
+    return HORIZONTAL_OCR_CONFIG
+
+
 def run_ocr(img: Image, is_inverted: bool, is_vertical: bool, threshold: int) -> str:
     """
-    Applies various settings, then calls pytesseract.image_to_string
+    Applies various settings, then scans the image with the engine
+    returned by get_ocr_engine
 
     Parameters
     ----------
-    img: Image
-        an image containing text to be scanned
+    img: Image | np.ndarray
+        an image containing text to be scanned, or a grayscale crop
+        from GrayscalePage.crop
 
     is_inverted: bool
         whether to invert the values of the image
@@ -44,164 +95,4084 @@ def run_ocr(img: Image, is_inverted: bool, is_vertical: bool, threshold: int) ->
     threshold: int
         the threshold value for converting the image to black and white
     """
-    # path where the tesseract module is installed
-    pytesseract.pytesseract.tesseract_cmd = 'C:/Program Files/Tesseract-OCR/tesseract.exe'
-    custom_config = r'-l jpn+eng --psm 6'
-    if is_vertical == True:
-        custom_config = r'-l jpn_vert --psm 5'
-    ocr_output = pytesseract.image_to_string(make_ocr_ready(
-        img, is_inverted, threshold), config=custom_config)
+    if not isinstance(img, np.ndarray):
+        img = np.asarray(img.convert('L'))
+    config = get_ocr_config(is_vertical)
+    if ocr_cache is not None:
+        key = ocr_cache.get_key(img, is_inverted, is_vertical, threshold, config)
+        ocr_output = ocr_cache.get(key)
+        if ocr_output is not None:
+            return ocr_output
+    ocr_output = get_ocr_engine().image_to_string(make_ocr_ready(
+        img, is_inverted, threshold), config)
+    if ocr_cache is not None:
+        ocr_cache.put(key, ocr_output)
     return ocr_output
 
 
-def make_ocr_ready(img: Image, is_inverted: bool, threshold: int) -> Image:
+class OcrEngine():
     """
-    Processes the raw image to ensure optimal results from ocr
+    Runs tesseract inside the current process. With tesserocr installed,
+    the language data for each config is loaded once and kept, otherwise
+    every call falls back to pytesseract.
+
+    Methods
+    -------
+    image_to_string(img, config)
+        scans an image and returns the text
+
+    image_to_data(img, config)
+        scans an image and returns the lines and words found, with their
+        boxes and confidences
+
+    close()
+        frees the loaded language data
+    """
+
+    def __init__(self):
+        self.apis = {}
+
+    def get_api(self, config: str):
+        """
+        Returns the tesserocr api for a config string, creating it on
+        first use
+
+        Parameters
+        ----------
+        config: str
+            a tesseract config string, such as HORIZONTAL_OCR_CONFIG
+        """
+        if config not in self.apis:
+            lang = re.search(r'-l\s+(\S+)', config).group(1)
+            psm = int(re.search(r'--psm\s+(\d+)', config).group(1))
+            # tesserocr.PSM only holds the mode numbers, the api takes the int
+            self.apis[config] = tesserocr.PyTessBaseAPI(lang=lang, psm=psm)
+        return self.apis[config]
+
+    def image_to_string(self, img: Image, config: str) -> str:
+        """
+        Scans an image and returns the text
+
+        Parameters
+        ----------
+        img: Image
+            an image ready to be scanned, see make_ocr_ready
+
+        config: str
+            a tesseract config string, such as HORIZONTAL_OCR_CONFIG
+        """
+        if tesserocr is None:
+            return pytesseract.image_to_string(img, config=config)
+        api = self.get_api(config)
+        api.SetImage(img)
+        return api.GetUTF8Text()
+
+    def image_to_data(self, img: Image, config: str) -> dict:
+        """
+        Scans an image and returns the lines (level 4) and words (level 5)
+        found, in the form of pytesseract.image_to_data's Output.DICT
+
+        Parameters
+        ----------
+        img: Image
+            an image ready to be scanned, see make_ocr_ready
+
+        config: str
+            a tesseract config string, such as HORIZONTAL_OCR_CONFIG
+        """
+        if tesserocr is None:
+            return pytesseract.image_to_data(img, config=config, output_type=Output.DICT)
+        api = self.get_api(config)
+        api.SetImage(img)
+        api.Recognize()
+        d = {key: [] for key in ('level', 'block_num', 'par_num', 'line_num', 'word_num',
+                                 'left', 'top', 'width', 'height', 'conf', 'text')}
+
+        def add(level, box, conf, text):
+            d['level'].append(level)
+            d['block_num'].append(block_num)
+            d['par_num'].append(par_num)
+            d['line_num'].append(line_num)
+            d['word_num'].append(word_num)
+            d['left'].append(box[0])
+            d['top'].append(box[1])
+            d['width'].append(box[2] - box[0])
+            d['height'].append(box[3] - box[1])
+            d['conf'].append(conf)
+            d['text'].append(text)
+        block_num = par_num = line_num = word_num = 0
+        iterator = api.GetIterator()
+        for word in tesserocr.iterate_level(iterator, tesserocr.RIL.WORD):
+            box = word.BoundingBox(tesserocr.RIL.WORD)
+            if box is None:
+                continue
+            if word.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                block_num += 1
+                par_num = 0
+            if word.IsAtBeginningOf(tesserocr.RIL.PARA):
+                par_num += 1
+                line_num = 0
+            if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line_num += 1
+                word_num = 0
+                add(4, word.BoundingBox(tesserocr.RIL.TEXTLINE), -1, "")
+            word_num += 1
+            add(5, box, word.Confidence(tesserocr.RIL.WORD),
+                word.GetUTF8Text(tesserocr.RIL.WORD))
+        return d
+
+    def close(self):
+        for api in self.apis.values():
+            api.End()
+        self.apis.clear()
+
+
+def ocr_worker_main(connection):
+    """
+    The loop run by each process of an OcrWorkerPool. Receives
+    (method, config, mode, size, pixels) requests over the pipe and
+    sends back (ok, result) until it receives None or the pipe closes.
 
     Parameters
     ----------
-    img: Image
-        an image containing text to be scanned
+    connection: Connection
+        the worker's end of the pipe
+    """
+    engine = OcrEngine()
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        method, config, mode, size, pixels = request
+        try:
+            result = (True, getattr(engine, method)(
+                ig.frombytes(mode, size, pixels), config))
+        except Exception as e:
+            result = (False, repr(e))
+        connection.send(result)
+    engine.close()
 
-    is_inverted: bool
-        whether to invert the values of the image
 
-    threshold: int
-        the threshold value for converting the image to black and white
+class OcrWorkerPool():
     """
-    # make the image greyscale, then apply a threshold
-    img = img.convert('L')
-    # if we want to invert this image, it's done here
-    if is_inverted == True:
-        img = img.point(lambda p: 0 if p > (255-threshold) else 255)
-    else:
-        img = img.point(lambda p: 255 if p > threshold else 0)
-    return img
+    A pool of long-lived OCR processes, each running ocr_worker_main.
+    Images are sent to an idle worker over a pipe, so the language data
+    is loaded once per worker rather than once per scan. Workers that
+    crash or stop responding are replaced.
+
+    Attributes
+    ----------
+    size: int
+        the number of worker processes
 
+    timeout: float
+        how long to wait for a single scan before restarting its worker
 
-def get_translation(untranslated_text: str) -> str:
+    restarts: int
+        the number of workers that have been replaced
+
+    Methods
+    -------
+    image_to_string(img, config)
+        scans an image on an idle worker and returns the text
+
+    image_to_data(img, config)
+        scans an image on an idle worker and returns the lines and words
+
+    close()
+        stops all workers
     """
-    Translates text in Japanese to English
+
+    def __init__(self, size: int = None, timeout: float = 60):
+        self.size = size or os.cpu_count() or 1
+        self.timeout = timeout
+        self.restarts = 0
+        self.workers = []
+        self.idle = queue.Queue()
+        for i in range(self.size):
+            self.idle.put(self.start_worker())
+
+    def start_worker(self):
+        parent_connection, child_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=ocr_worker_main, args=(child_connection,), daemon=True)
+        process.start()
+        child_connection.close()
+        worker = (process, parent_connection)
+        self.workers.append(worker)
+        return worker
+
+    def restart_worker(self, worker):
+        process, connection = worker
+        process.kill()
+        process.join()
+        connection.close()
+        self.workers.remove(worker)
+        self.restarts += 1
+        return self.start_worker()
+
+    def call(self, method: str, img: Image, config: str):
+        """
+        Runs an OcrEngine method on an idle worker. Blocks until a worker
+        is free, so it is safe to call from several threads at once.
+
+        Parameters
+        ----------
+        method: str
+            the name of the OcrEngine method to run
+
+        img: Image
+            an image ready to be scanned, see make_ocr_ready
+
+        config: str
+            a tesseract config string, such as HORIZONTAL_OCR_CONFIG
+        """
+        request = (method, config, img.mode, img.size, img.tobytes())
+        worker = self.idle.get()
+        try:
+            # one retry, so a worker that died between jobs doesn't fail the scan
+            for attempt in range(2):
+                try:
+                    worker[1].send(request)
+                    if not worker[1].poll(self.timeout):
+                        raise TimeoutError
+                    ok, result = worker[1].recv()
+                    break
+                except (EOFError, OSError, TimeoutError):
+                    worker = self.restart_worker(worker)
+            else:
+                raise RuntimeError("OCR worker failed twice")
+        finally:
+            self.idle.put(worker)
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+    def image_to_string(self, img: Image, config: str) -> str:
+        """
+        Scans an image on an idle worker and returns the text
+
+        Parameters
+        ----------
+        img: Image
+            an image ready to be scanned, see make_ocr_ready
+
+        config: str
+            a tesseract config string, such as HORIZONTAL_OCR_CONFIG
+        """
+        return self.call('image_to_string', img, config)
+
+    def image_to_data(self, img: Image, config: str) -> dict:
+        """
+        Scans an image on an idle worker and returns the lines and words
+        found, see OcrEngine.image_to_data
+
+        Parameters
+        ----------
+        img: Image
+            an image ready to be scanned, see make_ocr_ready
+
+        config: str
+            a tesseract config string, such as HORIZONTAL_OCR_CONFIG
+        """
+        return self.call('image_to_data', img, config)
+
+    def close(self):
+        for process, connection in self.workers:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+        for process, connection in self.workers:
+            process.join(1)
+            if process.is_alive():
+                process.kill()
+            connection.close()
+        self.workers.clear()
+
+
+# the pool used by run_ocr once start_ocr_pool has been called, and the
+# engine used in its place by processes that don't have one
+ocr_pool = None
+ocr_engine = None
+
+
+def start_ocr_pool(size: int = None) -> OcrWorkerPool:
+    """
+    Starts the OCR worker pool used by run_ocr
 
     Parameters
     ----------
-    untranslated_text: str
-        text obtained by ocr, in the source language
+    size: int
+        the number of worker processes, defaults to the number of cores
     """
-    p = Translator()
-    # translates the text into english language
-    translator_output = p.translate(
-        untranslated_text, dest='english', src='japanese')
-    return translator_output.text
+    global ocr_pool
+    if ocr_pool is None:
+        ocr_pool = OcrWorkerPool(size)
+    return ocr_pool
 
 
-class SelectionItem():
+def get_ocr_engine():
     """
-    Represents the data of a single selection box
+    Returns the OCR worker pool if one has been started, otherwise an
+    OcrEngine that lives as long as the current process
+    """
+    global ocr_engine
+    if ocr_pool is not None:
+        return ocr_pool
+    if ocr_engine is None:
+        ocr_engine = OcrEngine()
+    return ocr_engine
 
-    Attributes
+
+def score_ocr_data(d: dict) -> tuple[float, int]:
+    """
+    Scores the result of image_to_data by the mean confidence of the words
+    found, with the number of characters found to break ties
+
+    Parameters
     ----------
-    coords : tuple[int, int, int, int]
-        coordinates of the selection box
+    d: dict
+        the result of image_to_data
+    """
+    confidences = []
+    characters = 0
+    for i in range(len(d['text'])):
+        if float(d['conf'][i]) >= 0 and str(d['text'][i]).strip() != "":
+            confidences.append(float(d['conf'][i]))
+            characters += len(str(d['text'][i]).strip())
+    if len(confidences) == 0:
+        return (0, 0)
+    return (sum(confidences) / len(confidences), characters)
 
-    ocr_output : str
-        the result of scanning the text in the image
 
-    is_inverted : bool
-        whether to invert the values of the image
+AUTO_THRESHOLDS = (127, 95, 159, 63, 191, 31, 223)
+
+
+def find_best_threshold(img: np.ndarray, is_vertical: bool, thresholds: tuple[int] = AUTO_THRESHOLDS,
+                        target_confidence: float = 90) -> tuple[int, bool, float]:
+    """
+    Scans an image at several thresholds, both inverted and not, and
+    returns the settings that tesseract is most confident about.
+    With an OCR worker pool the candidates are scanned in parallel, and
+    the search stops as soon as one reaches target_confidence.
+
+    Parameters
+    ----------
+    img: np.ndarray
+        the grayscale crop, from GrayscalePage.crop
 
     is_vertical : bool
         whether the text being scanned is printed vertically
 
+    thresholds: tuple[int]
+        the thresholds to try, most likely first
+
+    target_confidence: float
+        a mean word confidence good enough to stop searching at
+
+    Returns
+    -------
+        the best threshold, whether to invert, and its mean confidence
+    """
+    engine = get_ocr_engine()
+    config = get_ocr_config(is_vertical)
+    candidates = [(threshold, is_inverted) for threshold in thresholds
+                  for is_inverted in (False, True)]
+
+    def score(candidate):
+        return score_ocr_data(engine.image_to_data(make_ocr_ready(img, candidate[1], candidate[0]), config))
+    best_score, best_candidate = (-1, -1), candidates[0]
+    if not isinstance(engine, OcrWorkerPool):
+        # a single OcrEngine can only scan one image at a time
+        for candidate in candidates:
+            candidate_score = score(candidate)
+            if candidate_score > best_score:
+                best_score, best_candidate = candidate_score, candidate
+            if candidate_score[0] >= target_confidence:
+                break
+        return best_candidate[0], best_candidate[1], best_score[0]
+    executor = ThreadPoolExecutor(max_workers=engine.size)
+    futures = {executor.submit(score, candidate): candidate for candidate in candidates}
+    try:
+        for future in as_completed(futures):
+            candidate_score = future.result()
+            if candidate_score > best_score:
+                best_score, best_candidate = candidate_score, futures[future]
+            if candidate_score[0] >= target_confidence:
+                break
+    finally:
+        # stop early, scans that have already started finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+    return best_candidate[0], best_candidate[1], best_score[0]
+
+
+class OcrCache():
+    """
+    Remembers the results of run_ocr, keyed by a hash of the cropped
+    pixels and the settings they were scanned with, so scanning the same
+    region again is close to free. Recent results are kept in memory and
+    every result is also written to a directory, so they survive restarts.
+
+    Attributes
+    ----------
+    directory: str
+        the directory results are written to, or None to only use memory
+
+    max_entries: int
+        the number of results kept in memory
+
+    memory_hits: int
+        the number of lookups answered from memory
+
+    disk_hits: int
+        the number of lookups answered from the directory
+
+    misses: int
+        the number of lookups that needed a scan
+
+    Methods
+    -------
+    get_key(img, is_inverted, is_vertical, threshold, config)
+        returns the cache key for a crop and its settings
+
+    get(key)
+        returns the cached text for a key, or None
+
+    put(key, ocr_output)
+        stores the text for a key
+
+    stats()
+        returns the hit and miss counts
+    """
+
+    def __init__(self, directory: str = None, max_entries: int = 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(img: np.ndarray, is_inverted: bool, is_vertical: bool, threshold: int, config: str) -> str:
+        """
+        Returns the cache key for a crop and the settings it is scanned with
+
+        Parameters
+        ----------
+        img: np.ndarray
+            the grayscale crop, before make_ocr_ready
+
+        is_inverted: bool
+            whether to invert the values of the image
+
+        is_vertical : bool
+            whether the text being scanned is printed vertically
+
+        threshold: int
+            the threshold value for converting the image to black and white
+
+        config: str
+            the tesseract config string
+        """
+        h = hashlib.sha256()
+        h.update(repr((img.shape, bool(is_inverted),
+                 bool(is_vertical), int(threshold), config)).encode())
+        h.update(np.ascontiguousarray(img))
+        return h.hexdigest()
+
+    def get_file_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.txt')
+
+    def get(self, key: str) -> str:
+        """
+        Returns the cached text for a key, or None if it hasn't been scanned
+
+        Parameters
+        ----------
+        key: str
+            a key made by get_key
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.memory_hits += 1
+                return self.entries[key]
+        if self.directory is not None:
+            try:
+                with io.open(self.get_file_path(key), 'r', encoding='utf-8', newline='') as infile:
+                    ocr_output = infile.read()
+            except OSError:
+                pass
+            else:
+                with self.lock:
+                    self.disk_hits += 1
+                    self.remember(key, ocr_output)
+                return ocr_output
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, ocr_output: str):
+        """
+        Stores the text for a key in memory and in the directory
+
+        Parameters
+        ----------
+        key: str
+            a key made by get_key
+
+        ocr_output: str
+            the result of scanning the crop
+        """
+        with self.lock:
+            self.remember(key, ocr_output)
+        if self.directory is not None:
+            file_path = self.get_file_path(key)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            # write then rename, so a crash never leaves half a result behind
+            temp_path = file_path + '.' + str(os.getpid()) + '.tmp'
+            with io.open(temp_path, 'w', encoding='utf-8', newline='') as outfile:
+                outfile.write(ocr_output)
+            os.replace(temp_path, file_path)
+
+    def remember(self, key: str, ocr_output: str):
+        self.entries[key] = ocr_output
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """
+        Returns the number of memory hits, disk hits and misses
+        """
+        with self.lock:
+            return {"memory_hits": self.memory_hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+
+# the cache used by run_ocr once open_ocr_cache has been called
+ocr_cache = None
+
+
+def open_ocr_cache(source_directory: str = None) -> OcrCache:
+    """
+    Sets up the cache used by run_ocr. Results are stored in the
+    ocr-cache directory of the project.
+
+    Parameters
+    ----------
+    source_directory: str
+        the path of the directory containing all the files to be
+        translated, or None to only cache in memory
+    """
+    global ocr_cache
+    directory = None
+    if source_directory is not None:
+        directory = source_directory + "/ocr-cache"
+    ocr_cache = OcrCache(directory)
+    return ocr_cache
+
+
+def format_cache_stats(stats: dict) -> str:
+    """
+    Formats the counts returned by OcrCache.stats for display
+
+    Parameters
+    ----------
+    stats: dict
+        the hit and miss counts
+    """
+    hits = stats["memory_hits"] + stats["disk_hits"]
+    total = hits + stats["misses"]
+    rate = hits / total if total else 0
+    return f"OCR cache: {hits} hits ({stats['disk_hits']} from disk), {stats['misses']} misses, {rate:.0%} hit rate"
+
+
+@lru_cache(maxsize=None)
+def get_threshold_table(threshold: int, is_inverted: bool) -> np.ndarray:
+    """
+    Returns a 256 entry lookup table mapping grey values to black or white.
+    Tables are cached, so there is one per (threshold, is_inverted) pair.
+
+    Parameters
+    ----------
     threshold: int
         the threshold value for converting the image to black and white
 
-    translation: str
-        the translated text
+    is_inverted: bool
+        whether to invert the values of the image
+    """
+    values = np.arange(256)
+    # if we want to invert this image, it's done here
+    if is_inverted == True:
+        table = np.where(values > 255 - threshold, 0, 255).astype(np.uint8)
+    else:
+        table = np.where(values > threshold, 255, 0).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+
+def make_ocr_ready(img: Image, is_inverted: bool, threshold: int) -> Image:
+    """
+    Processes the raw image to ensure optimal results from ocr
+
+    Parameters
+    ----------
+    img: Image | np.ndarray
+        an image containing text to be scanned, or a grayscale crop
+        from GrayscalePage.crop
+
+    is_inverted: bool
+        whether to invert the values of the image
+
+    threshold: int
+        the threshold value for converting the image to black and white
+    """
+    # make the image greyscale, then apply a threshold
+    if not isinstance(img, np.ndarray):
+        img = np.asarray(img.convert('L'))
+    return ig.fromarray(get_threshold_table(int(threshold), bool(is_inverted))[img])
+
+
+class GrayscalePage():
+    """
+    A page image converted to grayscale once, so that crops of it can be
+    thresholded repeatedly without converting them again
+
+    Attributes
+    ----------
+    gray: np.ndarray
+        the grayscale pixels of the page, indexed [y, x]
+
+    width: int
+        the width of the page
+
+    height: int
+        the height of the page
 
     Methods
     -------
-    to_json()
-        returns all data in json serializable form
+    crop(coords)
+        returns the grayscale pixels inside a box, without copying them
+
+    get_binary(threshold, is_inverted)
+        returns the page thresholded, kept for the next call
     """
-    # TODO: docstrings consisting mostly of apologies and excuses
 
-    def __init__(self):
-        self.coords = (0, 0, 0, 0)
-        self.ocr_output = ""
-        self.is_inverted = False
-        self.is_vertical = False
-        self.threshold = 127
-        self.translation = ""
+    def __init__(self, img: Image):
+        self.gray = np.asarray(img.convert('L'))
+        self.height, self.width = self.gray.shape
+        self.binary = None
+        self.binary_settings = None
 
-    def to_json(self):
+    def get_binary(self, threshold: int = 127, is_inverted: bool = False) -> np.ndarray:
         """
-        Returns all data in json serializable form
+        Returns the page thresholded, with background pixels True. The
+        result is kept, so clicking around a page only thresholds it once.
+
+        Parameters
+        ----------
+        threshold: int
+            pixels at least this bright are background
+
+        is_inverted: bool
+            whether the background is dark instead
         """
-        return json.dumps(self, default=lambda o: o.__dict__,
-                          sort_keys=True, indent=4)
+        if self.binary_settings != (threshold, is_inverted):
+            self.binary = (self.gray < threshold) if is_inverted else (self.gray >= threshold)
+            self.binary_settings = (threshold, is_inverted)
+        return self.binary
 
+    def crop(self, coords: tuple[float, float, float, float]) -> np.ndarray:
+        """
+        Returns a view of the grayscale pixels inside a box, clipped to the
+        page and at least one pixel in size
 
-class ToolType(Enum):
-    SELECT = 0
-    ADD = 1
-    CROP = 2
-    DELETE = 3
-    JOIN = 4
-    SPLIT = 5
-    TRANSFORM = 6
+        Parameters
+        ----------
+        coords: tuple[float, float, float, float]
+            the coordinates of the box
+        """
+        x0 = min(max(int(round(coords[0])), 0), self.width - 1)
+        y0 = min(max(int(round(coords[1])), 0), self.height - 1)
+        x1 = min(max(int(round(coords[2])), x0 + 1), self.width)
+        y1 = min(max(int(round(coords[3])), y0 + 1), self.height)
+        return self.gray[y0:y1, x0:x1]
 
 
-class Model():
+def load_page(file_path: str) -> tuple[Image, GrayscalePage]:
     """
-    All the data
+    Opens and decodes a page image, and converts it to grayscale
 
-    Attributes
+    Parameters
     ----------
-    paths : list[str]
-        list of image file paths in source directory
+    file_path: str
+        the path of the image file
+    """
+    img = ig.open(file_path)
+    # ig.open only reads the header, decode now rather than on first use
+    img.load()
+    return img, GrayscalePage(img)
+
+
+def get_page_size(page: tuple[Image, GrayscalePage]) -> int:
+    """
+    Returns roughly how many bytes a decoded page takes up
+
+    Parameters
+    ----------
+    page: tuple[Image, GrayscalePage]
+        a page returned by load_page
+    """
+    img, gray_page = page
+    return img.width * img.height * len(img.getbands()) + gray_page.gray.nbytes
+
+
+class PageCache():
+    """
+    Keeps recently used pages decoded, up to a memory budget, and decodes
+    the pages around the current one on a background thread, so flipping
+    between pages doesn't wait on the decoder.
+
+    Attributes
+    ----------
+    source_directory: str
+        the directory the pages are in
+
+    max_bytes: int
+        the memory budget, the least recently used pages are dropped
+        beyond it
+
+    prefetch_pages: int
+        how many pages either side of the current one are decoded ahead
+
+    pages: OrderedDict[str, tuple[Image, GrayscalePage]]
+        the decoded pages, least recently used first
+
+    pending: dict[str, Future]
+        the pages being decoded in the background
+
+    hits: int
+        the number of pages that were already decoded
+
+    prefetch_waits: int
+        the number of pages that were still being decoded in the background
+
+    misses: int
+        the number of pages that had to be decoded when asked for
+
+    Methods
+    -------
+    get(path)
+        returns a decoded page
+
+    prefetch(paths, path)
+        decodes the pages around a page in the background
+
+    invalidate(path)
+        forgets a page whose file has changed
+
+    stats()
+        returns the hit and miss counts and the memory used
+
+    close()
+        stops decoding in the background
+    """
+
+    def __init__(self, source_directory: str, max_bytes: int = 512 * 2 ** 20, prefetch_pages: int = 2):
+        self.source_directory = source_directory
+        self.max_bytes = max_bytes
+        self.prefetch_pages = prefetch_pages
+        self.pages = OrderedDict()
+        self.size = 0
+        self.pending = {}
+        self.lock = threading.Lock()
+        # one thread, so prefetching never competes with OCR for more than a core
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.hits = 0
+        self.prefetch_waits = 0
+        self.misses = 0
+
+    def get(self, path: str) -> tuple[Image, GrayscalePage]:
+        """
+        Returns a page decoded, from the cache if possible
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image, relative to source_directory
+
+        Returns
+        -------
+            the decoded image and its grayscale pixels
+        """
+        with self.lock:
+            page = self.pages.get(path)
+            if page is not None:
+                self.pages.move_to_end(path)
+                self.hits += 1
+                return page
+            future = self.pending.get(path)
+            if future is not None:
+                self.prefetch_waits += 1
+            else:
+                self.misses += 1
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                # a failed prefetch is retried in the foreground to surface the error
+                pass
+        page = load_page(self.source_directory + "/" + path)
+        self.store(path, page)
+        return page
+
+    def store(self, path: str, page: tuple[Image, GrayscalePage]):
+        """
+        Adds a decoded page, dropping the least recently used pages that
+        no longer fit in the budget. The newest page is always kept.
+        """
+        with self.lock:
+            if path in self.pages:
+                self.size -= get_page_size(self.pages.pop(path))
+            self.pages[path] = page
+            self.size += get_page_size(page)
+            while self.size > self.max_bytes and len(self.pages) > 1:
+                self.size -= get_page_size(self.pages.popitem(last=False)[1])
+
+    def load_in_background(self, path: str) -> tuple[Image, GrayscalePage]:
+        try:
+            page = load_page(self.source_directory + "/" + path)
+            self.store(path, page)
+            return page
+        finally:
+            with self.lock:
+                self.pending.pop(path, None)
+
+    def prefetch(self, paths: list[str], path: str):
+        """
+        Starts decoding the pages either side of a page that aren't
+        decoded yet, nearest first
+
+        Parameters
+        ----------
+        paths: list[str]
+            every page, in reading order
+
+        path: str
+            the page being worked on
+        """
+        if path not in paths or len(paths) < 2:
+            return
+        index = paths.index(path)
+        neighbors = []
+        for distance in range(1, self.prefetch_pages + 1):
+            for step in (distance, -distance):
+                neighbor = paths[(index + step) % len(paths)]
+                if neighbor != path and neighbor not in neighbors:
+                    neighbors.append(neighbor)
+        with self.lock:
+            for neighbor in neighbors:
+                if neighbor in self.pages or neighbor in self.pending:
+                    continue
+                self.pending[neighbor] = self.executor.submit(
+                    self.load_in_background, neighbor)
+
+    def invalidate(self, path: str):
+        """
+        Forgets a decoded page, so it is decoded again from its file.
+        A decode already under way is waited for first.
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image, relative to source_directory
+        """
+        with self.lock:
+            future = self.pending.get(path)
+        if future is not None:
+            try:
+                future.result()
+            except Exception:
+                pass
+        with self.lock:
+            if path in self.pages:
+                self.size -= get_page_size(self.pages.pop(path))
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"hits": self.hits, "prefetch_waits": self.prefetch_waits, "misses": self.misses,
+                    "pages": len(self.pages), "bytes": self.size}
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def format_page_cache_stats(stats: dict) -> str:
+    """
+    Formats the counts returned by PageCache.stats for display
+
+    Parameters
+    ----------
+    stats: dict
+        the hit and miss counts and the memory used
+    """
+    hits = stats["hits"] + stats["prefetch_waits"]
+    total = hits + stats["misses"]
+    rate = hits / total if total else 0
+    return (f"Page cache: {hits} hits ({stats['prefetch_waits']} still decoding), {stats['misses']} misses, "
+            f"{rate:.0%} hit rate, {stats['pages']} pages in {stats['bytes'] / 2 ** 20:.0f}MB")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Folds fullwidth and halfwidth forms together and collapses whitespace
+    and newlines, so that the same text scanned twice compares equal
+
+    Parameters
+    ----------
+    text: str
+        text obtained by ocr
+    """
+    return " ".join(unicodedata.normalize('NFKC', text).split())
+
+
+class TranslationMemory():
+    """
+    Remembers every translation in an SQLite database, keyed by normalized
+    text and language pair, so text that has been translated before is
+    never sent to a backend again. The database can be shared by every
+    chapter of a series.
+
+    Attributes
+    ----------
+    file_path: str
+        the path of the database
+
+    hits: int
+        the number of texts found in the memory
+
+    misses: int
+        the number of texts that had to be translated
+
+    Methods
+    -------
+    lookup(texts, src, dest)
+        returns the remembered translations of some texts
+
+    store(translations, src, dest)
+        remembers some translations
+
+    stats()
+        returns the hit and miss counts
+
+    close()
+        closes the database
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        # shared by the gui's worker threads, and by batch worker processes
+        self.connection = sqlite3.connect(
+            file_path, timeout=30, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS translations (src TEXT NOT NULL, dest TEXT NOT NULL, '
+                                'source_text TEXT NOT NULL, translation TEXT NOT NULL, PRIMARY KEY (src, dest, source_text))')
+        self.connection.commit()
+
+    def lookup(self, texts: list[str], src: str, dest: str) -> dict[str, str]:
+        """
+        Returns the remembered translations of some texts
+
+        Parameters
+        ----------
+        texts: list[str]
+            texts normalized with normalize_text
+
+        src: str
+            the language translated from
+
+        dest: str
+            the language translated to
+
+        Returns
+        -------
+            the translation of each text that was found
+        """
+        found = {}
+        texts = list(dict.fromkeys(texts))
+        with self.lock:
+            # stay under sqlite's limit on the number of parameters
+            for i in range(0, len(texts), 500):
+                chunk = texts[i:i + 500]
+                rows = self.connection.execute('SELECT source_text, translation FROM translations WHERE src = ? AND dest = ? '
+                                               f'AND source_text IN ({",".join("?" * len(chunk))})', [src, dest] + chunk)
+                found.update(rows)
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def store(self, translations: dict[str, str], src: str, dest: str):
+        """
+        Remembers some translations
+
+        Parameters
+        ----------
+        translations: dict[str, str]
+            the translation of each text normalized with normalize_text
+
+        src: str
+            the language translated from
+
+        dest: str
+            the language translated to
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.executemany('INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)',
+                                            [(src, dest, text, translation) for text, translation in translations.items()])
+
+    def stats(self) -> dict:
+        """
+        Returns the number of hits and misses
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+# the memory consulted by every backend once open_translation_memory has been called
+translation_memory = None
+
+
+def open_translation_memory(file_path: str) -> TranslationMemory:
+    """
+    Opens the translation memory consulted by every TranslationBackend,
+    closing the previous one
+
+    Parameters
+    ----------
+    file_path: str
+        the path of the database, created if it doesn't exist
+    """
+    global translation_memory
+    if translation_memory is not None:
+        translation_memory.close()
+    translation_memory = TranslationMemory(file_path)
+    return translation_memory
+
+
+def get_translation_memory_path(source_directory: str) -> str:
+    """
+    Returns the default path of a project's translation memory
+
+    Parameters
+    ----------
+    source_directory: str
+        the path of the directory containing all the files to be translated
+    """
+    return source_directory + "/translation-memory.sqlite3"
+
+
+def format_translation_memory_stats(stats: dict) -> str:
+    """
+    Formats the counts returned by TranslationMemory.stats for display
+
+    Parameters
+    ----------
+    stats: dict
+        the hit and miss counts
+    """
+    total = stats["hits"] + stats["misses"]
+    rate = stats["hits"] / total if total else 0
+    return f"Translation memory: {stats['hits']} hits, {stats['misses']} sent to translator, {rate:.0%} hit rate"
+
+
+class TokenBucket():
+    """
+    A token bucket rate limiter. Tokens refill at rate per second, up to
+    capacity, and each request takes one.
+
+    Attributes
+    ----------
+    rate: float
+        the tokens added per second, or None for no limit
+
+    capacity: float
+        the most tokens that can build up, allowing short bursts
+
+    Methods
+    -------
+    acquire()
+        waits until a token is available, then takes it
+    """
+
+    def __init__(self, rate: float = None, capacity: float = 1):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Waits until a token is available, then takes it
+        """
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens +
+                                  (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class TranslationBackend():
+    """
+    Base class for translators. Texts are translated in batches, each
+    batch sent by send_batch as a single request. Batches are sent in
+    parallel, but never more than max_in_flight at once or faster than the
+    rate limiter allows. A request that fails or takes longer than timeout
+    is retried with exponential backoff.
+
+    Attributes
+    ----------
+    src: str
+        the language translated from
+
+    dest: str
+        the language translated to
+
+    memory_dest: str
+        the language the translation memory files translations under
+
+    max_batch_size: int
+        the most texts sent in one request
+
+    max_batch_chars: int
+        the most characters sent in one request
+
+    max_in_flight: int
+        the most requests waiting for a reply at once
+
+    rate_limiter: TokenBucket
+        limits how many requests are sent per second
+
+    timeout: float
+        the seconds a request may take before it is given up on
+
+    max_retries: int
+        how many times a failed request is retried
+
+    backoff: float
+        the seconds waited before the first retry, doubling for each retry
+
+    requests: int
+        the number of requests sent so far
+
+    failures: int
+        the number of requests that failed or timed out
+
+    Methods
+    -------
+    translate(text)
+        translates a single text
+
+    translate_batch(texts)
+        translates many texts, in as few requests as possible
+
+    send_batch(texts)
+        sends a single request, implemented by subclasses
+    """
+
+    def __init__(self, src: str = 'ja', dest: str = 'en', max_batch_size: int = 100, max_batch_chars: int = 4500,
+                 max_in_flight: int = 4, rate: float = None, burst: int = 1, timeout: float = 30,
+                 max_retries: int = 4, backoff: float = 1):
+        self.src = src
+        self.dest = dest
+        self.memory_dest = dest
+        self.max_batch_size = max_batch_size
+        self.max_batch_chars = max_batch_chars
+        self.max_in_flight = max_in_flight
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.rate_limiter = TokenBucket(rate, burst)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self.requests = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+    def translate(self, text: str) -> str:
+        """
+        Translates a single text
+
+        Parameters
+        ----------
+        text: str
+            text obtained by ocr, in the source language
+        """
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        """
+        Translates many texts, splitting them into as few batches as
+        max_batch_size and max_batch_chars allow. Texts are normalized with
+        normalize_text, texts found in the translation memory aren't sent,
+        and repeated texts are only sent once.
+
+        Parameters
+        ----------
+        texts: list[str]
+            texts obtained by ocr, in the source language
+
+        Returns
+        -------
+            the translations, in the same order as texts
+        """
+        keys = [normalize_text(text) for text in texts]
+        unique_keys = [key for key in dict.fromkeys(keys) if key != ""]
+        translations = {"": ""}
+        if translation_memory is not None:
+            translations.update(translation_memory.lookup(
+                unique_keys, self.src, self.memory_dest))
+        batches = []
+        batch = []
+        batch_chars = 0
+        for key in unique_keys:
+            if key in translations:
+                continue
+            if batch and (len(batch) >= self.max_batch_size or batch_chars + len(key) > self.max_batch_chars):
+                batches.append(batch)
+                batch = []
+                batch_chars = 0
+            batch.append(key)
+            batch_chars += len(key) + 1
+        if batch:
+            batches.append(batch)
+        new_translations = {}
+        if len(batches) == 1:
+            # no need to hand a single request to another thread
+            new_translations.update(zip(batches[0], self.send_limited(batches[0])))
+        else:
+            for batch, batch_translations in zip(batches, self.executor.map(self.send_limited, batches)):
+                new_translations.update(zip(batch, batch_translations))
+        if translation_memory is not None and len(new_translations) > 0:
+            translation_memory.store(
+                new_translations, self.src, self.memory_dest)
+        translations.update(new_translations)
+        return [translations[key] for key in keys]
+
+    def send_limited(self, texts: list[str]) -> list[str]:
+        """
+        Sends a single request with send_batch, within the concurrency and
+        rate limits, retrying with exponential backoff if it fails or
+        times out
+
+        Parameters
+        ----------
+        texts: list[str]
+            texts normalized with normalize_text
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                # released by send_with_timeout's thread once the request has
+                # finished. Waiting is bounded too, so hung requests holding
+                # every slot are retried and reported rather than waited on forever
+                if not self.in_flight.acquire(timeout=self.timeout):
+                    raise TimeoutError(
+                        f"no request slot was free within {self.timeout} seconds")
+                with self.lock:
+                    self.requests += 1
+                translations = self.send_with_timeout(texts)
+                if len(translations) != len(texts):
+                    raise ValueError(
+                        f"sent {len(texts)} texts but got {len(translations)} translations")
+                return translations
+            except Exception:
+                with self.lock:
+                    self.failures += 1
+                if attempt == self.max_retries:
+                    raise
+            # full jitter, so throttled threads don't all retry at once
+            time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    def send_with_timeout(self, texts: list[str]) -> list[str]:
+        # a daemon thread, so a request that never returns can't stall anything else.
+        # It holds the caller's in_flight slot until the request really ends, so
+        # requests that time out still count against max_in_flight
+        result = {}
+
+        def send():
+            try:
+                result["translations"] = self.send_batch(texts)
+            except Exception as e:
+                result["error"] = e
+            finally:
+                self.in_flight.release()
+        thread = threading.Thread(target=send, daemon=True)
+        thread.start()
+        thread.join(self.timeout)
+        if thread.is_alive():
+            raise TimeoutError(
+                f"translation took longer than {self.timeout} seconds")
+        if "error" in result:
+            raise result["error"]
+        return result["translations"]
+
+    def send_batch(self, texts: list[str]) -> list[str]:
+        """
+        Sends a single request translating every text, implemented by
+        subclasses
+
+        Parameters
+        ----------
+        texts: list[str]
+            texts normalized with normalize_text
+        """
+        raise NotImplementedError
+
+
+class GoogleTranslationBackend(TranslationBackend):
+    """
+    Translates with googletrans. One Translator is kept for every request,
+    so its connection is reused. A batch is sent as one text with a box on
+    each line, and split back apart by line.
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.translator = Translator(timeout=self.timeout)
+
+    def send_batch(self, texts: list[str]) -> list[str]:
+        # normalize_text has already turned each box into a single line
+        translator_output = self.translator.translate(
+            "\n".join(texts), dest=self.dest, src=self.src)
+        translations = translator_output.text.split("\n")
+        if len(translations) != len(texts):
+            # the lines didn't survive translation, so send them one at a time
+            translations = [self.translator.translate(
+                text, dest=self.dest, src=self.src).text for text in texts]
+        return translations
+
+
+class DictionaryTranslationBackend(TranslationBackend):
+    """
+    Translates offline with a dictionary file, for use without a network
+    connection. A text found in the dictionary is translated whole,
+    otherwise the longest known phrases in it are replaced one by one and
+    anything unknown is left as it is.
+
+    The dictionary is a UTF-8 JSON object mapping source text to
+    translation, or a text file with one tab separated pair per line.
+
+    Attributes
+    ----------
+    entries: dict[str, str]
+        the translation of each normalized source phrase
+
+    longest_entry: int
+        the length of the longest source phrase
+    """
+
+    def __init__(self, dictionary_path: str = None, **options):
+        # nothing is sent over a network, so there is nothing to limit
+        options.setdefault('max_in_flight', os.cpu_count() or 1)
+        super().__init__(**options)
+        self.memory_dest = self.dest + '-dictionary'
+        self.entries = {}
+        if dictionary_path is not None:
+            with io.open(dictionary_path, 'r', encoding='utf-8') as infile:
+                if dictionary_path.endswith('.json'):
+                    pairs = json.load(infile).items()
+                else:
+                    pairs = [line.rstrip('\n').split('\t', 1)
+                             for line in infile if '\t' in line]
+            self.entries = {normalize_text(source): translation
+                            for source, translation in pairs}
+        self.longest_entry = max((len(source)
+                                 for source in self.entries), default=0)
+
+    def send_batch(self, texts: list[str]) -> list[str]:
+        return [self.translate_text(text) for text in texts]
+
+    def translate_text(self, text: str) -> str:
+        if text in self.entries:
+            return self.entries[text]
+        words = []
+        unknown = ""
+        i = 0
+        while i < len(text):
+            for length in range(min(self.longest_entry, len(text) - i), 0, -1):
+                if text[i:i + length] in self.entries:
+                    break
+            else:
+                length = 0
+            if length == 0:
+                # keep unknown characters together, rather than one word each
+                unknown += text[i]
+                i += 1
+            else:
+                if unknown.strip():
+                    words.append(unknown.strip())
+                unknown = ""
+                words.append(self.entries[text[i:i + length]])
+                i += length
+        if unknown.strip():
+            words.append(unknown.strip())
+        return " ".join(words)
+
+
+class MockTranslationBackend(TranslationBackend):
+    """
+    A deterministic offline stand-in for testing. Translates by prefixing
+    the destination language, and remembers every batch sent. It can be
+    made slow or unreliable to exercise the limits and retries.
+
+    Attributes
+    ----------
+    latency: float
+        the seconds each request takes
+
+    fail_first: int
+        how many requests fail before any succeed
+
+    batches: list[list[str]]
+        every batch sent, in order
+    """
+
+    def __init__(self, latency: float = 0, fail_first: int = 0, **options):
+        options.setdefault('backoff', 0)
+        super().__init__(**options)
+        # keep fake translations apart from real ones in the translation memory
+        self.memory_dest = self.dest + '-mock'
+        self.latency = latency
+        self.fail_first = fail_first
+        self.batches = []
+
+    def send_batch(self, texts: list[str]) -> list[str]:
+        with self.lock:
+            self.batches.append(list(texts))
+            failing = len(self.batches) <= self.fail_first
+        time.sleep(self.latency)
+        if failing:
+            raise ConnectionError("mock translation failure")
+        return [f"[{self.dest}] " + text for text in texts]
+
+
+TRANSLATION_BACKENDS = {
+    'google': GoogleTranslationBackend,
+    'dictionary': DictionaryTranslationBackend,
+    'mock': MockTranslationBackend,
+}
+
+
+def make_translation_backend(name: str = 'google', **options) -> TranslationBackend:
+    """
+    Creates a translation backend by name
+
+    Parameters
+    ----------
+    name: str
+        a key of TRANSLATION_BACKENDS
+
+    options: dict
+        passed on to the backend, see TranslationBackend
+    """
+    return TRANSLATION_BACKENDS[name](**options)
+
+
+# the backend used by get_translation, created on first use
+translation_backend = None
+
+
+def set_translation_backend(backend: TranslationBackend):
+    """
+    Sets the backend used by get_translation and translate_selection_items
+
+    Parameters
+    ----------
+    backend: TranslationBackend
+        the backend to use
+    """
+    global translation_backend
+    translation_backend = backend
+
+
+def get_translation_backend() -> TranslationBackend:
+    """
+    Returns the backend set by set_translation_backend, or a
+    GoogleTranslationBackend if none has been set
+    """
+    global translation_backend
+    if translation_backend is None:
+        translation_backend = GoogleTranslationBackend()
+    return translation_backend
+
+
+def get_translation(untranslated_text: str) -> str:
+    """
+    Translates text in Japanese to English
+
+    Parameters
+    ----------
+    untranslated_text: str
+        text obtained by ocr, in the source language
+    """
+    return get_translation_backend().translate(untranslated_text)
+
+
+def translate_selection_items(selection_items: list, backend: TranslationBackend = None) -> int:
+    """
+    Translates every selection box that has ocr output but no translation,
+    in batches
+
+    Parameters
+    ----------
+    selection_items: list[SelectionItem]
+        the boxes to translate, from one page or many
+
+    backend: TranslationBackend
+        the backend to use, defaults to get_translation_backend()
+
+    Returns
+    -------
+        the number of boxes translated
+
+    Side Effects
+    ------------
+        the translation of each untranslated box is set
+    """
+    pending = [s for s in selection_items
+               if s.translation == "" and s.ocr_output.strip() != ""]
+    if len(pending) == 0:
+        return 0
+    if backend is None:
+        backend = get_translation_backend()
+    translations = backend.translate_batch([s.ocr_output for s in pending])
+    for s, translation in zip(pending, translations):
+        s.translation = translation
+    return len(pending)
+
+
+# words tesseract is less confident about than this are scanned again box by box
+MIN_PAGE_OCR_CONFIDENCE = 60
+# the fewest boxes needing a scan for a whole page scan to be worth it
+MIN_BOXES_FOR_PAGE_OCR = 3
+
+
+class PageOcrResult():
+    """
+    The lines and words found by a single tesseract pass over a whole page,
+    so that the text of any box on the page can be read from them without
+    scanning the box again
+
+    Attributes
+    ----------
+    lines: list[tuple[int, int, int, int]]
+        the bounding box of each text line, in reading order
+
+    words: list[tuple[tuple[int, int, int], tuple[int, int, int, int], str, float]]
+        the (block, paragraph, line) number, bounding box, text and
+        confidence of each word, in reading order
+
+    Methods
+    -------
+    get_text(coords)
+        returns the text of the words inside a box and their confidence
+    """
+
+    def __init__(self, d: dict):
+        """
+        Parameters
+        ----------
+        d: dict
+            the result of image_to_data over the whole page
+        """
+        self.lines = []
+        self.words = []
+        for i in range(len(d['text'])):
+            (x, y, w, h) = (d['left'][i], d['top']
+                            [i], d['width'][i], d['height'][i])
+            if int(d['level'][i]) == 4:
+                self.lines.append((x, y, x+w, y+h))
+            elif int(d['level'][i]) == 5 and str(d['text'][i]).strip() != "":
+                self.words.append(((int(d['block_num'][i]), int(d['par_num'][i]), int(d['line_num'][i])),
+                                   (x, y, x+w, y+h), str(d['text'][i]).strip(), float(d['conf'][i])))
+
+    def get_text(self, coords: tuple[float, float, float, float]) -> tuple[str, float]:
+        """
+        Returns the text of the words whose centres are inside a box, one
+        line per text line as image_to_string gives it, and the mean
+        confidence of those words
+
+        Parameters
+        ----------
+        coords: tuple[float, float, float, float]
+            the coordinates of the box
+        """
+        lines = {}
+        confidences = []
+        for line, box, text, confidence in self.words:
+            x = (box[0] + box[2]) / 2
+            y = (box[1] + box[3]) / 2
+            if coords[0] <= x <= coords[2] and coords[1] <= y <= coords[3]:
+                lines.setdefault(line, []).append(text)
+                confidences.append(confidence)
+        if len(confidences) == 0:
+            return "", 0
+        text = "".join(" ".join(lines[line]) +
+                       "\n" for line in sorted(lines))
+        return text, sum(confidences) / len(confidences)
+
+
+# tall pages are processed in bands this tall, overlapping by enough to
+# hold a whole line of text, so memory doesn't grow with the page
+BAND_HEIGHT = 2048
+BAND_OVERLAP = 256
+
+
+def get_bands(height: int, band_height: int = BAND_HEIGHT, overlap: int = BAND_OVERLAP) -> list[tuple[int, int, int, int]]:
+    """
+    Splits a page into overlapping horizontal bands. Each band owns the
+    rows from the middle of its overlap with the band above to the middle
+    of its overlap with the band below, so anything found in two bands
+    can be kept by the band that owns its centre.
+
+    Parameters
+    ----------
+    height: int
+        the height of the page
+
+    band_height: int
+        the height of each band
+
+    overlap: int
+        how many rows neighbouring bands share
+
+    Returns
+    -------
+        the top and bottom rows of each band, and the top and bottom rows
+        it owns, bottoms exclusive
+    """
+    if height <= band_height:
+        return [(0, height, 0, height)]
+    step = band_height - overlap
+    # the last band is moved up to end at the bottom of the page rather than
+    # being cut short, so it overlaps the one above it by more
+    tops = [min(top, height - band_height)
+            for top in range(0, height - overlap, step)]
+    # each pair of neighbours split their overlap down the middle
+    splits = [0] + [(tops[i + 1] + tops[i] + band_height) // 2
+                    for i in range(len(tops) - 1)] + [height]
+    return [(top, top + band_height, splits[i], splits[i + 1])
+            for i, top in enumerate(tops)]
+
+
+def map_bands(function, bands: list, workers: int) -> list:
+    """
+    Calls a function on every band, on up to workers threads at once,
+    and returns the results in band order
+
+    Parameters
+    ----------
+    function: Callable
+        called with each band
+
+    bands: list
+        the bands, from get_bands
+
+    workers: int
+        the most bands processed at once
+    """
+    if workers <= 1 or len(bands) == 1:
+        return [function(band) for band in bands]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, bands))
+
+
+def scan_page(img: Image) -> PageOcrResult:
+    """
+    Runs tesseract over a whole page with the default settings, keeping
+    the lines and words it finds. Tall pages are scanned in overlapping
+    bands, in parallel on the OCR worker pool, and lines and words found
+    in two bands are kept once.
+
+    Parameters
+    ----------
+    img: Image | np.ndarray
+        the full page image, or the gray pixels of a GrayscalePage
+    """
+    gray = img if isinstance(img, np.ndarray) else np.asarray(img.convert('L'))
+    engine = get_ocr_engine()
+    bands = get_bands(gray.shape[0])
+
+    def scan_band(band):
+        return PageOcrResult(engine.image_to_data(make_ocr_ready(
+            gray[band[0]:band[1]], False, 127), HORIZONTAL_OCR_CONFIG))
+    # a single OcrEngine can only scan one image at a time
+    workers = engine.size if isinstance(engine, OcrWorkerPool) else 1
+    results = map_bands(scan_band, bands, workers)
+    if len(bands) == 1:
+        return results[0]
+    stitched = PageOcrResult({'text': []})
+    for i, ((top, bottom, owned_top, owned_bottom), result) in enumerate(zip(bands, results)):
+        for x0, y0, x1, y1 in result.lines:
+            if owned_top <= top + (y0 + y1) / 2 < owned_bottom:
+                stitched.lines.append((x0, y0 + top, x1, y1 + top))
+        for line, (x0, y0, x1, y1), text, confidence in result.words:
+            if owned_top <= top + (y0 + y1) / 2 < owned_bottom:
+                # line numbers restart in every band
+                stitched.words.append(
+                    ((i,) + line, (x0, y0 + top, x1, y1 + top), text, confidence))
+    return stitched
+
+
+# crops scanned together are packed into sheets at most this big,
+# with this much white space around each crop so tesseract keeps them apart
+SHEET_WIDTH = 2400
+SHEET_MAX_HEIGHT = 4800
+SHEET_GAP = 48
+# fewer crops than this aren't worth packing
+MIN_CROPS_FOR_SHEET = 3
+# a sheet holds many blocks of text, so tesseract has to find them itself
+SHEET_OCR_CONFIGS = {False: '-l jpn+eng --psm 3',
+                     True: '-l jpn_vert --psm 3'}
+
+
+def pack_shelves(sizes: list[tuple[int, int]], sheet_width: int = SHEET_WIDTH,
+                 max_height: int = SHEET_MAX_HEIGHT, gap: int = SHEET_GAP) -> list[tuple[int, int, int]]:
+    """
+    Lays out rectangles on as few sheets as possible by filling shelves:
+    the tallest rectangles are placed first, left to right, and a new
+    shelf is started when one is full and a new sheet when a sheet is full
+
+    Parameters
+    ----------
+    sizes: list[tuple[int, int]]
+        the width and height of each rectangle, none bigger than a sheet
+
+    sheet_width: int
+        the width of a sheet
+
+    max_height: int
+        the height a sheet can grow to
+
+    gap: int
+        the space around each rectangle
+
+    Returns
+    -------
+        the sheet number and top left corner of each rectangle
+    """
+    placements = [None] * len(sizes)
+    sheet, x, y, shelf_height = 0, gap, gap, 0
+    for i in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        width, height = sizes[i]
+        if x + width + gap > sheet_width:
+            x, y, shelf_height = gap, y + shelf_height + gap, 0
+        if y + height + gap > max_height:
+            sheet, x, y, shelf_height = sheet + 1, gap, gap, 0
+        placements[i] = (sheet, x, y)
+        x += width + gap
+        shelf_height = max(shelf_height, height)
+    return placements
+
+
+def run_ocr_batch(requests: list[tuple[np.ndarray, bool, bool, int]]) -> list[str]:
+    """
+    Scans many crops with as few tesseract calls as possible. Crops that
+    aren't in the OCR cache are thresholded and packed onto composite
+    sheets with pack_shelves, horizontal and vertical text on separate
+    sheets, and each sheet is scanned once. Words are handed back to the
+    crop they were placed over. Crops the sheet scan wasn't confident
+    about, and crops too big for a sheet, are scanned on their own with
+    run_ocr.
+    Text read from a sheet is cached under the sheet's config, so it is
+    reused by later batches but never returned by run_ocr for a crop
+    scanned on its own.
+
+    Parameters
+    ----------
+    requests: list[tuple[np.ndarray, bool, bool, int]]
+        the grayscale crop, is_inverted, is_vertical and threshold of
+        each box, as run_ocr takes them
+
+    Returns
+    -------
+        the ocr output of each crop
+    """
+    results = [None] * len(requests)
+    sheet_keys = [None] * len(requests)
+    waiting = {False: [], True: []}
+    for i, (img, is_inverted, is_vertical, threshold) in enumerate(requests):
+        if ocr_cache is not None:
+            # a scan of the crop on its own is preferred to one from a sheet
+            results[i] = ocr_cache.get(ocr_cache.get_key(
+                img, is_inverted, is_vertical, threshold, get_ocr_config(is_vertical)))
+            sheet_keys[i] = ocr_cache.get_key(img, is_inverted, is_vertical,
+                                              threshold, SHEET_OCR_CONFIGS[bool(is_vertical)])
+            if results[i] is None:
+                results[i] = ocr_cache.get(sheet_keys[i])
+        # vertical sheets are laid out in columns, so their crops are packed turned sideways
+        width, height = (img.shape[0], img.shape[1]) if is_vertical else (img.shape[1], img.shape[0])
+        if results[i] is None and width + 2 * SHEET_GAP <= SHEET_WIDTH and height + 2 * SHEET_GAP <= SHEET_MAX_HEIGHT:
+            waiting[bool(is_vertical)].append(i)
+    sheets = []
+    for is_vertical, indexes in waiting.items():
+        if len(indexes) < MIN_CROPS_FOR_SHEET:
+            continue
+        crops = [make_ocr_ready(requests[i][0], requests[i][1], requests[i][3]) for i in indexes]
+        if is_vertical:
+            placements = [(sheet, y, x) for sheet, x, y in
+                          pack_shelves([(crop.height, crop.width) for crop in crops])]
+        else:
+            placements = pack_shelves([crop.size for crop in crops])
+        for sheet_number in range(max(placement[0] for placement in placements) + 1):
+            placed = [(i, crop, placement[1], placement[2]) for i, crop, placement
+                      in zip(indexes, crops, placements) if placement[0] == sheet_number]
+            sheet = ig.new('L', (max(x + crop.width for i, crop, x, y in placed) + SHEET_GAP,
+                                 max(y + crop.height for i, crop, x, y in placed) + SHEET_GAP), 255)
+            for i, crop, x, y in placed:
+                sheet.paste(crop, (x, y))
+            sheets.append((sheet, is_vertical, [(i, (x, y, x + crop.width, y + crop.height))
+                                                for i, crop, x, y in placed]))
+    engine = get_ocr_engine()
+
+    def scan_sheet(sheet):
+        return PageOcrResult(engine.image_to_data(sheet[0], SHEET_OCR_CONFIGS[sheet[1]]))
+    if isinstance(engine, OcrWorkerPool) and len(sheets) > 1:
+        with ThreadPoolExecutor(max_workers=engine.size) as executor:
+            sheet_ocr = list(executor.map(scan_sheet, sheets))
+    else:
+        # a single OcrEngine can only scan one image at a time
+        sheet_ocr = [scan_sheet(sheet) for sheet in sheets]
+    for (sheet, is_vertical, placed), page_ocr in zip(sheets, sheet_ocr):
+        for i, coords in placed:
+            text, confidence = page_ocr.get_text(coords)
+            if confidence >= MIN_PAGE_OCR_CONFIDENCE:
+                results[i] = text
+                if ocr_cache is not None:
+                    ocr_cache.put(sheet_keys[i], text)
+    for i, (img, is_inverted, is_vertical, threshold) in enumerate(requests):
+        if results[i] is None:
+            results[i] = run_ocr(img, is_inverted, is_vertical, threshold)
+    return results
+
+
+def get_bounding_boxes(img: Image) -> list[tuple[int, int, int, int]]:
+    """
+    Runs tesseract layout analysis over a whole page and returns the
+    bounding boxes of the text lines it finds
+
+    Parameters
+    ----------
+    img: Image | np.ndarray
+        the full page image, or the gray pixels of a GrayscalePage
+    """
+    return scan_page(img).lines
+
+
+def label_runs(mask: np.ndarray, diagonal: bool = True) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds the 8-connected, or 4-connected, components of a binary image. Works on runs of
+    set pixels rather than single pixels: runs are found with np.diff,
+    runs in neighbouring rows that touch are paired with np.searchsorted,
+    and pairs are merged by propagating the smallest label until nothing
+    changes.
+
+    Parameters
+    ----------
+    mask: np.ndarray
+        a 2d boolean image
+
+    diagonal: bool
+        whether pixels touching only at a corner are connected, which
+        must be False when filling the background between strokes
+
+    Returns
+    -------
+        the row, first column, end column (exclusive) and component
+        label of every run, in row-major order, labels numbered from 0
+    """
+    height, width = mask.shape
+    edges = np.diff(np.pad(mask, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]
+    n = len(rows)
+    if n == 0:
+        return rows, starts, ends, np.zeros(0, dtype=np.int64)
+    # runs are in row-major order, so these keys are sorted
+    stride = width + 2
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends
+    # the runs in the row above that touch each run, sharing at least a
+    # corner, or an edge if not diagonal
+    lo = np.searchsorted(end_keys, (rows - 1) * stride + starts, 'left' if diagonal else 'right')
+    hi = np.searchsorted(start_keys, (rows - 1) * stride + ends, 'right' if diagonal else 'left')
+    counts = np.maximum(hi - lo, 0)
+    a = np.repeat(np.arange(n), counts)
+    b = np.repeat(lo, counts) + (np.arange(counts.sum()) -
+                                 np.repeat(np.cumsum(counts) - counts, counts))
+    labels = np.arange(n)
+    while len(a) > 0:
+        smallest = np.minimum(labels[a], labels[b])
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, a, smallest)
+        np.minimum.at(new_labels, b, smallest)
+        # point every label straight at its root
+        while True:
+            jumped = new_labels[new_labels]
+            if np.array_equal(jumped, new_labels):
+                break
+            new_labels = jumped
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    labels = np.unique(labels, return_inverse=True)[1]
+    return rows, starts, ends, labels
+
+
+def find_components(mask: np.ndarray) -> np.ndarray:
+    """
+    Finds the 8-connected components of a binary image with label_runs
+    and returns their bounding boxes
+
+    Parameters
+    ----------
+    mask: np.ndarray
+        a 2d boolean image
+
+    Returns
+    -------
+        an (n, 4) array of x0, y0, x1, y1 for each component, where x1 and
+        y1 are exclusive
+    """
+    rows, starts, ends, labels = label_runs(mask)
+    if len(rows) == 0:
+        return np.zeros((0, 4), dtype=np.int64)
+    boxes = np.empty((labels.max() + 1, 4), dtype=np.int64)
+    boxes[:, 0:2] = np.iinfo(np.int64).max
+    boxes[:, 2:4] = 0
+    np.minimum.at(boxes[:, 0], labels, starts)
+    np.minimum.at(boxes[:, 1], labels, rows)
+    np.maximum.at(boxes[:, 2], labels, ends)
+    np.maximum.at(boxes[:, 3], labels, rows + 1)
+    return boxes
+
+
+def fill_boxes(shape: tuple[int, int], boxes: np.ndarray) -> np.ndarray:
+    """
+    Returns a binary image with every box filled in, using a summed
+    difference image rather than drawing each box
+
+    Parameters
+    ----------
+    shape: tuple[int, int]
+        the height and width of the image
+
+    boxes: np.ndarray
+        an (n, 4) array of x0, y0, x1, y1, with x1 and y1 exclusive
+    """
+    height, width = shape
+    boxes = np.clip(boxes, 0, [width, height, width, height])
+    diff = np.zeros((height + 1, width + 1), dtype=np.int32)
+    np.add.at(diff, (boxes[:, 1], boxes[:, 0]), 1)
+    np.add.at(diff, (boxes[:, 1], boxes[:, 2]), -1)
+    np.add.at(diff, (boxes[:, 3], boxes[:, 0]), -1)
+    np.add.at(diff, (boxes[:, 3], boxes[:, 2]), 1)
+    return diff.cumsum(axis=0).cumsum(axis=1)[:height, :width] > 0
+
+
+def is_vertical_region(coords: tuple[int, int, int, int]) -> bool:
+    """
+    Whether a block of text is much taller than it is wide, and so most
+    likely printed vertically
+
+    Parameters
+    ----------
+    coords: tuple[int, int, int, int]
+        the coordinates of the block
+    """
+    return bool((coords[3] - coords[1]) > (coords[2] - coords[0]) * 1.3)
+
+
+def detect_text_regions(gray: np.ndarray, threshold: int = 127, min_char_size: int = 6, max_char_size: int = 120,
+                        min_chars: int = 2, min_background: int = 170) -> list[tuple[tuple[int, int, int, int], bool]]:
+    """
+    Finds blocks of text, such as the text in a speech balloon, without
+    running tesseract. The page is shrunk and binarized, dark connected
+    components about the size of a character are kept, and characters
+    close enough to each other are grouped into regions. Regions much
+    taller than they are wide are taken to be vertical text.
+
+    Parameters
+    ----------
+    gray: np.ndarray
+        the gray pixels of a page, from GrayscalePage
+
+    threshold: int
+        pixels darker than this are taken to be ink
+
+    min_char_size: int
+        the smallest height or width of a character, in page pixels
+
+    max_char_size: int
+        the largest height or width of a character, in page pixels
+
+    min_chars: int
+        the fewest characters in a region
+
+    min_background: int
+        the lowest mean brightness of a region, text sits on light
+        backgrounds while artwork and screentone don't
+
+    Returns
+    -------
+        the coordinates of each region and whether its text is vertical,
+        in page pixels and in reading order, right to left then top to bottom
+    """
+    height, width = gray.shape
+    # a factor of 2 keeps the strokes of small text while quartering the work
+    factor = 2 if min(height, width) >= 400 else 1
+    small = gray[:height // factor * factor:factor, :width // factor * factor:factor]
+    for dy in range(factor):
+        for dx in range(factor):
+            small = np.minimum(small, gray[dy:height // factor * factor:factor,
+                                           dx:width // factor * factor:factor])
+    chars = find_components(small < threshold)
+    sizes = chars[:, 2:4] - chars[:, 0:2]
+    keep = ((sizes.max(axis=1) * factor >= min_char_size) &
+            (sizes.max(axis=1) * factor <= max_char_size))
+    chars = chars[keep]
+    if len(chars) == 0:
+        return []
+    # characters closer than about half a character's size belong together
+    gap = max(1, int(np.median((chars[:, 2:4] - chars[:, 0:2]).max(axis=1)) * 0.6))
+    grown = chars + np.array([-gap, -gap, gap, gap])
+    regions = find_components(fill_boxes(small.shape, grown))
+    # give back the margin added by growing the characters
+    regions = regions + np.array([gap, gap, -gap, -gap])
+    # count the characters in each region by their top left corners
+    inside = ((chars[None, :, 0] >= regions[:, None, 0]) & (chars[None, :, 1] >= regions[:, None, 1]) &
+              (chars[None, :, 0] < regions[:, None, 2]) & (chars[None, :, 1] < regions[:, None, 3]))
+    char_counts = inside.sum(axis=1)
+    # a region can sit inside the box of another, as with text in a frame
+    nested = ((regions[None, :, 0] <= regions[:, None, 0]) & (regions[None, :, 1] <= regions[:, None, 1]) &
+              (regions[None, :, 2] >= regions[:, None, 2]) & (regions[None, :, 3] >= regions[:, None, 3]))
+    np.fill_diagonal(nested, False)
+    found = []
+    for (x0, y0, x1, y1), char_count, is_nested in zip(regions, char_counts, nested.any(axis=1)):
+        if char_count < min_chars or is_nested or x1 <= x0 or y1 <= y0:
+            continue
+        if small[y0:y1, x0:x1].mean() < min_background:
+            continue
+        is_vertical = is_vertical_region((x0, y0, x1, y1))
+        # a little padding helps tesseract with characters at the edges
+        pad = 2 * factor
+        found.append(((max(int(x0) * factor - pad, 0), max(int(y0) * factor - pad, 0),
+                       min(int(x1) * factor + pad, width), min(int(y1) * factor + pad, height)), is_vertical))
+    # manga reads right to left, then top to bottom
+    found.sort(key=lambda region: (-region[0][2], region[0][1]))
+    return found
+
+
+def get_iou(a: tuple[int, int, int, int], b: tuple[int, int, int, int]) -> float:
+    """
+    The area two boxes share over the area they cover together
+
+    Parameters
+    ----------
+    a, b: tuple[int, int, int, int]
+        the coordinates of the boxes
+    """
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    shared = width * height
+    return shared / ((a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - shared)
+
+
+# a region within this many rows of a band's edge is taken to be cut by it
+BAND_CUT_MARGIN = 8
+# regions from neighbouring bands overlapping by this much are the same region
+DUPLICATE_IOU = 0.5
+
+
+def detect_page_text_regions(gray: np.ndarray, **options) -> list[tuple[tuple[int, int, int, int], bool]]:
+    """
+    Runs detect_text_regions over a page. Tall pages are searched in
+    overlapping bands in parallel. Like scan_page, each region is kept by
+    the band that owns its centre, except that a region cut by a band edge
+    is joined with what the neighbouring band found of it, and near
+    duplicates from neighbouring bands are joined.
+
+    Parameters
+    ----------
+    gray: np.ndarray
+        the gray pixels of a page, from GrayscalePage
+
+    options:
+        passed on to detect_text_regions
+
+    Returns
+    -------
+        the coordinates of each region and whether its text is vertical,
+        in reading order
+    """
+    bands = get_bands(gray.shape[0])
+    band_regions = map_bands(lambda band: detect_text_regions(gray[band[0]:band[1]], **options),
+                             bands, os.cpu_count() or 1)
+    if len(bands) == 1:
+        return band_regions[0]
+    regions = []
+    band_indexes = []
+    # whether each region reaches the bottom or top edge of its band, other
+    # than the edges of the page
+    cut_bottom = []
+    cut_top = []
+    for i, (band, found) in enumerate(zip(bands, band_regions)):
+        for (x0, y0, x1, y1), is_vertical in found:
+            regions.append((x0, y0 + band[0], x1, y1 + band[0]))
+            band_indexes.append(i)
+            cut_top.append(i > 0 and y0 <= BAND_CUT_MARGIN)
+            cut_bottom.append(i < len(bands) - 1 and y1 >= band[1] - band[0] - BAND_CUT_MARGIN)
+    parents = list(range(len(regions)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    def covered(a, b):
+        # how much of a lies inside b
+        width = min(regions[a][2], regions[b][2]) - max(regions[a][0], regions[b][0])
+        height = min(regions[a][3], regions[b][3]) - max(regions[a][1], regions[b][1])
+        if width <= 0 or height <= 0:
+            return 0.0
+        return width * height / ((regions[a][2] - regions[a][0]) * (regions[a][3] - regions[a][1]))
+    for a in range(len(regions)):
+        for b in range(len(regions)):
+            if band_indexes[b] != band_indexes[a] + 1:
+                continue
+            if get_iou(regions[a], regions[b]) >= DUPLICATE_IOU:
+                same = True
+            elif cut_bottom[a] and cut_top[b]:
+                # a region taller than the overlap is cut in both bands,
+                # and each part reaches across the whole overlap
+                width = min(regions[a][2], regions[b][2]) - max(regions[a][0], regions[b][0])
+                same = width >= 0.5 * min(regions[a][2] - regions[a][0], regions[b][2] - regions[b][0])
+            else:
+                # a cut region lies mostly inside the whole one the other band found
+                same = ((cut_bottom[a] and covered(a, b) >= DUPLICATE_IOU) or
+                        (cut_top[b] and covered(b, a) >= DUPLICATE_IOU))
+            if same:
+                parents[find(a)] = find(b)
+    groups = {}
+    for i in range(len(regions)):
+        groups.setdefault(find(i), []).append(i)
+    found = []
+    for group in groups.values():
+        if len(group) == 1:
+            # found once, so kept by the band that owns its centre
+            i = group[0]
+            top, bottom, owned_top, owned_bottom = bands[band_indexes[i]]
+            if not owned_top <= (regions[i][1] + regions[i][3]) / 2 < owned_bottom:
+                continue
+        coords = (min(regions[i][0] for i in group), min(regions[i][1] for i in group),
+                  max(regions[i][2] for i in group), max(regions[i][3] for i in group))
+        found.append((coords, is_vertical_region(coords)))
+    found.sort(key=lambda region: (-region[0][2], region[0][1]))
+    return found
+
+
+DETECTORS = ('regions', 'tesseract')
+
+
+def detect_selection_items(page: GrayscalePage, detector: str = 'regions') -> tuple[list, PageOcrResult]:
+    """
+    Finds the text on a page and makes a selection box for each block of it
+
+    Parameters
+    ----------
+    page: GrayscalePage
+        the page to search
+
+    detector: str
+        'regions' to find blocks of text with detect_text_regions, leaving
+        tesseract to scan only the blocks found, or 'tesseract' to use the
+        text lines of a whole page scan
+
+    Returns
+    -------
+        the new selection boxes and, for the 'tesseract' detector, the page
+        scan that found them so their text can be filled from it
+    """
+    selection_items = []
+    if detector == 'tesseract':
+        page_ocr = scan_page(page.gray)
+        for box in page_ocr.lines:
+            s = SelectionItem()
+            s.coords = box
+            selection_items.append(s)
+        return selection_items, page_ocr
+    for coords, is_vertical in detect_page_text_regions(page.gray):
+        s = SelectionItem()
+        s.coords = coords
+        s.is_vertical = is_vertical
+        selection_items.append(s)
+    return selection_items, None
+
+
+def is_fragment_pair(a: tuple[float, float, float, float], b: tuple[float, float, float, float], is_vertical: bool,
+                     max_gap: float = 0.8, min_overlap: float = 0.3) -> bool:
+    """
+    Whether two boxes look like pieces of the same block of text: lines
+    stacked close above one another and lined up, or two pieces of one
+    line close side by side. Vertical text is the same turned sideways,
+    columns close beside one another or pieces of one column.
+
+    Parameters
+    ----------
+    a, b: tuple[float, float, float, float]
+        the coordinates of the boxes
+
+    is_vertical: bool
+        whether both boxes hold vertical text
+
+    max_gap: float
+        the largest gap between the boxes, as a fraction of the thinner
+        line
+
+    min_overlap: float
+        how much the boxes must line up, as a fraction of the shorter one
+    """
+    if is_vertical:
+        # turn columns into lines
+        a = (a[1], a[0], a[3], a[2])
+        b = (b[1], b[0], b[3], b[2])
+    line = min(a[3] - a[1], b[3] - b[1])
+    gap_x = max(a[0], b[0]) - min(a[2], b[2])
+    gap_y = max(a[1], b[1]) - min(a[3], b[3])
+    overlap_x = -gap_x / max(min(a[2] - a[0], b[2] - b[0]), 1)
+    overlap_y = -gap_y / max(line, 1)
+    stacked = gap_y <= max_gap * line and overlap_x >= min_overlap
+    same_line = gap_x <= max_gap * line and overlap_y >= 0.5
+    return stacked or same_line
+
+
+def group_fragments(selection_items: list, max_gap: float = 0.8, min_overlap: float = 0.3) -> list[list]:
+    """
+    Groups boxes that are pieces of the same block of text, such as the
+    line boxes tesseract finds in one speech balloon. Each box only looks
+    at its neighbours on a BoxIndex grid, and pairs that is_fragment_pair
+    accepts are joined with union-find. Horizontal and vertical text are
+    never grouped together.
+
+    Parameters
+    ----------
+    selection_items: list[SelectionItem]
+        the boxes of a page
+
+    max_gap: float
+        passed on to is_fragment_pair
+
+    min_overlap: float
+        passed on to is_fragment_pair
+
+    Returns
+    -------
+        every group, including single boxes, each in list order and
+        ordered by its first box, so the order of the page is kept
+    """
+    box_index = BoxIndex(selection_items)
+    positions = {item: i for i, item in enumerate(selection_items)}
+    parents = list(range(len(selection_items)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+    for i, item in enumerate(selection_items):
+        x0, y0, x1, y1 = item.coords
+        # no pair can be further apart than this box's own line allows
+        reach = max_gap * ((x1 - x0) if item.is_vertical else (y1 - y0))
+        for other in box_index.query(x0 - reach, y0 - reach, x1 + reach, y1 + reach):
+            j = positions[other]
+            if j > i and bool(other.is_vertical) == bool(item.is_vertical) and is_fragment_pair(
+                    item.coords, other.coords, item.is_vertical, max_gap, min_overlap):
+                root_i, root_j = find(i), find(j)
+                # the earlier box is the root, so it keeps its place in the list
+                parents[max(root_i, root_j)] = min(root_i, root_j)
+    groups = {}
+    for i, item in enumerate(selection_items):
+        groups.setdefault(find(i), []).append(item)
+    return [groups[root] for root in sorted(groups)]
+
+
+def merge_fragments(group: list) -> tuple[tuple[float, float, float, float], str]:
+    """
+    Returns the bounding box of a group of boxes and their ocr output
+    joined in reading order, top to bottom for lines and right to left
+    for columns
+
+    Parameters
+    ----------
+    group: list[SelectionItem]
+        a group from group_fragments
+    """
+    coords = (min(s.coords[0] for s in group), min(s.coords[1] for s in group),
+              max(s.coords[2] for s in group), max(s.coords[3] for s in group))
+    if group[0].is_vertical:
+        ordered = sorted(group, key=lambda s: (-s.coords[2], s.coords[1]))
+    else:
+        ordered = sorted(group, key=lambda s: (s.coords[1], s.coords[0]))
+    ocr_output = "\n".join(s.ocr_output.strip() for s in ordered if s.ocr_output.strip() != "")
+    return coords, ocr_output
+
+
+def find_balloon(binary: np.ndarray, x: int, y: int, window: int = 512) -> tuple[int, int, int, int]:
+    """
+    Finds the speech balloon around a point. The white region holding the
+    point is flood filled, by labeling the runs of a window around the
+    point that doubles in size until the region fits, and the box around
+    the ink the region encloses, the text, is returned.
+
+    Parameters
+    ----------
+    binary: np.ndarray
+        the page with white pixels True, from GrayscalePage.get_binary
+
+    x, y: int
+        the point, in page pixels
+
+    window: int
+        the size of the first window searched
+
+    Returns
+    -------
+        the box around the text in the balloon, or around the balloon
+        itself if it is empty, or None if the point isn't inside a
+        balloon
+    """
+    height, width = binary.shape
+    if not (0 <= x < width and 0 <= y < height) or not binary[y, x]:
+        return None
+    half = window // 2
+    while True:
+        x0, y0 = max(x - half, 0), max(y - half, 0)
+        x1, y1 = min(x + half, width), min(y + half, height)
+        rows, starts, ends, labels = label_runs(binary[y0:y1, x0:x1], diagonal=False)
+        clicked = np.nonzero((rows == y - y0) & (starts <= x - x0) & (ends > x - x0))[0][0]
+        region = labels == labels[clicked]
+        rows, starts, ends = rows[region], starts[region], ends[region]
+        bx0, by0, bx1, by1 = starts.min(), rows.min(), ends.max(), rows.max() + 1
+        cut = ((bx0 == 0 and x0 > 0) or (by0 == 0 and y0 > 0) or
+               (bx1 == x1 - x0 and x1 < width) or (by1 == y1 - y0 and y1 < height))
+        if not cut:
+            break
+        half *= 2
+    if (ends - starts).sum() > width * height / 4:
+        # the background around the panels, not a balloon
+        return None
+    # paint the region back into an image, a row at a time
+    filled = np.zeros((by1 - by0, bx1 - bx0 + 1), dtype=np.int32)
+    np.add.at(filled, (rows - by0, starts - bx0), 1)
+    np.add.at(filled, (rows - by0, ends - bx0), -1)
+    filled = filled.cumsum(axis=1)[:, :-1] > 0
+    # ink is enclosed if the region lies on all four sides of it
+    enclosed = (~filled & np.maximum.accumulate(filled, axis=1) &
+                np.maximum.accumulate(filled[:, ::-1], axis=1)[:, ::-1] &
+                np.maximum.accumulate(filled, axis=0) &
+                np.maximum.accumulate(filled[::-1], axis=0)[::-1])
+    ink_rows, ink_columns = np.nonzero(enclosed)
+    if len(ink_rows) == 0:
+        return (int(bx0 + x0), int(by0 + y0), int(bx1 + x0), int(by1 + y0))
+    pad = 4
+    return (int(max(ink_columns.min() - pad, 0) + bx0 + x0), int(max(ink_rows.min() - pad, 0) + by0 + y0),
+            int(min(ink_columns.max() + 1 + pad, bx1 - bx0) + bx0 + x0),
+            int(min(ink_rows.max() + 1 + pad, by1 - by0) + by0 + y0))
+
+
+def has_default_settings(selection_item) -> bool:
+    """
+    Whether a box is scanned with the same settings as scan_page, so its
+    text can be read from a PageOcrResult
+
+    Parameters
+    ----------
+    selection_item: SelectionItem
+        the box to check
+    """
+    return not selection_item.is_inverted and not selection_item.is_vertical and selection_item.threshold == 127
+
+
+def fill_from_page_ocr(selection_items: list, page_ocr: PageOcrResult) -> list:
+    """
+    Sets the ocr output of each box with default settings and no ocr
+    output from the words of a page scan
+
+    Parameters
+    ----------
+    selection_items: list[SelectionItem]
+        the boxes of the page
+
+    page_ocr: PageOcrResult
+        the result of scan_page for the page
+
+    Returns
+    -------
+        the boxes that still need scanning, because they have custom
+        settings or the page scan wasn't confident about their text
+
+    Side Effects
+    ------------
+        the ocr output of boxes is set
+    """
+    remaining = []
+    for s in selection_items:
+        if s.ocr_output != "":
+            continue
+        if has_default_settings(s):
+            text, confidence = page_ocr.get_text(s.coords)
+            if text != "" and confidence >= MIN_PAGE_OCR_CONFIDENCE:
+                s.ocr_output = text
+                continue
+        remaining.append(s)
+    return remaining
+
+
+def text_wrap(text: str, font: ImageFont, max_width) -> str:
+    """
+    Breaks text into lines no wider than max_width when drawn with font
+
+    Parameters
+    ----------
+    text: str
+        the text to be wrapped
+
+    font: ImageFont
+        the font the text will be drawn with
+
+    max_width: float
+        the maximum width of a line in pixels
+    """
+    lines = ""
+    # If the width of the text is smaller than image width
+    # we don't need to split it, just add it to the lines array
+    # and return
+    if font.getlength(text) <= max_width:
+        lines = text
+    else:
+        # split the line by spaces to get words
+        words = text.split(' ')
+        i = 0
+        # append every word to a line while its width is shorter than image width
+        while i < len(words):
+            line = ''
+            while i < len(words) and font.getlength(line + words[i]) <= max_width:
+                line = line + words[i] + " "
+                i += 1
+            if not line:
+                line = words[i]
+                i += 1
+            # when the line gets longer than the max width do not append the word,
+            # add the line to the lines array
+            lines = lines + "\n" + line if lines else line
+    return lines
+
+
+def export_image(img: Image, selection_items: list, output_path: str):
+    """
+    Draws the translated text of every selection box over a copy of the
+    image and saves it
+
+    Parameters
+    ----------
+    img: Image
+        the original page image
+
+    selection_items: list[SelectionItem]
+        the selection boxes of the page
+
+    output_path: str
+        the file path of the image to be created
+
+    Side Effects
+    ------------
+        An image file is created.
+    """
+    img = img.copy()
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.truetype("arial", 20)
+    for i in selection_items:
+        draw.rectangle([(i.coords[0], i.coords[1]),
+                        (i.coords[2], i.coords[3])], fill='white', width=0)
+        draw.text(((i.coords[0]+i.coords[2])/2, (i.coords[1]+i.coords[3])/2), text=text_wrap(i.translation, font, max_width=i.coords[2]-i.coords[0]),
+                  font=font, fill='black', anchor='mm')
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    img.save(output_path)
+
+
+def get_output_path(source_directory: str, path: str) -> str:
+    """
+    Returns the file path that the exported version of an image is saved to
+
+    Parameters
+    ----------
+    source_directory: str
+        the path of the directory containing all the files to be translated
+
+    path: str
+        the file path of the original image
+    """
+    return source_directory + '/output/' + path.replace('.png', '-output.png')
+
+
+class OcrJobRunner():
+    """
+    Runs OCR and translation for selection boxes on background threads, so
+    the GUI doesn't freeze while tesseract and googletrans work. Results are
+    put on a queue that poll() drains on the Tk thread through after().
+    A result is thrown away if its box has since been moved, re-thresholded,
+    deleted or given a newer job.
+
+    Attributes
+    ----------
+    root: Tk
+        the window whose after() polls for results
+
+    model: Model
+        the model the boxes belong to
+
+    jobs: dict[SelectionItem, tuple]
+        the current job of each busy box, as (token, future, settings, path)
+
+    Methods
+    -------
+    submit(path, item, crop, ocr_output)
+        starts a job for a box, replacing any job it already has
+
+    submit_translations(path_items)
+        starts one job that translates many boxes in batches
+
+    submit_batch(path, item_crops)
+        starts one job that scans many boxes with run_ocr_batch, then
+        translates them in batches
+
+    submit_auto_threshold(path, item, crop)
+        starts a job that finds the best threshold for a box
+
+    cancel(item)
+        cancels the job for a box
+
+    is_busy(item)
+        whether a box has a job running
+
+    poll()
+        hands finished results to the callbacks, on the Tk thread
+    """
+
+    def __init__(self, root: tk.Tk, model, on_result, on_busy_changed, workers: int = None):
+        """
+        Parameters
+        ----------
+        root: Tk
+            the window whose after() polls for results
+
+        model: Model
+            the model the boxes belong to
+
+        on_result: callable
+            called with (kind, path, item, value) for each result, where kind
+            is 'ocr', 'translation', 'threshold' or 'error'
+
+        on_busy_changed: callable
+            called with (path, item, busy) when a box starts or stops working
+
+        workers: int
+            the number of background threads, defaults to the number of cores
+        """
+        self.root = root
+        self.model = model
+        self.on_result = on_result
+        self.on_busy_changed = on_busy_changed
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or os.cpu_count())
+        self.results = queue.Queue()
+        self.jobs = {}
+        self.root.after(50, self.poll)
+
+    @staticmethod
+    def get_settings(item) -> tuple:
+        return (tuple(item.coords), bool(item.is_inverted), bool(item.is_vertical), int(item.threshold))
+
+    def submit(self, path: str, item, crop: np.ndarray = None, ocr_output: str = None):
+        """
+        Starts a job for a box, replacing any job it already has.
+        Either scans crop and translates the result, or only translates
+        ocr_output.
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image the box belongs to
+
+        item: SelectionItem
+            the box the results are for
+
+        crop: np.ndarray
+            the grayscale pixels to scan, from GrayscalePage.crop
+
+        ocr_output: str
+            text to translate without scanning, used when crop is None
+        """
+        self.cancel(item)
+        token = object()
+        settings = self.get_settings(item)
+        future = self.executor.submit(
+            self.run_job, token, item, crop, ocr_output, settings)
+        self.jobs[item] = (token, future, settings, path)
+        self.on_busy_changed(path, item, True)
+
+    def run_job(self, token, item, crop, ocr_output, settings):
+        # runs on a background thread, so only talks to the Tk thread through the queue
+        coords, is_inverted, is_vertical, threshold = settings
+        try:
+            if crop is not None:
+                ocr_output = run_ocr(crop, is_inverted, is_vertical, threshold)
+                self.results.put(('ocr', token, item, ocr_output))
+            # skip the network round trip if the job went stale while scanning
+            if self.jobs.get(item, (None,))[0] is token:
+                translation = ""
+                if ocr_output.strip() != "":
+                    translation = get_translation(ocr_output)
+                self.results.put(('translation', token, item, translation))
+        except Exception as e:
+            self.results.put(('error', token, item, e))
+        self.results.put(('done', token, item, None))
+
+    def submit_translations(self, path_items: list[tuple[str, "SelectionItem"]]):
+        """
+        Starts one job that translates the ocr output of many boxes with
+        translate_batch, so they share as few requests as possible
+
+        Parameters
+        ----------
+        path_items: list[tuple[str, SelectionItem]]
+            the boxes to translate, with the file path each belongs to
+        """
+        jobs = []
+        for path, item in path_items:
+            self.cancel(item)
+            token = object()
+            # a shared future can't be cancelled for one box, so none is kept
+            self.jobs[item] = (token, None, self.get_settings(item), path)
+            self.on_busy_changed(path, item, True)
+            jobs.append((token, item, item.ocr_output))
+        self.executor.submit(self.run_translation_batch, jobs)
+
+    def run_translation_batch(self, jobs):
+        # runs on a background thread, so only talks to the Tk thread through the queue
+        try:
+            translations = get_translation_backend().translate_batch(
+                [ocr_output for token, item, ocr_output in jobs])
+            for (token, item, ocr_output), translation in zip(jobs, translations):
+                self.results.put(('translation', token, item, translation))
+        except Exception as e:
+            for token, item, ocr_output in jobs:
+                self.results.put(('error', token, item, e))
+        for token, item, ocr_output in jobs:
+            self.results.put(('done', token, item, None))
+
+    def submit_batch(self, path: str, item_crops: list[tuple["SelectionItem", np.ndarray]]):
+        """
+        Starts one job that scans many boxes with run_ocr_batch, so they
+        share as few tesseract calls as possible, then translates them
+        with translate_batch
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image the boxes belong to
+
+        item_crops: list[tuple[SelectionItem, np.ndarray]]
+            the boxes to scan, each with its grayscale pixels from
+            GrayscalePage.crop
+        """
+        jobs = []
+        for item, crop in item_crops:
+            self.cancel(item)
+            token = object()
+            settings = self.get_settings(item)
+            # a shared future can't be cancelled for one box, so none is kept
+            self.jobs[item] = (token, None, settings, path)
+            self.on_busy_changed(path, item, True)
+            jobs.append((token, item, crop, settings))
+        if len(jobs) > 0:
+            self.executor.submit(self.run_batch_job, jobs)
+
+    def run_batch_job(self, jobs):
+        # runs on a background thread, so only talks to the Tk thread through the queue
+        try:
+            ocr_outputs = run_ocr_batch([(crop, settings[1], settings[2], settings[3])
+                                         for token, item, crop, settings in jobs])
+            for (token, item, crop, settings), ocr_output in zip(jobs, ocr_outputs):
+                self.results.put(('ocr', token, item, ocr_output))
+            # skip the network round trip for boxes whose job went stale while scanning
+            current = [(token, item, ocr_output) for (token, item, crop, settings), ocr_output
+                       in zip(jobs, ocr_outputs) if self.jobs.get(item, (None,))[0] is token]
+            translations = get_translation_backend().translate_batch(
+                [ocr_output for token, item, ocr_output in current])
+            for (token, item, ocr_output), translation in zip(current, translations):
+                self.results.put(('translation', token, item, translation))
+        except Exception as e:
+            for token, item, crop, settings in jobs:
+                self.results.put(('error', token, item, e))
+        for token, item, crop, settings in jobs:
+            self.results.put(('done', token, item, None))
+
+    def submit_auto_threshold(self, path: str, item, crop: np.ndarray):
+        """
+        Starts a job that finds the best threshold for a box with
+        find_best_threshold, replacing any job it already has
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image the box belongs to
+
+        item: SelectionItem
+            the box the result is for
+
+        crop: np.ndarray
+            the grayscale pixels to scan, from GrayscalePage.crop
+        """
+        self.cancel(item)
+        token = object()
+        settings = self.get_settings(item)
+        future = self.executor.submit(
+            self.run_auto_threshold_job, token, item, crop, settings)
+        self.jobs[item] = (token, future, settings, path)
+        self.on_busy_changed(path, item, True)
+
+    def run_auto_threshold_job(self, token, item, crop, settings):
+        # runs on a background thread, so only talks to the Tk thread through the queue
+        try:
+            threshold, is_inverted, confidence = find_best_threshold(
+                crop, settings[2])
+            self.results.put(
+                ('threshold', token, item, (threshold, is_inverted)))
+        except Exception as e:
+            self.results.put(('error', token, item, e))
+        self.results.put(('done', token, item, None))
+
+    def cancel(self, item):
+        """
+        Cancels the job for a box. A job that has already started finishes
+        in the background, but its results are thrown away.
+
+        Parameters
+        ----------
+        item: SelectionItem
+            the box whose job is cancelled
+        """
+        job = self.jobs.pop(item, None)
+        if job is not None:
+            if job[1] is not None:
+                job[1].cancel()
+            self.on_busy_changed(job[3], item, False)
+
+    def is_busy(self, item) -> bool:
+        return item in self.jobs
+
+    def get_busy_items(self, path: str) -> list:
+        """
+        Returns the boxes of an image file that have a job running
+        """
+        return [item for item, job in self.jobs.items() if job[3] == path]
+
+    def get_threshold(self, item) -> int:
+        """
+        Returns the threshold the current job for a box is using, or None
+        """
+        job = self.jobs.get(item)
+        return None if job is None else job[2][3]
+
+    def poll(self):
+        """
+        Hands finished results to on_result, on the Tk thread, then
+        schedules itself to run again
+        """
+        while True:
+            try:
+                kind, token, item, value = self.results.get_nowait()
+            except queue.Empty:
+                break
+            job = self.jobs.get(item)
+            if job is None or job[0] is not token:
+                # cancelled or replaced by a newer job
+                continue
+            path = job[3]
+            if self.get_settings(item) != job[2] or self.model.index_of(path, item) is None:
+                # moved, re-thresholded or deleted since the job started
+                self.cancel(item)
+                continue
+            if kind == 'done':
+                del self.jobs[item]
+                self.on_busy_changed(path, item, False)
+            else:
+                self.on_result(kind, path, item, value)
+        self.root.after(50, self.poll)
+
+
+class SelectionItem():
+    """
+    Represents the data of a single selection box. Uses __slots__, as a
+    project can hold hundreds of thousands of them.
+
+    Attributes
+    ----------
+    coords : array[int]
+        coordinates of the selection box, whole pixels, set from any
+        sequence of four numbers
+
+    ocr_output : str
+        the result of scanning the text in the image
+
+    is_inverted : bool
+        whether to invert the values of the image
+
+    is_vertical : bool
+        whether the text being scanned is printed vertically
+
+    threshold: int
+        the threshold value for converting the image to black and white
+
+    translation: str
+        the translated text
+
+    Methods
+    -------
+    to_json()
+        returns all data in json serializable form
+
+    to_dict()
+        returns all data as a dict, as stored in json-data.json
+
+    from_dict(data)
+        creates a selection item from a dict made by to_dict
+    """
+    # TODO: docstrings consisting mostly of apologies and excuses
+    __slots__ = ('_coords', 'ocr_output', 'is_inverted', 'is_vertical', 'threshold', 'translation')
+
+    def __init__(self):
+        self._coords = array('i', (0, 0, 0, 0))
+        self.ocr_output = ""
+        self.is_inverted = False
+        self.is_vertical = False
+        self.threshold = 127
+        self.translation = ""
+
+    @property
+    def coords(self) -> array:
+        return self._coords
+
+    @coords.setter
+    def coords(self, coords):
+        self._coords = array('i', [int(round(c)) for c in coords])
+
+    def to_json(self):
+        """
+        Returns all data in json serializable form
+        """
+        return json.dumps(self.to_dict(), sort_keys=True, indent=4)
+
+    def to_dict(self) -> dict:
+        """
+        Returns all data as a dict, in the form stored in json-data.json
+        """
+        return {"coords": self._coords.tolist(), "ocr_output": self.ocr_output, "is_inverted": self.is_inverted,
+                "is_vertical": self.is_vertical, "threshold": self.threshold, "translation": self.translation}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Creates a selection item from a dict in the form made by to_dict
+
+        Parameters
+        ----------
+        data: dict
+            the saved data of a single selection box
+        """
+        temp = cls()
+        temp.coords = data["coords"]
+        temp.ocr_output = data["ocr_output"]
+        temp.is_inverted = data["is_inverted"]
+        temp.is_vertical = data["is_vertical"]
+        temp.threshold = data["threshold"]
+        temp.translation = data["translation"]
+        return temp
+
+
+class ToolType(Enum):
+    SELECT = 0
+    ADD = 1
+    CROP = 2
+    DELETE = 3
+    JOIN = 4
+    SPLIT = 5
+    TRANSFORM = 6
+    FILL = 7
+
+
+class BoxIndex():
+    """
+    A uniform grid over the selection boxes of one image file, for finding
+    the boxes under a point or a rectangle without asking the canvas.
+    Boxes are keyed by their SelectionItem, which stays the same however
+    the list of boxes changes.
+
+    Attributes
+    ----------
+    items : list[SelectionItem]
+        the list of boxes that is indexed, one of model's selection_item_data
+
+    cells : dict[tuple[int, int], set[SelectionItem]]
+        the boxes overlapping each grid cell
+
+    boxes : dict[SelectionItem, tuple[float, float, float, float]]
+        the coordinates each box was indexed with
+
+    sequence : dict[SelectionItem, int]
+        numbers increasing along items, for finding a box's position by
+        bisection
+
+    Methods
+    -------
+    insert(item)
+        indexes a box that has been appended to items
+
+    remove(item)
+        forgets a box
+
+    move(item)
+        re-indexes a box whose coordinates have changed
+
+    query(x0, y0, x1, y1)
+        returns the boxes overlapping a rectangle, in list order
+
+    index_of(item)
+        returns the position of a box in items
+    """
+
+    def __init__(self, items: list, cell_size: int = 64):
+        self.items = items
+        self.cell_size = cell_size
+        self.cells = {}
+        self.boxes = {}
+        self.sequence = {}
+        self.next_sequence = 0
+        for item in items:
+            self.insert(item)
+
+    def get_cells(self, coords: tuple[float, float, float, float]):
+        x0, y0, x1, y1 = coords
+        return [(cx, cy)
+                for cx in range(int(min(x0, x1) // self.cell_size), int(max(x0, x1) // self.cell_size) + 1)
+                for cy in range(int(min(y0, y1) // self.cell_size), int(max(y0, y1) // self.cell_size) + 1)]
+
+    def insert(self, item):
+        coords = tuple(item.coords)
+        self.boxes[item] = coords
+        self.sequence[item] = self.next_sequence
+        self.next_sequence += 1
+        for cell in self.get_cells(coords):
+            self.cells.setdefault(cell, set()).add(item)
+
+    def remove(self, item):
+        for cell in self.get_cells(self.boxes.pop(item)):
+            self.cells[cell].discard(item)
+            if len(self.cells[cell]) == 0:
+                del self.cells[cell]
+        del self.sequence[item]
+
+    def move(self, item):
+        for cell in self.get_cells(self.boxes[item]):
+            self.cells[cell].discard(item)
+            if len(self.cells[cell]) == 0:
+                del self.cells[cell]
+        coords = tuple(item.coords)
+        self.boxes[item] = coords
+        for cell in self.get_cells(coords):
+            self.cells.setdefault(cell, set()).add(item)
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> list:
+        """
+        Returns the boxes overlapping or touching a rectangle, in the order
+        they appear in items, so the last one is drawn on top
+        """
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        found = set()
+        for cell in self.get_cells((x0, y0, x1, y1)):
+            for item in self.cells.get(cell, ()):
+                bx0, by0, bx1, by1 = self.boxes[item]
+                if min(bx0, bx1) <= x1 and max(bx0, bx1) >= x0 and min(by0, by1) <= y1 and max(by0, by1) >= y0:
+                    found.add(item)
+        return sorted(found, key=self.sequence.__getitem__)
+
+    def index_of(self, item) -> int:
+        """
+        Returns the position of a box in items, or None if it isn't indexed
+        """
+        if item not in self.sequence:
+            return None
+        return bisect.bisect_left(self.items, self.sequence[item], key=self.sequence.__getitem__)
+
+
+# the journal is folded into json-data.json once it holds this many records
+JOURNAL_COMPACT_RECORDS = 2000
+
+
+class CompactionError(Exception):
+    """
+    Folding the journal into the snapshot failed. The journal is kept, so
+    nothing is lost, and folding it is tried again by the next compaction
+    or load.
+    """
+
+
+def read_journal(file_path: str) -> tuple[list[dict], int]:
+    """
+    Reads the records of a journal file. A record cut off by a crash while
+    it was being written, and anything after it, is ignored.
+
+    Parameters
+    ----------
+    file_path: str
+        the path of the journal
+
+    Returns
+    -------
+        the records, and the length in bytes of the part of the file that
+        holds them
+    """
+    records = []
+    length = 0
+    if not os.path.isfile(file_path):
+        return records, length
+    with io.open(file_path, 'rb') as infile:
+        for line in infile:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                records.append(json.loads(line.decode('utf-8')))
+            except ValueError:
+                break
+            length += len(line)
+    return records, length
+
+
+def apply_journal_record(pages: dict[str, list[dict]], record: dict):
+    """
+    Replays a journal record on saved data
+
+    Parameters
+    ----------
+    pages: dict[str, list[dict]]
+        the saved boxes of each image file, in the form made by
+        SelectionItem.to_dict. A page that isn't there starts with a single
+        empty box, like it does in Model.set_directory
+
+    record: dict
+        a record written by ProjectJournal
+
+    Side Effects
+    ------------
+        pages is changed
+    """
+    boxes = pages.setdefault(record["path"], [SelectionItem().to_dict()])
+    if record["op"] == "add":
+        boxes.extend(record["boxes"])
+    elif record["op"] == "delete":
+        rows = set(record["rows"])
+        boxes[:] = [box for row, box in enumerate(boxes) if row not in rows]
+    elif record["op"] == "update":
+        boxes[record["row"]] = record["box"]
+    elif record["op"] == "page":
+        boxes[:] = record["boxes"]
+
+
+def read_snapshot(file_path: str) -> tuple[dict[str, list[dict]], int]:
+    """
+    Reads json-data.json
+
+    Parameters
+    ----------
+    file_path: str
+        the path of the snapshot
+
+    Returns
+    -------
+        the saved boxes of each image file, and the sequence number of the
+        last journal record folded into it, 0 for files saved whole
+    """
+    if not (os.path.isfile(file_path) and os.access(file_path, os.R_OK)):
+        return {}, 0
+    with io.open(file_path, 'r', encoding="utf-16") as infile:
+        pages = json.load(infile)
+    return pages, pages.pop("_journal_seq", 0)
+
+
+# the start of every binary snapshot, followed by its format version
+BINARY_SNAPSHOT_MAGIC = b'NSCP'
+BINARY_SNAPSHOT_VERSION = 1
+BINARY_SNAPSHOT_HEADER = struct.Struct('<4sHQII')
+BINARY_SNAPSHOT_PAGE = struct.Struct('<II')
+BINARY_SNAPSHOT_BOX = struct.Struct('<4iBiII')
+
+
+def dump_binary_snapshot(pages: dict[str, list[dict]], journal_seq: int = 0) -> bytes:
+    """
+    Packs saved boxes into the binary snapshot format. A header of magic,
+    version, journal sequence number, page count and box count is
+    followed by a table of pages, the length of each path and its number
+    of boxes, then the paths as one piece of UTF-8, then a table of
+    boxes, then all their text as one piece of UTF-8. Lengths are counted
+    in characters. Each box has its coords as 32 bit ints,
+    is_inverted and is_vertical as bit flags, threshold and the number of
+    characters in its ocr output and translation. The fixed size tables
+    and single piece of text make loading little more than a few calls
+    to struct and one decode.
+
+    Parameters
+    ----------
+    pages: dict[str, list[dict]]
+        the boxes of each image file, in the form made by
+        SelectionItem.to_dict
+
+    journal_seq: int
+        the sequence number of the last journal record in pages
+    """
+    paths = "".join(pages).encode('utf-8')
+    boxes = [box for page in pages.values() for box in page]
+    pack_box = BINARY_SNAPSHOT_BOX.pack
+    texts = []
+    chunks = [BINARY_SNAPSHOT_HEADER.pack(BINARY_SNAPSHOT_MAGIC, BINARY_SNAPSHOT_VERSION,
+                                          journal_seq, len(pages), len(boxes))]
+    chunks.extend(BINARY_SNAPSHOT_PAGE.pack(len(path), len(page)) for path, page in pages.items())
+    chunks.append(BINARY_SNAPSHOT_PAGE.pack(len(paths), 0))
+    chunks.append(paths)
+    for box in boxes:
+        # saved by older versions, coords may not be whole numbers
+        chunks.append(pack_box(*[int(round(c)) for c in box["coords"]],
+                               bool(box["is_inverted"]) | bool(box["is_vertical"]) << 1,
+                               int(round(box["threshold"])), len(box["ocr_output"]), len(box["translation"])))
+        texts.append(box["ocr_output"])
+        texts.append(box["translation"])
+    chunks.append("".join(texts).encode('utf-8'))
+    return b''.join(chunks)
+
+
+def load_binary_snapshot(data: bytes) -> tuple[dict[str, list[dict]], int]:
+    """
+    Unpacks a snapshot made by dump_binary_snapshot
+
+    Parameters
+    ----------
+    data: bytes
+        the snapshot
+
+    Returns
+    -------
+        the boxes of each image file, and the sequence number of the last
+        journal record in them
+
+    Raises
+    ------
+    ValueError
+        if data isn't a binary snapshot of a version this can read
+    """
+    magic, version, journal_seq, page_count, box_count = BINARY_SNAPSHOT_HEADER.unpack_from(data)
+    if magic != BINARY_SNAPSHOT_MAGIC or version != BINARY_SNAPSHOT_VERSION:
+        raise ValueError(f"not a version {BINARY_SNAPSHOT_VERSION} snapshot")
+    data = memoryview(data)
+    offset = BINARY_SNAPSHOT_HEADER.size
+    end = offset + page_count * BINARY_SNAPSHOT_PAGE.size
+    page_table = BINARY_SNAPSHOT_PAGE.iter_unpack(data[offset:end])
+    # the byte length of the paths follows the table
+    paths_size, _ = BINARY_SNAPSHOT_PAGE.unpack_from(data, end)
+    offset = end + BINARY_SNAPSHOT_PAGE.size
+    paths = str(data[offset:offset + paths_size], 'utf-8')
+    offset += paths_size
+    end = offset + box_count * BINARY_SNAPSHOT_BOX.size
+    box_table = BINARY_SNAPSHOT_BOX.iter_unpack(data[offset:end])
+    text = str(data[end:], 'utf-8')
+    pages = {}
+    path_offset = 0
+    text_offset = 0
+    for path_length, page_box_count in page_table:
+        path = paths[path_offset:path_offset + path_length]
+        path_offset += path_length
+        boxes = []
+        for _, (x0, y0, x1, y1, flags, threshold, ocr_length, translation_length) in zip(range(page_box_count), box_table):
+            ocr_end = text_offset + ocr_length
+            translation_end = ocr_end + translation_length
+            boxes.append({"coords": [x0, y0, x1, y1], "ocr_output": text[text_offset:ocr_end],
+                          "is_inverted": bool(flags & 1), "is_vertical": bool(flags & 2),
+                          "threshold": threshold, "translation": text[ocr_end:translation_end]})
+            text_offset = translation_end
+        pages[path] = boxes
+    return pages, journal_seq
+
+
+class ProjectJournal():
+    """
+    Saves the selection boxes of a project as changes appended to
+    json-data.journal, rather than rewriting json-data.json, so a save
+    costs the same however big the project is and a crash can at worst
+    lose the record being written. Once the journal gets long it is
+    folded into json-data.json on a background thread. Loading reads
+    json-data.json and replays the journal on top of it.
+
+    Each line of the journal is a JSON record with a sequence number
+    "seq", the image file "path" and an "op":
+
+        * "add", "boxes" appended to the page
+        * "delete", the boxes at "rows" removed
+        * "update", the box at "row" replaced by "box"
+        * "page", every box of the page replaced by "boxes"
+
+    Rows are the positions of boxes when the change was made, so records
+    only make sense replayed in order. json-data.json stores the sequence
+    number of the last record folded into it under "_journal_seq".
+
+    Attributes
+    ----------
+    snapshot_path: str
+        the path of json-data.json
+
+    journal_path: str
+        the path of json-data.journal
+
+    seq: int
+        the sequence number of the last record made
+
+    pending: list[dict]
+        records made since the last flush
+
+    journal_records: int
+        the number of records in the journal
+
+    compaction: Thread
+        the thread folding the journal into json-data.json, if one has run
+
+    compaction_error: Exception
+        why the last compaction thread failed, raised by the next compact
+
+    saved_pages: dict[str, list[dict]]
+        the saved boxes of the image files that haven't been loaded yet
+
+    Methods
+    -------
+    load()
+        returns the saved boxes of each image file
+
+    open()
+        reads the saved boxes, for load_page
+
+    load_page(path)
+        returns the saved boxes of an image file
+
+    record_add(path, items)
+        records boxes appended to a page
+
+    record_delete(path, rows)
+        records boxes removed from a page
+
+    record_update(path, row, item)
+        records a box being changed
+
+    record_page(path, items)
+        records every box of a page being replaced
+
+    take_pending()
+        returns the records made since the last flush, for write_records
+
+    restore_pending(records)
+        puts back records that couldn't be written
+
+    write_records(records)
+        appends records to the journal
+
+    flush()
+        appends the pending records to the journal
+
+    compact()
+        starts folding the journal into json-data.json
+
+    close()
+        flushes and compacts the journal, waiting for the compaction
+    """
+
+    def __init__(self, source_directory: str, compact_records: int = JOURNAL_COMPACT_RECORDS):
+        self.snapshot_path = source_directory + "/json-data.json"
+        self.journal_path = source_directory + "/json-data.journal"
+        # the journal being compacted, kept until json-data.json is replaced
+        self.old_journal_path = self.journal_path + ".old"
+        self.compact_records = compact_records
+        self.seq = 0
+        self.pending = []
+        self.journal_records = 0
+        self.compaction = None
+        self.compaction_error = None
+        self.saved_pages = {}
+
+    def load(self) -> dict[str, list[dict]]:
+        """
+        Reads json-data.json and replays the journal on top of it. Cuts any
+        half written record off the end of the journal, so later records
+        aren't appended after it.
+
+        Returns
+        -------
+            the saved boxes of each image file, in the form made by
+            SelectionItem.to_dict
+        """
+        if os.path.isfile(self.old_journal_path):
+            # the last session exited while compacting, finish it first
+            self.write_snapshot()
+        pages, snapshot_seq = self.read_snapshot()
+        records, length = read_journal(self.journal_path)
+        self.seq = snapshot_seq
+        self.journal_records = 0
+        for record in records:
+            if record["seq"] > snapshot_seq:
+                apply_journal_record(pages, record)
+                self.seq = record["seq"]
+                self.journal_records += 1
+        if os.path.isfile(self.journal_path) and os.path.getsize(self.journal_path) > length:
+            os.truncate(self.journal_path, length)
+        return pages
+
+    def open(self):
+        self.saved_pages = self.load()
+
+    def load_page(self, path: str) -> list[dict]:
+        """
+        Returns the saved boxes of an image file, in the form made by
+        SelectionItem.to_dict, or None if it has never been saved. They are
+        only handed out once, Model keeps them from then on.
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image
+        """
+        return self.saved_pages.pop(path, None)
+
+    def record(self, record: dict):
+        self.seq += 1
+        record["seq"] = self.seq
+        self.pending.append(record)
+
+    def record_add(self, path: str, items: list):
+        self.record({"op": "add", "path": path, "boxes": [s.to_dict() for s in items]})
+
+    def record_delete(self, path: str, rows: list[int]):
+        self.record({"op": "delete", "path": path, "rows": sorted(rows)})
+
+    def record_update(self, path: str, row: int, item):
+        last = self.pending[-1] if len(self.pending) > 0 else None
+        if last is not None and last["op"] == "update" and last["path"] == path and last["row"] == row:
+            # a box changed several times in a row only needs its last state
+            last["box"] = item.to_dict()
+            return
+        self.record({"op": "update", "path": path, "row": row, "box": item.to_dict()})
+
+    def record_page(self, path: str, items: list):
+        self.record({"op": "page", "path": path, "boxes": [s.to_dict() for s in items]})
+
+    def take_pending(self) -> list[dict]:
+        """
+        Returns the pending records and starts a new list, so records made
+        while they are written don't change them
+        """
+        pending = self.pending
+        self.pending = []
+        return pending
+
+    def restore_pending(self, records: list[dict]):
+        """
+        Puts back records taken by take_pending that couldn't be written
+        """
+        self.pending[:0] = records
+
+    def write_records(self, records: list[dict]):
+        """
+        Appends records to the journal and waits for them to reach the
+        disk. Starts a compaction if the journal has got long. Records
+        must be written in the order they were made.
+
+        Parameters
+        ----------
+        records: list[dict]
+            records returned by take_pending
+
+        Side Effects
+        ------------
+            * json-data.journal is appended to
+            * a compaction may be started
+        """
+        if len(records) > 0:
+            lines = "".join(json.dumps(record, ensure_ascii=False) + "\n"
+                            for record in records)
+            with io.open(self.journal_path, 'a', encoding='utf-8', newline='') as outfile:
+                length = outfile.tell()
+                try:
+                    outfile.write(lines)
+                    outfile.flush()
+                    os.fsync(outfile.fileno())
+                except OSError:
+                    # don't leave half the records behind, they are written again later
+                    outfile.truncate(length)
+                    raise
+            self.journal_records += len(records)
+        if self.journal_records >= self.compact_records:
+            self.compact()
+
+    def flush(self):
+        """
+        Appends the pending records to the journal, see write_records
+        """
+        self.write_records(self.take_pending())
+
+    def compact(self):
+        """
+        Starts folding the journal into json-data.json on a background
+        thread. The journal is renamed first, so records flushed in the
+        meantime go to a new one, and it is only deleted once the new
+        json-data.json has replaced the old one. A journal left behind by
+        a compaction that failed is folded first, here, so renaming the
+        journal can't overwrite it.
+
+        Raises
+        ------
+        CompactionError
+            if the last compaction failed, or the journal it left behind
+            can't be folded. Nothing is renamed, the records already
+            written stay in the journal.
+
+        Side Effects
+        ------------
+            * json-data.journal is renamed to json-data.journal.old
+            * a thread is started that rewrites json-data.json
+        """
+        if self.compaction is not None and self.compaction.is_alive():
+            return
+        if self.compaction_error is not None:
+            error = self.compaction_error
+            self.compaction_error = None
+            raise CompactionError(f"Couldn't fold the journal into {self.snapshot_path}") from error
+        if os.path.isfile(self.old_journal_path):
+            try:
+                self.write_snapshot()
+            except Exception as e:
+                raise CompactionError(f"Couldn't fold the journal into {self.snapshot_path}") from e
+        if not os.path.isfile(self.journal_path):
+            return
+        os.replace(self.journal_path, self.old_journal_path)
+        self.journal_records = 0
+        # not a daemon, so exiting waits for the snapshot to be written
+        self.compaction = threading.Thread(target=self.run_compaction)
+        self.compaction.start()
+
+    def run_compaction(self):
+        try:
+            self.write_snapshot()
+        except Exception as e:
+            # json-data.journal.old is kept, compact raises this next time
+            self.compaction_error = e
+
+    def close(self):
+        """
+        Flushes and compacts the journal, and waits for the snapshot to be
+        written, so a failure can be raised rather than lost
+
+        Raises
+        ------
+        CompactionError
+            if the snapshot couldn't be written, see compact
+        """
+        self.flush()
+        self.compact()
+        if self.compaction is not None:
+            self.compaction.join()
+            if self.compaction_error is not None:
+                error = self.compaction_error
+                self.compaction_error = None
+                raise CompactionError(f"Couldn't fold the journal into {self.snapshot_path}") from error
+
+    def read_snapshot(self) -> tuple[dict[str, list[dict]], int]:
+        return read_snapshot(self.snapshot_path)
+
+    def write_snapshot_file(self, file_path: str, pages: dict[str, list[dict]], journal_seq: int):
+        pages["_journal_seq"] = journal_seq
+        with io.open(file_path, 'w', encoding="utf-16") as outfile:
+            json.dump(pages, outfile, ensure_ascii=False)
+            outfile.flush()
+            os.fsync(outfile.fileno())
+
+    def write_snapshot(self):
+        pages, snapshot_seq = self.read_snapshot()
+        records, _ = read_journal(self.old_journal_path)
+        for record in records:
+            if record["seq"] > snapshot_seq:
+                apply_journal_record(pages, record)
+                snapshot_seq = record["seq"]
+        # write then rename, so a crash never leaves half a snapshot behind
+        temp_path = self.snapshot_path + '.tmp'
+        self.write_snapshot_file(temp_path, pages, snapshot_seq)
+        os.replace(temp_path, self.snapshot_path)
+        os.remove(self.old_journal_path)
+
+
+class BinaryProjectJournal(ProjectJournal):
+    """
+    A ProjectJournal that folds the journal into project.bin, a binary
+    snapshot made by dump_binary_snapshot, instead of json-data.json.
+    It is several times quicker to write and read than UTF-16 JSON for
+    big projects. A project saved in json-data.json is read from there
+    until the first compaction.
+    """
+
+    def __init__(self, source_directory: str, compact_records: int = JOURNAL_COMPACT_RECORDS):
+        super().__init__(source_directory, compact_records)
+        self.json_snapshot_path = self.snapshot_path
+        self.snapshot_path = source_directory + "/project.bin"
+
+    def read_snapshot(self) -> tuple[dict[str, list[dict]], int]:
+        if not os.path.isfile(self.snapshot_path):
+            return read_snapshot(self.json_snapshot_path)
+        with io.open(self.snapshot_path, 'rb') as infile:
+            return load_binary_snapshot(infile.read())
+
+    def write_snapshot_file(self, file_path: str, pages: dict[str, list[dict]], journal_seq: int):
+        with io.open(file_path, 'wb') as outfile:
+            outfile.write(dump_binary_snapshot(pages, journal_seq))
+            outfile.flush()
+            os.fsync(outfile.fileno())
+
+
+class SqliteProjectStore():
+    """
+    Saves the selection boxes of a project in an SQLite database,
+    project.sqlite3 in the source directory, with one row per box keyed
+    by image file and position. Every change is written in a transaction
+    of its own as it is made, and pages are read only when they are first
+    used, so opening a project costs the same however big it is.
+    A project saved in json-data.json is imported the first time.
+
+    Attributes
+    ----------
+    file_path: str
+        the path of the database
+
+    source_directory: str
+        the path of the directory containing all the files to be translated
+
+    Methods
+    -------
+    open()
+        opens the database, importing json-data.json into a new one
+
+    load_page(path)
+        returns the saved boxes of an image file
+
+    record_add(path, items)
+        saves boxes appended to a page
+
+    record_delete(path, rows)
+        deletes boxes from a page
+
+    record_update(path, row, item)
+        saves a changed box
+
+    record_page(path, items)
+        replaces every box of a page
+
+    take_pending(), restore_pending(records), write_records(records), flush()
+        do nothing, every change is already saved
+
+    close()
+        closes the database
+    """
+
+    def __init__(self, source_directory: str):
+        self.source_directory = source_directory
+        self.file_path = source_directory + "/project.sqlite3"
+        self.connection = None
+
+    def open(self):
+        """
+        Opens the database, creating it if it doesn't exist. A new
+        database is filled from json-data.json and its journal.
+
+        Side Effects
+        ------------
+            project.sqlite3 may be created
+        """
+        if self.connection is not None:
+            return
+        self.connection = sqlite3.connect(self.file_path, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        # a commit is durable once it reaches the write-ahead log
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS pages (path TEXT PRIMARY KEY)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS boxes (path TEXT NOT NULL, row INTEGER NOT NULL, '
+                                    'coords TEXT NOT NULL, ocr_output TEXT NOT NULL, is_inverted INTEGER NOT NULL, '
+                                    'is_vertical INTEGER NOT NULL, threshold INTEGER NOT NULL, translation TEXT NOT NULL, '
+                                    'PRIMARY KEY (path, row))')
+        if self.connection.execute('SELECT 1 FROM pages LIMIT 1').fetchone() is None:
+            pages = ProjectJournal(self.source_directory).load()
+            with self.connection:
+                for path, boxes in pages.items():
+                    self.insert_page(path, boxes)
+
+    @staticmethod
+    def to_row(path: str, row: int, box: dict) -> tuple:
+        return (path, row, json.dumps(list(box["coords"])), box["ocr_output"], int(box["is_inverted"]),
+                int(box["is_vertical"]), int(box["threshold"]), box["translation"])
+
+    def insert_page(self, path: str, boxes: list[dict]):
+        self.connection.execute('INSERT OR IGNORE INTO pages VALUES (?)', (path,))
+        self.connection.execute('DELETE FROM boxes WHERE path = ?', (path,))
+        self.connection.executemany('INSERT INTO boxes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                    [self.to_row(path, row, box) for row, box in enumerate(boxes)])
+
+    def get_page_length(self, path: str) -> int:
+        """
+        Returns the number of boxes saved for a page. A page that has never
+        been saved gets the single empty box Model starts every page with.
+        """
+        if self.connection.execute('SELECT 1 FROM pages WHERE path = ?', (path,)).fetchone() is None:
+            self.insert_page(path, [SelectionItem().to_dict()])
+        return self.connection.execute('SELECT count(*) FROM boxes WHERE path = ?', (path,)).fetchone()[0]
+
+    def load_page(self, path: str) -> list[dict]:
+        """
+        Returns the saved boxes of an image file, in the form made by
+        SelectionItem.to_dict, or None if it has never been saved
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image
+        """
+        if self.connection.execute('SELECT 1 FROM pages WHERE path = ?', (path,)).fetchone() is None:
+            return None
+        rows = self.connection.execute('SELECT coords, ocr_output, is_inverted, is_vertical, threshold, translation '
+                                       'FROM boxes WHERE path = ? ORDER BY row', (path,))
+        return [{"coords": json.loads(coords), "ocr_output": ocr_output, "is_inverted": bool(is_inverted),
+                 "is_vertical": bool(is_vertical), "threshold": threshold, "translation": translation}
+                for coords, ocr_output, is_inverted, is_vertical, threshold, translation in rows]
+
+    def record_add(self, path: str, items: list):
+        with self.connection:
+            length = self.get_page_length(path)
+            self.connection.executemany('INSERT INTO boxes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                        [self.to_row(path, length + i, s.to_dict()) for i, s in enumerate(items)])
+
+    def record_delete(self, path: str, rows: list[int]):
+        if len(rows) == 0:
+            return
+        with self.connection:
+            self.get_page_length(path)
+            self.connection.executemany('DELETE FROM boxes WHERE path = ? AND row = ?',
+                                        [(path, row) for row in rows])
+            # close the gaps, moving rows down in order so they never collide
+            remaining = [row for row, in self.connection.execute(
+                'SELECT row FROM boxes WHERE path = ? AND row > ? ORDER BY row', (path, min(rows)))]
+            self.connection.executemany('UPDATE boxes SET row = ? WHERE path = ? AND row = ?',
+                                        [(new_row, path, row) for new_row, row in enumerate(remaining, min(rows))
+                                         if new_row != row])
+
+    def record_update(self, path: str, row: int, item):
+        with self.connection:
+            self.get_page_length(path)
+            self.connection.execute('REPLACE INTO boxes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                    self.to_row(path, row, item.to_dict()))
+
+    def record_page(self, path: str, items: list):
+        with self.connection:
+            self.insert_page(path, [s.to_dict() for s in items])
+
+    def take_pending(self) -> list[dict]:
+        return []
+
+    def restore_pending(self, records: list[dict]):
+        pass
+
+    def write_records(self, records: list[dict]):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+# where Model saves projects, chosen with --store
+PROJECT_STORES = {'journal': ProjectJournal, 'binary': BinaryProjectJournal, 'sqlite': SqliteProjectStore}
+
+
+class PageData(dict):
+    """
+    The selection boxes of each image file, read from a project store the
+    first time each page is used. A page that has never been saved starts
+    with a single empty box.
+
+    Attributes
+    ----------
+    store: ProjectJournal | SqliteProjectStore
+        where pages are read from
+    """
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+
+    def __missing__(self, path: str) -> list:
+        saved = self.store.load_page(path)
+        if saved is None:
+            items = [SelectionItem()]
+        else:
+            items = [SelectionItem.from_dict(d) for d in saved]
+        self[path] = items
+        return items
+
+
+# the files set_directory treats as pages
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+# how often the GUI checks the source directory for new or changed pages, in ms
+DIRECTORY_POLL_INTERVAL = 2000
+# how often the GUI shows messages sent by background threads, in ms
+STATUS_POLL_INTERVAL = 500
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Returns the sha256 of a file's contents, read a block at a time
+
+    Parameters
+    ----------
+    file_path: str
+        the path of the file
+    """
+    h = hashlib.sha256()
+    with io.open(file_path, 'rb') as infile:
+        for block in iter(lambda: infile.read(2 ** 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class PageIndex():
+    """
+    Remembers the size, modification time, pixel dimensions and content
+    hash of every page in a directory, in page-index.json, so opening a
+    project only has to list the directory. refresh() finds the pages that
+    were added, changed or removed since it last ran, looking inside only
+    the files whose size or modification time changed, and can be called
+    again at any time to pick up changes. It builds a new dict of entries
+    and swaps it in at the end, so it can run on a background thread
+    while the Tk thread reads the old one.
+
+    Attributes
+    ----------
+    source_directory: str
+        the directory the pages are in
+
+    file_path: str
+        the path of page-index.json
+
+    entries: dict[str, dict]
+        for each page's file name, its "size", "mtime_ns", "width",
+        "height" and "hash", and the "batch_key" run_batch last processed
+        it with, if any
+
+    Methods
+    -------
+    list_paths()
+        returns the file names of the pages, without opening them
+
+    refresh()
+        brings the index up to date with the directory
+
+    get_paths()
+        returns the file names of the pages, sorted
+
+    save()
+        writes the index to page-index.json
+    """
+
+    def __init__(self, source_directory: str):
+        self.source_directory = source_directory
+        self.file_path = source_directory + "/page-index.json"
+        self.entries = {}
+        try:
+            with io.open(self.file_path, 'r', encoding='utf-8') as infile:
+                self.entries = json.load(infile)
+        except (OSError, ValueError):
+            # missing or damaged, it is rebuilt by refresh
+            pass
+
+    def list_paths(self) -> list[str]:
+        """
+        Returns the file names of the pages in the directory, sorted, from
+        the directory listing alone
+        """
+        with os.scandir(self.source_directory) as it:
+            return sorted(entry.name for entry in it
+                          if entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.is_file())
+
+    def refresh(self) -> tuple[list[str], list[str], list[str]]:
+        """
+        Lists the directory with os.scandir and updates the entries of the
+        pages whose size or modification time changed. Only those are
+        opened, to read their dimensions and hash them.
+
+        Returns
+        -------
+            the file names of the pages added, changed and removed
+
+        Side Effects
+        ------------
+            entries is updated, and page-index.json if anything changed
+        """
+        added = []
+        changed = []
+        entries = {}
+        updated = False
+        with os.scandir(self.source_directory) as it:
+            for entry in it:
+                if not entry.name.lower().endswith(IMAGE_EXTENSIONS) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                old = self.entries.get(entry.name)
+                if old is not None and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                    entries[entry.name] = old
+                    continue
+                try:
+                    with ig.open(entry.path) as img:
+                        # only reads the header
+                        width, height = img.size
+                except OSError:
+                    width = height = None
+                new = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                       "width": width, "height": height, "hash": hash_file(entry.path)}
+                if old is None:
+                    added.append(entry.name)
+                elif old["hash"] != new["hash"]:
+                    changed.append(entry.name)
+                elif "batch_key" in old:
+                    # only touched, so it doesn't need processing again
+                    new["batch_key"] = old["batch_key"]
+                entries[entry.name] = new
+                updated = True
+        removed = [name for name in self.entries if name not in entries]
+        self.entries = entries
+        if updated or removed:
+            self.save()
+        return sorted(added), sorted(changed), sorted(removed)
+
+    def get_paths(self) -> list[str]:
+        return sorted(self.entries)
+
+    def save(self):
+        # write then rename, so a crash never leaves half an index behind
+        temp_path = self.file_path + '.' + str(os.getpid()) + '.tmp'
+        with io.open(temp_path, 'w', encoding='utf-8') as outfile:
+            json.dump(self.entries, outfile, ensure_ascii=False)
+        os.replace(temp_path, self.file_path)
+
+
+class Model():
+    """
+    All the data
+
+    Attributes
+    ----------
+    paths : list[str]
+        list of image file paths in source directory
+
+    selection_item_data : PageData
+        all application data for all image files in source directory,
+        each page read from store when first used
+
+    select_opts : dict[str, tuple[int, int] | str]
+        the display options for selection boxes in the GUI
+
+    box_indexes : dict[str, BoxIndex]
+        a spatial index of the selection boxes of each image file,
+        built when first needed
+
+    page_index : PageIndex
+        the image files in the source directory, with their metadata
+
+    store_type : str
+        where the project is saved, a key of PROJECT_STORES
+
+    store : ProjectJournal | SqliteProjectStore
+        records every change to selection_item_data
 
-    selection_item_data : dict[str, list[SelectionItem]]
-        all application data for all image files in source directory
+    unsaved_changes : bool
+        whether anything has changed since the last save
 
-    select_opts : dict[str, tuple[int, int] | str]
-        the display options for selection boxes in the GUI
+    dirty_pages : set[str]
+        the image files changed since the last save
+
+    lock : Lock
+        held while a change is recorded, and while save_file takes the
+        changes to write, which it may do on the autosave thread
+
+    save_lock : Lock
+        held by save_file, so changes are written in order
 
     Methods
     -------
-    add_row(path)
+    refresh_directory()
+        picks up image files added, changed or removed since opening
+
+    add_row(path, coords)
         adds a selection box to data
 
+    add_items(path, items)
+        adds several selection boxes to data
+
+    set_coords(path, item, coords)
+        moves a selection box
+
+    find_boxes(path, x0, y0, x1, y1)
+        returns the selection boxes overlapping a rectangle
+
+    index_of(path, item)
+        returns the position of a selection box in data
+
+    get_untranslated_items(path)
+        returns the selection boxes that still need translating
+
     delete_row(path, row_index)
         deletes a selection box from data
 
+    delete_items(path, items)
+        deletes several selection boxes from data
+
+    record(path, method, *args)
+        records a change to an image file's selection boxes with store
+
+    record_update(path, item)
+        notes that a selection box's text or settings have changed
+
+    set_items(path, items)
+        replaces every selection box of an image file
+
     save_file(source_directory)
-        saves data to json file
+        saves the changes to data since the last save
+
+    close()
+        saves and closes the project store
 
     startup_check(source_directory)
         loads data from file or creates data and file if no file exists
     """
 
-    def __init__(self):
+    def __init__(self, store_type: str = 'journal'):
         self.paths = []
         self.unsaved_changes = False
+        self.box_indexes = {}
+        self.store_type = store_type
+        self.store = None
+        self.dirty_pages = set()
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
         self.select_opts = dict(dash=(2, 2), fill='magenta', stipple='gray25', outline='black', disabledoutline='blue',
                                 disabledfill='blue', disabledstipple='gray12', state=tk.DISABLED, tags='selection')
 
     def set_directory(self, path: str):
-        allfiles = glob.glob(path + '/*')
-        paths = []
-        for file in allfiles:
-            if re.search(r'.+\.(png|jpg|jpeg)', file):
-                split_file = file.split("\\")
-                paths.append(split_file[split_file.__len__() - 1])
-        self.paths = sorted(paths)
-        self.selection_item_data = {
-            path:
-            [SelectionItem()]
-            for path in self.paths}
-
-    def add_row(self, path: str):
+        # only lists the directory, refresh_directory fills in the index
+        self.page_index = PageIndex(path)
+        self.paths = self.page_index.list_paths()
+        if self.store is not None:
+            self.store.close()
+        self.store = PROJECT_STORES[self.store_type](path)
+        # pages are only read when they are first used
+        self.selection_item_data = PageData(self.store)
+        self.box_indexes = {}
+
+    def refresh_directory(self) -> tuple[list[str], list[str], list[str]]:
+        """
+        Picks up image files added to, changed in or removed from the
+        source directory since set_directory or the last refresh.
+        Opens the files that are new or changed, so the GUI runs
+        page_index.refresh on a thread of its own instead.
+
+        Returns
+        -------
+            the file names of the pages added, changed and removed
+
+        Side Effects
+        ------------
+            * paths is updated
+            * page_index is updated
+        """
+        added, changed, removed = self.page_index.refresh()
+        self.paths = self.page_index.get_paths()
+        return added, changed, removed
+
+    def get_box_index(self, path: str) -> BoxIndex:
+        """
+        Returns the spatial index of an image file's selection boxes,
+        building it if the file has none yet or its list has been replaced
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image
+        """
+        box_index = self.box_indexes.get(path)
+        if box_index is None or box_index.items is not self.selection_item_data[path]:
+            box_index = BoxIndex(self.selection_item_data[path])
+            self.box_indexes[path] = box_index
+        return box_index
+
+    def add_row(self, path: str, coords: tuple[float, float, float, float] = None) -> SelectionItem:
         """
         Adds a selection box to the data for the current image file
 
@@ -210,11 +4181,113 @@ class Model():
         path: str
             the file path corresponding to the currently loaded image
 
+        coords: tuple[float, float, float, float]
+            the bounds of the new box, or an empty box if None
+
+        Returns
+        -------
+            the new selection box
+
         Side Effects
         ------------
             adds an entry to selection_item_data
         """
-        self.selection_item_data[path].append(SelectionItem())
+        item = SelectionItem()
+        if coords is not None:
+            item.coords = coords
+        self.add_items(path, [item])
+        return item
+
+    def add_items(self, path: str, items: list[SelectionItem]):
+        """
+        Appends selection boxes to the data for an image file
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image
+
+        items: list[SelectionItem]
+            the boxes to add
+
+        Side Effects
+        ------------
+            * adds entries to selection_item_data
+            * the change is recorded in journal
+        """
+        box_index = self.get_box_index(path)
+        for item in items:
+            self.selection_item_data[path].append(item)
+            box_index.insert(item)
+        self.record(path, self.store.record_add, items)
+
+    def set_coords(self, path: str, item: SelectionItem, coords: tuple[float, float, float, float]):
+        """
+        Moves or resizes a selection box
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image the box belongs to
+
+        item: SelectionItem
+            the box to change
+
+        coords: tuple[float, float, float, float]
+            the new bounds of the box
+
+        Side Effects
+        ------------
+            * the box's coords are changed
+            * the change is recorded in journal
+        """
+        item.coords = coords
+        self.get_box_index(path).move(item)
+        self.record_update(path, item)
+
+    def find_boxes(self, path: str, x0: float, y0: float, x1: float, y1: float) -> list[SelectionItem]:
+        """
+        Returns the selection boxes of an image file overlapping or touching
+        a rectangle, in list order, so the last one is drawn on top
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image
+
+        x0, y0, x1, y1: float
+            the rectangle, a point if x0 == x1 and y0 == y1
+        """
+        return self.get_box_index(path).query(x0, y0, x1, y1)
+
+    def index_of(self, path: str, item: SelectionItem) -> int:
+        """
+        Returns the position of a selection box in the data for an image
+        file, or None if the box has been deleted
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image
+
+        item: SelectionItem
+            the box to find
+        """
+        return self.get_box_index(path).index_of(item)
+
+    def get_untranslated_items(self, path: str = None) -> list[tuple[str, SelectionItem]]:
+        """
+        Returns every selection box that has ocr output but no translation,
+        with the file path it belongs to
+
+        Parameters
+        ----------
+        path: str
+            only look at this image file, or every image file if None
+        """
+        paths = self.paths if path is None else [path]
+        return [(p, s) for p in paths for s in self.selection_item_data[p]
+                if s.translation == "" and s.ocr_output.strip() != ""]
 
     def delete_row(self, path: str, row_index: int):
         """
@@ -231,39 +4304,174 @@ class Model():
 
         Side Effects
         ------------
-            removes an entry from selection_item_data
+            * removes an entry from selection_item_data
+            * the change is recorded in journal
         """
+        self.get_box_index(path).remove(
+            self.selection_item_data[path][row_index])
         del self.selection_item_data[path][row_index]
+        self.record(path, self.store.record_delete, [row_index])
+
+    def delete_items(self, path: str, items: list[SelectionItem]):
+        """
+        Deletes several selection boxes from the data for an image file
+        in a single pass over the list
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image
+
+        items: list[SelectionItem]
+            the boxes to delete
+
+        Side Effects
+        ------------
+            * removes entries from selection_item_data
+            * the change is recorded in journal
+        """
+        box_index = self.get_box_index(path)
+        deleted = set(items)
+        for item in deleted:
+            box_index.remove(item)
+        rows = [row for row, s in enumerate(self.selection_item_data[path]) if s in deleted]
+        # keep the same list, the index and the GUI hold on to it
+        self.selection_item_data[path][:] = [
+            s for s in self.selection_item_data[path] if s not in deleted]
+        self.record(path, self.store.record_delete, rows)
+
+    def record(self, path: str, method, *args):
+        """
+        Records a change to the selection boxes of an image file, and marks
+        the file as changed since the last save
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image
+
+        method: Callable
+            one of store's record methods
+
+        args
+            passed on to method after path
+
+        Side Effects
+        ------------
+            * the change is recorded in store
+            * path is added to dirty_pages
+        """
+        with self.lock:
+            method(path, *args)
+            self.dirty_pages.add(path)
+            self.unsaved_changes = True
+
+    def record_update(self, path: str, item: SelectionItem):
+        """
+        Records a change to a selection box's text or settings, so the
+        next save_file writes it. Boxes that have been deleted are ignored.
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image the box belongs to
+
+        item: SelectionItem
+            the box that changed
+
+        Side Effects
+        ------------
+            the change is recorded in journal
+        """
+        row = self.index_of(path, item)
+        if row is not None:
+            self.record(path, self.store.record_update, row, item)
+
+    def set_items(self, path: str, items: list[SelectionItem]):
+        """
+        Replaces every selection box of an image file
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image
+
+        items: list[SelectionItem]
+            the new boxes
+
+        Side Effects
+        ------------
+            * the list in selection_item_data is replaced
+            * the change is recorded in journal
+        """
+        self.selection_item_data[path] = items
+        self.record(path, self.store.record_page, items)
 
     def save_file(self, source_directory: str):
         """
-        First transfers the contents of selection_item_data to a json
-        serializable type. Then dumps that to a json file.
+        Saves the changes made since the last save. With the journal store
+        they are appended to the journal in the source directory, which is
+        folded into json-data.json in the background once it gets long.
+        The sqlite store has already saved them.
+        Safe to call from the autosave thread: the changes are taken while
+        holding lock, which only takes a moment, and written after
+        releasing it, so editing carries on while they are written.
 
         Parameters
         ----------
         source_directory: str
             the path of the directory containing all the files to be translated
 
+        Returns
+        -------
+            the image files whose changes were saved
+
+        Side Effects
+        ------------
+            * json-data.journal is appended to
+            * json-data.json may be rewritten in the background
+            * dirty_pages is emptied
+        """
+        with self.save_lock:
+            with self.lock:
+                records = self.store.take_pending()
+                saved_pages = self.dirty_pages
+                self.dirty_pages = set()
+                self.unsaved_changes = False
+            try:
+                self.store.write_records(records)
+            except OSError:
+                # put them back, to be written by the next save
+                with self.lock:
+                    self.store.restore_pending(records)
+                    self.dirty_pages |= saved_pages
+                    self.unsaved_changes = True
+                raise
+        return saved_pages
+
+    def close(self):
+        """
+        Saves any changes and closes the project store
+
+        Raises
+        ------
+        CompactionError
+            if the journal store couldn't be compacted, the changes are
+            still saved in the journal
+
         Side Effects
         ------------
-            the value of the json save file is changed
-        """
-        json_conversion_data = {}
-        for path in self.paths:
-            # TODO: skip if no data
-            path_data = []
-            for s in self.selection_item_data[path]:
-                path_data.append({"coords": s.coords, "ocr_output": s.ocr_output, "is_inverted": s.is_inverted,
-                                 "is_vertical": s.is_vertical, "threshold": s.threshold, "translation": s.translation})
-            json_conversion_data[path] = path_data
-        with io.open(source_directory + "/json-data.json", 'w', encoding="utf-16") as outfile:
-            json.dump(json_conversion_data, outfile, ensure_ascii=False)
+            the journal store is compacted
+        """
+        with self.save_lock:
+            self.store.close()
+        self.dirty_pages = set()
         self.unsaved_changes = False
 
     def startup_check(self, source_directory: str):
         """
-        Checks for and loads a json file with saved data
+        Opens the project store. Saved pages are read from it when
+        selection_item_data is first asked for them.
 
         Parameters
         ----------
@@ -272,35 +4480,178 @@ class Model():
 
         Side Effects
         ------------
-            * The value of selection_item_data is changed
-            * If json-data.json doesn't exist in the source directory, it is
-            created
-        """
-        if os.path.isfile(source_directory + "/json-data.json") and os.access(source_directory + "/json-data.json", os.R_OK):
-            # checks if file exists
-            print("File exists and is readable")
-            with io.open(source_directory + "/json-data.json", 'r', encoding="utf-16") as infile:
-                json_conversion_data = {}
-                json_conversion_data.update(json.load(infile))
-                for path in self.paths:
-                    # all the image files in the source directory
-                    selection_items = []
-                    if path in json_conversion_data.keys():
-                        # json-data.json has data for this image file
-                        self.selection_item_data[path].clear()
-                        # having cleared out any old data, load in the new
-                        for selection_item in json_conversion_data[path]:
-                            temp = SelectionItem()
-                            temp.coords = selection_item["coords"]
-                            temp.ocr_output = selection_item["ocr_output"]
-                            temp.is_inverted = selection_item["is_inverted"]
-                            temp.is_vertical = selection_item["is_vertical"]
-                            temp.threshold = selection_item["threshold"]
-                            temp.translation = selection_item["translation"]
-                            selection_items.append(temp)
-                        self.selection_item_data[path] = selection_items
-        else:
-            print("Either file is missing or is not readable, creating file...")
+            * the journal store reads json-data.json and the journal, and
+            cuts a half written record off the end of the journal
+            * the sqlite store imports json-data.json into a new database
+        """
+        if self.store is None:
+            self.store = PROJECT_STORES[self.store_type](source_directory)
+            self.selection_item_data = PageData(self.store)
+        self.store.open()
+
+
+class Autosaver():
+    """
+    Saves a model every few seconds on a thread of its own, if anything
+    has changed. Model.save_file only holds the model's lock while it
+    takes the changes, so editing isn't held up while they are written.
+
+    Attributes
+    ----------
+    model: Model
+        the model to save
+
+    source_directory: str
+        the path of the directory containing all the files to be translated
+
+    interval: float
+        the seconds between saves
+
+    messages: queue.Queue
+        where a failed save is reported, once until a save succeeds again
+
+    Methods
+    -------
+    stop()
+        stops the thread, waiting for a save in progress
+    """
+
+    def __init__(self, model: Model, source_directory: str, interval: float = 30,
+                 messages: queue.Queue = None):
+        self.model = model
+        self.source_directory = source_directory
+        self.interval = interval
+        self.messages = queue.Queue() if messages is None else messages
+        self.failing = False
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            if self.model.unsaved_changes:
+                try:
+                    self.model.save_file(self.source_directory)
+                except (OSError, CompactionError) as e:
+                    # the changes are kept and saved next time
+                    if not self.failing:
+                        self.failing = True
+                        self.messages.put(f"Autosave failed, retrying: {e}")
+                else:
+                    if self.failing:
+                        self.failing = False
+                        self.messages.put("Autosave succeeded")
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+
+MIN_ZOOM = 1 / 16
+
+
+class TiledImage():
+    """
+    Shows an image on a canvas as a grid of tiles. Only the tiles in or
+    near the viewport are uploaded to Tk, and tiles that haven't been on
+    screen for a while are dropped, so a webtoon strip tens of thousands
+    of pixels tall costs no more Tk memory than a normal page.
+    Zoomed out views are drawn from a pyramid of halved copies of the
+    image, each built the first time it is needed.
+    All tiles are tagged 'img' and kept below every other canvas item.
+
+    Attributes
+    ----------
+    canvas: Canvas
+        the canvas to draw on
+
+    image: Image
+        the full resolution image
+
+    levels: list[Image]
+        the pyramid, level k is the image halved k times
+
+    zoom: float
+        canvas pixels per image pixel, a power of two no bigger than 1
+
+    tiles: OrderedDict[tuple[int, int], tuple[int, ImageTk.PhotoImage]]
+        the canvas Id and photo of each tile on the canvas, by column and
+        row, least recently in view first
+
+    Methods
+    -------
+    set_zoom(zoom)
+        switches pyramid level, dropping every tile
+
+    render()
+        draws the tiles in or near the viewport and drops old ones
+
+    close()
+        removes every tile from the canvas
+    """
+
+    def __init__(self, canvas: Canvas, image: Image, zoom: float = 1, tile_size: int = 512,
+                 max_tiles: int = 32, margin: int = 1):
+        self.canvas = canvas
+        self.image = image
+        self.levels = [image]
+        self.zoom = zoom
+        self.tile_size = tile_size
+        # tiles kept beyond the viewport, about 32MB of Tk photos
+        self.max_tiles = max_tiles
+        # how many tiles past the edge of the viewport are drawn ahead of scrolling
+        self.margin = margin
+        self.tiles = OrderedDict()
+
+    def get_level(self) -> Image:
+        """
+        Returns the pyramid level for the current zoom, building it and
+        any missing levels above it
+        """
+        level = max(0, round(-np.log2(self.zoom)))
+        while len(self.levels) <= level:
+            previous = self.levels[-1]
+            if previous.mode not in ('RGB', 'RGBA', 'L'):
+                previous = previous.convert('RGB')
+            self.levels.append(previous.reduce(2))
+        return self.levels[level]
+
+    def set_zoom(self, zoom: float):
+        self.zoom = zoom
+        self.close()
+
+    def render(self):
+        level_image = self.get_level()
+        size = self.tile_size
+        x0 = self.canvas.canvasx(0)
+        y0 = self.canvas.canvasy(0)
+        x1 = x0 + self.canvas.winfo_width()
+        y1 = y0 + self.canvas.winfo_height()
+        columns = range(max(int(x0 // size) - self.margin, 0),
+                        min(int(x1 // size) + self.margin, (level_image.width - 1) // size) + 1)
+        rows = range(max(int(y0 // size) - self.margin, 0),
+                     min(int(y1 // size) + self.margin, (level_image.height - 1) // size) + 1)
+        wanted = [(column, row) for row in rows for column in columns]
+        for key in wanted:
+            if key in self.tiles:
+                self.tiles.move_to_end(key)
+                continue
+            left, top = key[0] * size, key[1] * size
+            photo = ImageTk.PhotoImage(level_image.crop(
+                (left, top, min(left + size, level_image.width), min(top + size, level_image.height))))
+            tile_id = self.canvas.create_image(
+                left, top, image=photo, anchor=tk.NW, tags='img')
+            self.canvas.tag_lower(tile_id)
+            self.tiles[key] = (tile_id, photo)
+        # the wanted tiles were moved to the end, so only old ones are dropped
+        while len(self.tiles) > max(self.max_tiles, len(wanted)):
+            tile_id, photo = self.tiles.popitem(last=False)[1]
+            self.canvas.delete(tile_id)
+
+    def close(self):
+        for tile_id, photo in self.tiles.values():
+            self.canvas.delete(tile_id)
+        self.tiles.clear()
 
 
 class View(Frame):
@@ -347,11 +4698,40 @@ class View(Frame):
         a list of canvas Ids all selection
         boxes for the current image
 
+    drawn_boxes: dict[SelectionItem, tuple[tuple[int, ...], tuple]]
+        the canvas Ids of each selection box on the canvas, and the
+        coordinates and text they were drawn with
+
+    busy_rows: set[int]
+        the rows of selection_list highlighted as busy
+
+    active_box_id: int
+        the canvas Id of the active selection box
+
     selection_index: int
         the index of the currently active selection box
 
+    page_image: TiledImage
+        the image on the canvas
+
+    zoom: float
+        canvas pixels per page pixel, selection box data is always kept
+        in page pixels
+
     Methods
     -------
+    show_page(img)
+        puts a new image on the canvas
+
+    set_zoom(zoom, x, y)
+        zooms the canvas around a point
+
+    get_page_position(event)
+        returns the page coordinates of a mouse event
+
+    to_canvas(coords)
+        converts page coordinates to canvas coordinates
+
     scroll_start(event)
         saves the coordinates of a middle-mouse-click as part
         of enabling scrolling the canvas
@@ -376,6 +4756,9 @@ class View(Frame):
 
     change_active_box(new_index)
         chooses a different active selection box
+
+    show_busy(index, busy)
+        shows whether a selection box has OCR or translation running
     """
 
     def __init__(self, parent):
@@ -408,6 +4791,7 @@ class View(Frame):
         self.file.add_command(label='Open')
         self.file.add_command(label='Next File')
         self.file.add_command(label='Previous File')
+        self.file.add_command(label='Open Translation Memory')
 
         # edit commands
         self.edit.add_command(label='Add Selection')
@@ -415,6 +4799,9 @@ class View(Frame):
         self.edit.add_command(label='Run Ocr')
         self.edit.add_command(label='Run Translation')
         self.edit.add_command(label='Export')
+        self.edit.add_command(label='Translate Page')
+        self.edit.add_command(label='Translate Chapter')
+        self.edit.add_command(label='Group Boxes')
 
         # right click menu
         self.right_click_menu = Menu(parent, tearoff=False)
@@ -431,6 +4818,10 @@ class View(Frame):
         # canvas panning bindings
         self.canvas.bind("<ButtonPress-2>", self.scroll_start)
         self.canvas.bind("<B2-Motion>", self.scroll_move)
+        self.canvas.bind("<MouseWheel>", self.scroll_wheel)
+        self.canvas.bind("<Button-4>", self.scroll_wheel)
+        self.canvas.bind("<Button-5>", self.scroll_wheel)
+        self.canvas.bind("<Configure>", lambda event: self.render_page())
 
         # variables
         # selection box dragging variables
@@ -443,8 +4834,99 @@ class View(Frame):
         self.box_height = IntVar(value=0)
         # box ids
         self.box_ids = []
+        self.drawn_boxes = {}
+        self.busy_rows = set()
+        self.active_box_id = None
         # index of active box
         self.selection_index = 0
+        # the page
+        self.page_image = None
+        self.zoom = 1
+
+    def show_page(self, img: Image):
+        """
+        Puts a new image on the canvas at the current zoom,
+        scrolled to its top left corner
+
+        Parameters
+        ----------
+        img: Image
+            the full resolution image
+
+        Side Effects
+        ------------
+            * the old image's tiles are removed from the canvas
+            * page_image is replaced
+        """
+        if self.page_image is not None:
+            self.page_image.close()
+        self.page_image = TiledImage(self.canvas, img, self.zoom)
+        self.canvas.configure(scrollregion=(
+            0, 0, img.width * self.zoom, img.height * self.zoom))
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self.render_page()
+
+    def render_page(self):
+        """
+        Draws the tiles of the image that have scrolled into view
+        """
+        if self.page_image is not None:
+            self.page_image.render()
+
+    def set_zoom(self, zoom: float, x: int, y: int) -> bool:
+        """
+        Zooms the canvas, keeping the page point under a position in the
+        canvas widget in place
+
+        Parameters
+        ----------
+        zoom: float
+            the new zoom, rounded down to a power of two between MIN_ZOOM and 1
+
+        x, y: int
+            the position in the canvas widget to zoom around
+
+        Returns
+        -------
+            whether the zoom changed, in which case every canvas item
+            other than the image must be drawn again
+        """
+        zoom = 2.0 ** np.floor(np.log2(min(max(zoom, MIN_ZOOM), 1)))
+        if zoom == self.zoom or self.page_image is None:
+            return False
+        page_x = self.canvas.canvasx(x) / self.zoom
+        page_y = self.canvas.canvasy(y) / self.zoom
+        self.zoom = zoom
+        self.page_image.set_zoom(zoom)
+        width, height = self.page_image.image.width * zoom, self.page_image.image.height * zoom
+        self.canvas.configure(scrollregion=(0, 0, width, height))
+        self.canvas.xview_moveto((page_x * zoom - x) / width)
+        self.canvas.yview_moveto((page_y * zoom - y) / height)
+        self.render_page()
+        return True
+
+    def get_page_position(self, event: Event) -> tuple[float, float]:
+        """
+        Returns the page coordinates of a mouse event on the canvas
+
+        Parameters
+        ----------
+        event: Event
+            the mouse event
+        """
+        return self.canvas.canvasx(event.x) / self.zoom, self.canvas.canvasy(event.y) / self.zoom
+
+    def to_canvas(self, coords: tuple[float, ...]) -> tuple[float, ...]:
+        """
+        Converts page coordinates to canvas coordinates
+
+        Parameters
+        ----------
+        coords: tuple[float, ...]
+            any number of page coordinates
+        """
+        return tuple(c * self.zoom for c in coords)
 
     def scroll_start(self, event: Event):
         """
@@ -475,6 +4957,28 @@ class View(Frame):
             The position of the canvas is changed
         """
         self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.render_page()
+
+    def scroll_wheel(self, event: Event):
+        """
+        Bound to the mouse wheel.
+        Scrolls the canvas up and down, or left and right with shift held.
+
+        Parameters
+        ----------
+        event: Event
+            the mouse wheel event
+
+        Side Effects
+        ------------
+            The position of the canvas is changed
+        """
+        units = -1 if event.num == 4 or event.delta > 0 else 1
+        if event.state & 0x0001:
+            self.canvas.xview_scroll(units, 'units')
+        else:
+            self.canvas.yview_scroll(units, 'units')
+        self.render_page()
 
     def do_popup(self, event: Event):
         """
@@ -503,8 +5007,8 @@ class View(Frame):
         y0 = self.box_y_position.get()
         x1 = self.box_x_position.get() + self.box_width.get()
         y1 = self.box_height.get()+self.box_y_position.get()
-        self.canvas.coords(self.selection_box_id, x0, y0, x1, y1)
-        self.canvas.tag_raise(self.selection_box_id,self.image_id)
+        self.canvas.coords(self.selection_box_id, *self.to_canvas((x0, y0, x1, y1)))
+        self.canvas.tag_raise(self.selection_box_id,'img')
 
     def change_active_box(self, new_index: int):
         """
@@ -524,20 +5028,54 @@ class View(Frame):
             are configured
             * box_x_position, box_width, box_y_position, and box_height are changed
         """
-        if self.selection_index < self.sidepanel.selection_list.size():
-            self.canvas.itemconfigure(
-                self.box_ids[self.selection_index], state=tk.DISABLED)
+        if self.active_box_id is not None:
+            # boxes are no longer redrawn between edits, so the old
+            # active box may have moved or been deleted
+            self.canvas.itemconfigure(self.active_box_id, state=tk.DISABLED)
         self.selection_index = min(
             self.sidepanel.selection_list.size() - 1, new_index)
+        self.sidepanel.selection_list.selection_clear(0, tk.END)
         self.sidepanel.selection_list.selection_set(self.selection_index)
-        self.canvas.itemconfigure(
-            self.box_ids[self.selection_index], state=tk.NORMAL)
-        x0, y0, x1, y1 = self.canvas.coords(self.box_ids[self.selection_index])
+        self.active_box_id = self.box_ids[self.selection_index]
+        self.canvas.itemconfigure(self.active_box_id, state=tk.NORMAL)
+        x0, y0, x1, y1 = (c / self.zoom for c in self.canvas.coords(self.box_ids[self.selection_index]))
         self.box_x_position.set(x0)
         self.box_width.set(x1-x0)
         self.box_y_position.set(y0)
         self.box_height.set(y1-y0)
 
+    def show_busy(self, index: int, busy: bool):
+        """
+        shows whether the selection box at the specified
+        index has OCR or translation running
+
+        Parameters
+        ----------
+        index: int
+            the index of the box
+
+        busy: bool
+            whether the box has a job running
+
+        Side Effects
+        ------------
+            a canvas item and a selection_list item are configured
+        """
+        if index < len(self.box_ids):
+            if busy:
+                self.canvas.itemconfigure(
+                    self.box_ids[index], outline='orange', disabledoutline='orange')
+            else:
+                self.canvas.itemconfigure(
+                    self.box_ids[index], outline='black', disabledoutline='blue')
+        if index < self.sidepanel.selection_list.size():
+            self.sidepanel.selection_list.itemconfigure(
+                index, background='orange' if busy else '')
+            if busy:
+                self.busy_rows.add(index)
+            else:
+                self.busy_rows.discard(index)
+
 
 class SidePanel():
     """
@@ -573,12 +5111,18 @@ class SidePanel():
         the canvas that previews the current selection converted to
         black and white according to the threshold
 
+    preview_photo: ImageTk.PhotoImage
+        the image shown on preview_image, updated in place by show_preview
+
     threshold_slider: tk.Scale
         the slider that controls threshold
 
     threshold: IntVar
         the value of the threshold slider widget
 
+    auto_threshold_button: Button
+        the button for finding the best threshold automatically
+
     run_ocr_button: Button
         the button for manually running OCR
 
@@ -587,6 +5131,24 @@ class SidePanel():
 
     export_button: Button
         the button for exporting
+
+    cache_stats_label: Label
+        shows how many scans were answered by the OCR cache
+
+    translation_memory_stats_label: Label
+        shows how many translations were answered by the translation memory
+
+    page_cache_stats_label: Label
+        shows how many pages were already decoded when opened
+
+    status_label: Label
+        shows the last thing that went wrong in the background, such as
+        a failed autosave
+
+    Methods
+    -------
+    show_preview(img)
+        shows an image on the preview canvas
     """
 
     def __init__(self, root):
@@ -626,6 +5188,10 @@ class SidePanel():
         # canvas
         self.preview_image = Canvas(self.frame, width=400, height=200)
         self.preview_image.pack(side="top", fill=tk.BOTH)
+        # a single photo image, which is pasted over for every preview
+        self.preview_photo = ImageTk.PhotoImage('L', (400, 200))
+        self.preview_image.create_image(
+            0, 0, image=self.preview_photo, anchor=tk.NW, tag="img")
 
         # threshold slider
         self.threshold = IntVar()
@@ -633,6 +5199,10 @@ class SidePanel():
             self.frame, variable=self.threshold, orient='horizontal', from_=0, to=254)
         self.threshold_slider.pack(side="top", fill=tk.BOTH)
 
+        # auto threshold button
+        self.auto_threshold_button = Button(self.frame, text="Auto Threshold")
+        self.auto_threshold_button.pack(side="top", fill=tk.BOTH)
+
         # run ocr button
         self.run_ocr_button = Button(self.frame, text="Run OCR")
         self.run_ocr_button.pack(side="top", fill=tk.BOTH)
@@ -660,6 +5230,41 @@ class SidePanel():
         self.tool_type_label = Label(self.frame)
         self.tool_type_label.pack(side="top", fill=tk.BOTH)
 
+        # ocr cache stats label
+        self.cache_stats_label = Label(self.frame)
+        self.cache_stats_label.pack(side="top", fill=tk.BOTH)
+
+        # translation memory stats label
+        self.translation_memory_stats_label = Label(self.frame)
+        self.translation_memory_stats_label.pack(side="top", fill=tk.BOTH)
+
+        # page cache stats label
+        self.page_cache_stats_label = Label(self.frame)
+        self.page_cache_stats_label.pack(side="top", fill=tk.BOTH)
+
+        # status label
+        self.status_label = Label(self.frame, foreground='red', wraplength=400)
+        self.status_label.pack(side="top", fill=tk.BOTH)
+
+    def show_preview(self, img: Image):
+        """
+        Shows an image on the preview canvas by pasting it into
+        preview_photo, clipped to the size of the canvas
+
+        Parameters
+        ----------
+        img: Image
+            the thresholded selection
+
+        Side Effects
+        ------------
+            preview_photo is updated
+        """
+        preview = ig.new('L', (self.preview_photo.width(),
+                         self.preview_photo.height()), 255)
+        preview.paste(img.convert('L'), (0, 0))
+        self.preview_photo.paste(preview)
+
 
 class Controller:
     """
@@ -679,6 +5284,15 @@ class Controller:
     path: str
         file path of current open image
 
+    autosaver: Autosaver
+        saves the model in the background, None if autosave is off
+
+    status_messages: queue.Queue
+        messages from background threads, shown by poll_status
+
+    status_message: str
+        the message status_label is showing
+
     Methods
     -------
     on_listbox_select(event)
@@ -741,25 +5355,66 @@ class Controller:
 
     export_button_clicked(event)
         exports a translated image when the button is clicked
+
+    show_status(message)
+        shows a message in the sidepanel's status label
+
+    quit()
+        saves and closes the window
     """
 
-    def __init__(self):
+    def __init__(self, detector: str = 'regions', prefetch_pages: int = 2, page_cache_size: int = 512,
+                 store_type: str = 'journal', autosave: float = 30):
         self.root = tk.Tk()
         self.root.title('Novice Scanlator App')
         self.path = ""
         self.display_mode = "box"
+        # how get_bounding_boxes_button_clicked finds text, one of DETECTORS
+        self.detector = detector
+        # the after() id of a scheduled preview render
+        self.preview_render_pending = None
+        # the whole page scans made by get_bounding_boxes_button_clicked
+        self.page_ocr = {}
         # choose source directory
         self.source_directory = filedialog.askdirectory(
             title="Select Directory")
-        # create model
-        self.model = Model()
+        # start the OCR workers while the user picks a file
+        start_ocr_pool()
+        # create model, saved in one of PROJECT_STORES
+        self.model = Model(store_type)
         # set directory
         self.model.set_directory(self.source_directory)
         # load data if it exists
         self.model.startup_check(self.source_directory)
+        # reuse scans and translations from earlier sessions
+        open_ocr_cache(self.source_directory)
+        open_translation_memory(
+            get_translation_memory_path(self.source_directory))
+        # background threads can't touch the widgets, so they send their
+        # messages through a queue
+        self.status_message = ""
+        self.status_messages = queue.Queue()
+        self.root.after(0, self.poll_status)
+        # saves every autosave seconds, if anything has changed
+        self.autosaver = Autosaver(
+            self.model, self.source_directory, autosave,
+            self.status_messages) if autosave > 0 else None
+        # picks up pages added to, changed in or removed from the directory,
+        # scanned on a thread of its own and handed back through a queue
+        self.directory_scan = None
+        self.directory_changes = queue.Queue()
+        # a failing scan is only reported once, until one succeeds again
+        self.directory_scan_failing = False
+        self.root.after(0, self.poll_directory)
+        # keeps the pages around the current one decoded, page_cache_size is in MB
+        self.page_cache = PageCache(
+            self.source_directory, page_cache_size * 2 ** 20, prefetch_pages)
         # create view
         self.view = View(self.root)
 
+        # set while load_selection_data fills in the sidepanel, so the
+        # traces below don't record it as an edit
+        self.loading_selection = False
         # sidepanel variable bindings
         self.view.sidepanel.selection_list.bind(
             '<<ListboxSelect>>', self.on_listbox_select)
@@ -769,6 +5424,12 @@ class Controller:
             'write', self.update_is_vertical_data)
         self.view.sidepanel.threshold.trace_add(
             'write', self.update_preview_image)
+        self.view.sidepanel.threshold.trace_add(
+            'write', self.cancel_rethresholded_job)
+
+        # runs ocr and translation in the background
+        self.ocr_jobs = OcrJobRunner(
+            self.root, self.model, self.apply_job_result, self.show_box_busy)
 
         # sidepanel widget bindings
         self.view.sidepanel.run_ocr_button.bind(
@@ -781,6 +5442,8 @@ class Controller:
             '<Button-1>', self.toggle_display_mode_button_clicked)
         self.view.sidepanel.get_bounding_boxes_button.bind(
             '<Button-1>', self.get_bounding_boxes_button_clicked)
+        self.view.sidepanel.auto_threshold_button.bind(
+            '<Button-1>', self.auto_threshold_button_clicked)
 
         # file menu command bindings
         self.view.file.entryconfig(
@@ -789,6 +5452,8 @@ class Controller:
             self.get_file_path_by_open_file_dialog()))
         self.view.file.entryconfig(2, command=self.next_file)
         self.view.file.entryconfig(3, command=self.prev_file)
+        self.view.file.entryconfig(
+            4, command=self.open_translation_memory_clicked)
 
         # edit menu command bindings
         self.view.edit.entryconfig(0, command=self.add_selection)
@@ -796,7 +5461,12 @@ class Controller:
         self.view.edit.entryconfig(2, command=self.run_ocr_button_clicked)
         self.view.edit.entryconfig(
             3, command=self.run_translation_button_clicked)
-        self.view.edit.entryconfig(5, command=self.export_button_clicked)
+        self.view.edit.entryconfig(4, command=self.export_button_clicked)
+        self.view.edit.entryconfig(
+            5, command=lambda: self.translate_items(self.model.get_untranslated_items(self.path)))
+        self.view.edit.entryconfig(
+            6, command=lambda: self.translate_items(self.model.get_untranslated_items()))
+        self.view.edit.entryconfig(7, command=self.group_boxes_clicked)
 
         # right click menu bindings
         self.view.right_click_menu.entryconfig(0, command=self.add_selection)
@@ -807,7 +5477,7 @@ class Controller:
         self.view.right_click_menu.entryconfig(
             3, command=self.run_translation_button_clicked)
         self.view.right_click_menu.entryconfig(
-            5, command=self.export_button_clicked)
+            4, command=self.export_button_clicked)
 
         # additional canvas mouse click bindings
         self.view.canvas.bind("<ButtonPress-1>", self.select_start)
@@ -822,7 +5492,8 @@ class Controller:
         self.root.bind('q', lambda event: self.prev_tool_type())
         self.root.bind('<Tab>', self.next_file_hotkey)
         self.root.bind('<Shift-Tab>', self.prev_file_hotkey)
-        self.root.bind('<Control-s>', lambda event: self.model.save_file())
+        self.root.bind('<Control-s>', lambda event: self.model.save_file(self.source_directory))
+        self.root.protocol('WM_DELETE_WINDOW', self.quit)
         self.root.bind('a', lambda event: self.set_tool_type(ToolType.ADD))
         self.root.bind('s', lambda event: self.set_tool_type(ToolType.SELECT))
         self.root.bind('d', lambda event: self.set_tool_type(ToolType.DELETE))
@@ -830,7 +5501,15 @@ class Controller:
         self.root.bind('z', lambda event: self.set_tool_type(ToolType.TRANSFORM))
         self.root.bind('x', lambda event: self.set_tool_type(ToolType.SPLIT))
         self.root.bind('c', lambda event: self.set_tool_type(ToolType.CROP))
+        self.root.bind('b', lambda event: self.set_tool_type(ToolType.FILL))
+        self.root.bind('t', self.auto_threshold_button_clicked)
+        self.root.bind('g', self.group_boxes_clicked)
         self.view.canvas.bind("<Motion>",self.update_cursor)
+        self.view.canvas.bind("<Control-MouseWheel>", self.zoom_wheel)
+        self.view.canvas.bind("<Control-Button-4>", self.zoom_wheel)
+        self.view.canvas.bind("<Control-Button-5>", self.zoom_wheel)
+        self.root.bind('<Control-equal>', lambda event: self.zoom(2))
+        self.root.bind('<Control-minus>', lambda event: self.zoom(0.5))
 
         self.transform_move = False
         (self.transform_x0,self.transform_y0,self.transform_x1,self.transform_y1) = (False,False,False,False)
@@ -847,26 +5526,63 @@ class Controller:
         self.view.selection_box_id = self.view.canvas.create_rectangle((0,0,0,0),**select_opts)
 
     def update_cursor(self, event):
-        canvas_x = self.view.canvas.canvasx(event.x)
-        canvas_y = self.view.canvas.canvasy(event.y)
+        canvas_x, canvas_y = self.view.get_page_position(event)
+        # how close to an edge grabs it, 10 pixels on screen
+        grab = 10 / self.view.zoom
         # TODO: make collision box larger
-        boxes = list(set(self.view.canvas.find_overlapping(canvas_x,canvas_y,canvas_x,canvas_y)).intersection(set(self.view.box_ids)))
+        boxes = self.model.find_boxes(self.path, canvas_x, canvas_y, canvas_x, canvas_y)
         if len(boxes) > 0 and self.tool_type == ToolType.TRANSFORM:
-            box = self.model.selection_item_data[self.path][self.get_data_index_from_box_id(
-            boxes[0])].coords
-            if (canvas_x - box[0] <= 10 and canvas_y - box[1] <= 10) or (box[2] - canvas_x <= 10 and box[3] - canvas_y <= 10):
+            box = boxes[-1].coords
+            if (canvas_x - box[0] <= grab and canvas_y - box[1] <= grab) or (box[2] - canvas_x <= grab and box[3] - canvas_y <= grab):
                 self.view.canvas.config(cursor="@downright_upleft_double_arrow.cur")
-            elif (canvas_x - box[0] <= 10 and box[3] - canvas_y <= 10) or (box[2] - canvas_x <= 10 and canvas_y - box[1] <= 10):
+            elif (canvas_x - box[0] <= grab and box[3] - canvas_y <= grab) or (box[2] - canvas_x <= grab and canvas_y - box[1] <= grab):
                 self.view.canvas.config(cursor="@upright_downleft_double_arrow.cur")
-            elif canvas_x - box[0] <= 10 or box[2] - canvas_x <= 10:
+            elif canvas_x - box[0] <= grab or box[2] - canvas_x <= grab:
                 self.view.canvas.config(cursor="@horizontal_double_arrow.cur")
-            elif canvas_y - box[1] <= 10 or box[3] - canvas_y <= 10:
+            elif canvas_y - box[1] <= grab or box[3] - canvas_y <= grab:
                 self.view.canvas.config(cursor="@up_down_double_arrow.cur")
             else:
                 self.view.canvas.config(cursor="fleur")
         else:
             self.view.canvas.config(cursor="arrow")
 
+    def zoom_wheel(self, event: Event):
+        """
+        Bound to the mouse wheel with control held.
+        Zooms in or out around the mouse.
+
+        Parameters
+        ----------
+        event: Event
+            the mouse wheel event
+        """
+        self.zoom(2 if event.num == 4 or event.delta > 0 else 0.5, event.x, event.y)
+
+    def zoom(self, factor: float, x: int = None, y: int = None):
+        """
+        Zooms the canvas in or out, redrawing the selection boxes at the
+        new scale
+
+        Parameters
+        ----------
+        factor: float
+            what to multiply the zoom by
+
+        x, y: int
+            the position in the canvas to zoom around, the middle if None
+
+        Side Effects
+        ------------
+            The canvas is updated
+        """
+        if x is None:
+            x, y = self.view.canvas.winfo_width() // 2, self.view.canvas.winfo_height() // 2
+        if self.view.set_zoom(self.view.zoom * factor, x, y):
+            self.clear_boxes()
+            self.set_boxes(self.path)
+            if len(self.view.box_ids) > 0:
+                self.view.change_active_box(self.view.selection_index)
+
     def next_file_hotkey(self, event: None):
         self.next_file()
         return 'break'
@@ -919,6 +5635,8 @@ class Controller:
             removing an entry from model.selection_item_data
             and updating the sidebar's selection list
         """
+        self.ocr_jobs.cancel(
+            self.model.selection_item_data[self.path][self.view.selection_index])
         self.model.delete_row(self.path, self.view.selection_index)
         self.update_gui_with_file_data(self.path)
 
@@ -936,14 +5654,17 @@ class Controller:
         ------------
             The view's widgets are updated
         """
-        # refresh all selection boxes
+        # redraw the selection boxes that changed
         self.set_boxes(path)
 
-        # refresh list of selection boxes
-        self.view.sidepanel.selection_list.delete(
-            0, self.view.sidepanel.selection_list.size() - 1)
-        for i in range(len(self.model.selection_item_data[path])):
-            self.view.sidepanel.selection_list.insert(tk.END, str(i))
+        # the list only shows box numbers, so only its end ever changes
+        selection_list = self.view.sidepanel.selection_list
+        size = len(self.model.selection_item_data[path])
+        if selection_list.size() > size:
+            selection_list.delete(size, tk.END)
+        for i in range(selection_list.size(), size):
+            selection_list.insert(tk.END, str(i))
+        self.refresh_busy_indicators()
         # set the active box
         self.view.change_active_box(self.view.sidepanel.selection_list.size())
 
@@ -978,12 +5699,17 @@ class Controller:
             self.model.selection_item_data[path][selection_index].ocr_output)
         self.set_translation(
             self.model.selection_item_data[path][selection_index].translation)
-        self.view.sidepanel.is_inverted.set(
-            int(self.model.selection_item_data[path][selection_index].is_inverted))
-        self.view.sidepanel.is_vertical.set(
-            int(self.model.selection_item_data[path][selection_index].is_vertical))
-        self.view.sidepanel.threshold.set(
-            self.model.selection_item_data[path][selection_index].threshold)
+        # showing a box's settings isn't a change to them
+        self.loading_selection = True
+        try:
+            self.view.sidepanel.is_inverted.set(
+                int(self.model.selection_item_data[path][selection_index].is_inverted))
+            self.view.sidepanel.is_vertical.set(
+                int(self.model.selection_item_data[path][selection_index].is_vertical))
+            self.view.sidepanel.threshold.set(
+                self.model.selection_item_data[path][selection_index].threshold)
+        finally:
+            self.loading_selection = False
         self.update_preview_image()
 
     def set_ocr_output(self, ocr_output: str):
@@ -1020,7 +5746,9 @@ class Controller:
 
     def set_boxes(self, path: str):
         """
-        Loads selection box data for a given image file.
+        Brings the canvas up to date with the selection box data for a
+        given image file. Only boxes that were added, deleted, moved or
+        retranslated since the last call are touched.
 
         Parameters
         ----------
@@ -1030,22 +5758,68 @@ class Controller:
         Side Effects
         ------------
             * The canvas is updated
-            * view.boxes is updated
+            * view.box_ids and view.drawn_boxes are updated
         """
-        self.view.box_ids.clear()
-        self.view.canvas.delete('selection')
+        items = self.model.selection_item_data[path]
+        drawn_boxes = self.view.drawn_boxes
+        current = set(items)
+        for item in [item for item in drawn_boxes if item not in current]:
+            self.view.canvas.delete(*drawn_boxes.pop(item)[0])
+        for i in items:
+            state = (tuple(i.coords), i.translation if self.display_mode == "preview" else None)
+            drawn = drawn_boxes.get(i)
+            if drawn is None:
+                drawn_boxes[i] = (self.draw_box(i), state)
+            elif drawn[1] != state:
+                coords = self.view.to_canvas(i.coords)
+                self.view.canvas.coords(drawn[0][0], *coords)
+                if len(drawn[0]) > 1:
+                    self.view.canvas.coords(
+                        drawn[0][1], (coords[0] + coords[2])/2, (coords[1] + coords[3])/2)
+                    self.view.canvas.itemconfigure(
+                        drawn[0][1], text=i.translation, width=coords[2]-coords[0])
+                drawn_boxes[i] = (drawn[0], state)
+        self.view.box_ids = [drawn_boxes[i][0][0] for i in items]
+        self.refresh_busy_indicators()
+
+    def draw_box(self, i: SelectionItem) -> tuple[int, ...]:
+        """
+        Draws a selection box in the current display mode
+
+        Parameters
+        ----------
+        i: SelectionItem
+            the box to draw
+
+        Returns
+        -------
+            the canvas Ids of the rectangle and, in preview mode, its text
+        """
+        coords = self.view.to_canvas(i.coords)
         if self.display_mode == "box":
-            for i in self.model.selection_item_data[path]:
-                self.view.box_ids.append(self.view.canvas.create_rectangle(
-                    i.coords[0], i.coords[1], i.coords[2], i.coords[3], **self.model.select_opts))
-        else:
-            select_opts = dict(fill='white', stipple='',
-                               width=0, state=tk.NORMAL, tags='selection')
-            for i in self.model.selection_item_data[path]:
-                self.view.box_ids.append(self.view.canvas.create_rectangle(
-                    i.coords[0], i.coords[1], i.coords[2], i.coords[3], **select_opts))
+            return (self.view.canvas.create_rectangle(
+                coords[0], coords[1], coords[2], coords[3], **self.model.select_opts),)
+        select_opts = dict(fill='white', stipple='',
+                           width=0, state=tk.NORMAL, tags='selection')
+        return (self.view.canvas.create_rectangle(
+                    coords[0], coords[1], coords[2], coords[3], **select_opts),
                 self.view.canvas.create_text(
-                    (i.coords[0] + i.coords[2])/2, (i.coords[1] + i.coords[3])/2, text=i.translation, tags='selection', font=('Arial', '12'), width=i.coords[2]-i.coords[0])
+                    (coords[0] + coords[2])/2, (coords[1] + coords[3])/2, text=i.translation, tags='selection', font=('Arial', '12'), width=coords[2]-coords[0]))
+
+    def clear_boxes(self):
+        """
+        Removes every selection box from the canvas, so the next call to
+        set_boxes draws them all again
+
+        Side Effects
+        ------------
+            * The canvas is updated
+            * view.box_ids and view.drawn_boxes are emptied
+        """
+        self.view.canvas.delete('selection')
+        self.view.drawn_boxes.clear()
+        self.view.box_ids = []
+        self.view.active_box_id = None
 
     def get_file_path_by_open_file_dialog(self) -> str:
         """
@@ -1074,21 +5848,122 @@ class Controller:
         """
         # update the current file path in "state"
         self.path = path
+        # the new image goes on top, so every box is drawn again above it
+        self.clear_boxes()
 
-        # open the new image
-        self.image = ig.open(self.source_directory + "/" + path)
-        img = ImageTk.PhotoImage(self.image)
-        self.view.image_id = self.view.canvas.create_image(
-            0, 0, image=img, anchor=tk.NW, tag="img")
-        self.view.canvas.img = img  # Keep reference.
+        # open the new image, then start decoding its neighbors
+        self.image, self.page = self.page_cache.get(path)
+        self.page_cache.prefetch(self.model.paths, path)
+        self.view.sidepanel.page_cache_stats_label.configure(
+            text=format_page_cache_stats(self.page_cache.stats()))
 
-        # reset canvas dimensions
-        self.view.canvas.configure(width=img.width(), height=img.height(
-        ), scrollregion=self.view.canvas.bbox("all"))
+        # reset canvas dimensions, a tall strip is scrolled rather than
+        # making the window taller than the screen
+        self.view.canvas.configure(width=min(self.image.width, self.root.winfo_screenwidth()),
+                                   height=min(self.image.height, self.root.winfo_screenheight()))
+        self.view.show_page(self.image)
 
         # update_gui_with_file_data refreshes all GUI
         self.update_gui_with_file_data(path)
 
+    def show_status(self, message: str):
+        """
+        Shows a message in the sidepanel's status label. A message that is
+        already showing isn't shown again, so a failure that happens on
+        every try is only reported once.
+
+        Parameters
+        ----------
+        message: str
+            the message to show
+        """
+        if message == self.status_message:
+            return
+        self.status_message = message
+        self.view.sidepanel.status_label.configure(text=message)
+
+    def poll_status(self):
+        """
+        Shows the messages sent by background threads, every
+        STATUS_POLL_INTERVAL milliseconds
+        """
+        while True:
+            try:
+                message = self.status_messages.get_nowait()
+            except queue.Empty:
+                break
+            self.show_status(message)
+        self.root.after(STATUS_POLL_INTERVAL, self.poll_status)
+
+    def poll_directory(self):
+        """
+        Applies the result of the last scan of the source directory, and
+        starts another on a background thread, every
+        DIRECTORY_POLL_INTERVAL milliseconds. A scan only reads the
+        directory listing, unless files were added or changed.
+
+        Side Effects
+        ------------
+            * a thread running scan_directory may be started
+            * see apply_directory_changes
+        """
+        try:
+            changes = self.directory_changes.get_nowait()
+        except queue.Empty:
+            changes = None
+        if changes is not None:
+            self.apply_directory_changes(*changes)
+        if self.directory_scan is None or not self.directory_scan.is_alive():
+            self.directory_scan = threading.Thread(
+                target=self.scan_directory, daemon=True)
+            self.directory_scan.start()
+        self.root.after(DIRECTORY_POLL_INTERVAL, self.poll_directory)
+
+    def scan_directory(self):
+        # runs on its own thread, the result is applied by poll_directory
+        try:
+            changes = self.model.page_index.refresh()
+        except OSError as e:
+            if not self.directory_scan_failing:
+                self.directory_scan_failing = True
+                self.status_messages.put(f"Couldn't check the directory for changes: {e}")
+            return
+        if self.directory_scan_failing:
+            self.directory_scan_failing = False
+            self.status_messages.put("Checking the directory for changes again")
+        self.directory_changes.put(changes)
+
+    def apply_directory_changes(self, added: list[str], changed: list[str], removed: list[str]):
+        """
+        Updates the GUI for pages added to, changed in or removed from the
+        source directory. Changed and removed pages are dropped from the
+        caches. The open page is shown again if it changed, and replaced
+        by the page after it if it was removed.
+
+        Parameters
+        ----------
+        added, changed, removed: list[str]
+            the file names of the pages, from PageIndex.refresh
+
+        Side Effects
+        ------------
+            * the model's paths are updated
+            * page_cache and page_ocr are updated
+            * another page may be opened
+        """
+        if added or removed:
+            self.model.paths = self.model.page_index.get_paths()
+        for path in changed + removed:
+            self.page_cache.invalidate(path)
+            self.page_ocr.pop(path, None)
+        if self.path in removed:
+            if len(self.model.paths) > 0:
+                paths = self.model.paths
+                self.open_image_file_by_path(
+                    paths[min(bisect.bisect_left(paths, self.path), len(paths) - 1)])
+        elif self.path in changed:
+            self.open_image_file_by_path(self.path)
+
     def next_file(self):
         """
         Opens the next file
@@ -1097,9 +5972,12 @@ class Controller:
         ------------
             Calls open_image_file_by_path, updating the canvas and GUI
         """
-        path_index = self.model.paths.index(self.path)
+        if len(self.model.paths) == 0:
+            return
+        # paths are sorted, so this also works if the open page has been removed
+        path_index = bisect.bisect_right(self.model.paths, self.path)
         self.open_image_file_by_path(
-            self.model.paths[(path_index+1) % len(self.model.paths)])
+            self.model.paths[path_index % len(self.model.paths)])
 
     def prev_file(self):
         """
@@ -1109,12 +5987,11 @@ class Controller:
         ------------
             Calls open_image_file_by_path, updating the canvas and GUI
         """
-        path_index = self.model.paths.index(self.path)
-        if path_index == 0:
-            self.open_image_file_by_path(
-                self.model.paths[len(self.model.paths) - 1])
-        else:
-            self.open_image_file_by_path(self.model.paths[path_index - 1])
+        if len(self.model.paths) == 0:
+            return
+        # paths are sorted, so this also works if the open page has been removed
+        path_index = bisect.bisect_left(self.model.paths, self.path)
+        self.open_image_file_by_path(self.model.paths[path_index - 1])
 
     def select_start(self, event: Event):
         """
@@ -1133,29 +6010,28 @@ class Controller:
             mouse_down_y are changed
         """
         # TODO: include transform_offset for the offset between cursor position and rectangle corner/side
-        canvas_x = self.view.canvas.canvasx(event.x)
-        canvas_y = self.view.canvas.canvasy(event.y)
+        canvas_x, canvas_y = self.view.get_page_position(event)
+        grab = 10 / self.view.zoom
         self.view.box_x_position.set(canvas_x)
         self.view.mouse_down_x.set(canvas_x)
         self.view.box_y_position.set(canvas_y)
         self.view.mouse_down_y.set(canvas_y)
         if self.tool_type == ToolType.TRANSFORM:
-            boxes = list(set(self.view.canvas.find_overlapping(canvas_x,canvas_y,canvas_x,canvas_y)).intersection(set(self.view.box_ids)))
+            boxes = self.model.find_boxes(self.path, canvas_x, canvas_y, canvas_x, canvas_y)
             if len(boxes) > 0:
                 self.view.sidepanel.selection_list.selection_clear(self.view.selection_index)
-                self.view.change_active_box(self.get_data_index_from_box_id(boxes[0]))
+                self.view.change_active_box(self.model.index_of(self.path, boxes[-1]))
                 self.load_selection_data(self.path,self.view.selection_index)
-                box = self.model.selection_item_data[self.path][self.get_data_index_from_box_id(
-                boxes[0])].coords
+                box = boxes[-1].coords
                 self.transform_offset = (canvas_x - box[0],canvas_y - box[1])
-                if not(canvas_x - box[0] <= 10 or canvas_y - box[1] <= 10 or box[2] - canvas_x <= 10 or box[3] - canvas_y <= 10):
+                if not(canvas_x - box[0] <= grab or canvas_y - box[1] <= grab or box[2] - canvas_x <= grab or box[3] - canvas_y <= grab):
                     self.transform_move = True
                 else:
                     self.remember_coords = (box[0],box[1],box[2],box[3])
-                    self.transform_x0 = True if canvas_x - box[0] <= 10 else False
-                    self.transform_y0 = True if canvas_y - box[1] <= 10 else False
-                    self.transform_x1 = True if box[2] - canvas_x <= 10 else False
-                    self.transform_y1 = True if box[3] - canvas_y <= 10 else False
+                    self.transform_x0 = True if canvas_x - box[0] <= grab else False
+                    self.transform_y0 = True if canvas_y - box[1] <= grab else False
+                    self.transform_x1 = True if box[2] - canvas_x <= grab else False
+                    self.transform_y1 = True if box[3] - canvas_y <= grab else False
 
     def select_move(self, event: Event):
         """
@@ -1173,8 +6049,7 @@ class Controller:
         -----------
             box_x_position, box_width, box_y_position and box_height are changed
         """
-        canvas_x = self.view.canvas.canvasx(event.x)
-        canvas_y = self.view.canvas.canvasy(event.y)
+        canvas_x, canvas_y = self.view.get_page_position(event)
         if self.tool_type == ToolType.TRANSFORM:
             if self.transform_move == True:
                 self.view.box_x_position.set(canvas_x - self.transform_offset[0])
@@ -1219,7 +6094,7 @@ class Controller:
         y0 = self.view.box_y_position.get()
         x1 = self.view.box_x_position.get()+self.view.box_width.get()
         y1 = self.view.box_y_position.get()+self.view.box_height.get()
-        intersecting_boxes = list(set(self.view.canvas.find_overlapping(x0,y0, x1, y1)).intersection(set(self.view.box_ids)))
+        intersecting_boxes = self.model.find_boxes(self.path, x0, y0, x1, y1)
         if self.tool_type == ToolType.CROP:
             self.crop_intersecting_boxes((x0, y0, x1, y1), intersecting_boxes)
         elif self.tool_type == ToolType.DELETE:
@@ -1234,9 +6109,11 @@ class Controller:
         elif self.tool_type == ToolType.ADD:
             self.add_box((x0, y0, x1, y1))
             self.run_all_ops_on_current_selection()
+        elif self.tool_type == ToolType.FILL:
+            self.fill_box(self.view.mouse_down_x.get(), self.view.mouse_down_y.get())
         elif self.tool_type == ToolType.TRANSFORM:
-            self.model.selection_item_data[self.path][self.view.selection_index].coords = (
-                x0, y0, x1, y1)
+            self.model.set_coords(self.path, self.model.selection_item_data[self.path][self.view.selection_index],
+                                  (x0, y0, x1, y1))
             self.transform_move = False
             (self.transform_x0,self.transform_y0,self.transform_x1,self.transform_y1) = (False,False,False,False)
             self.set_boxes(self.path)
@@ -1244,9 +6121,9 @@ class Controller:
         elif self.tool_type == ToolType.SELECT:
             if len(intersecting_boxes) > 0:
                 self.view.sidepanel.selection_list.selection_clear(self.view.selection_index)
-                self.view.change_active_box(self.get_data_index_from_box_id(intersecting_boxes[0]))
+                self.view.change_active_box(self.model.index_of(self.path, intersecting_boxes[-1]))
                 self.load_selection_data(self.path,self.view.selection_index)
-        self.view.canvas.tag_lower(self.view.selection_box_id,self.view.image_id)
+        self.view.canvas.tag_lower(self.view.selection_box_id,'img')
 
     def update_is_inverted_data(self, varname=None, idx=None, mode=None):
         """
@@ -1262,8 +6139,14 @@ class Controller:
         ------------
             Updates the model's selection item data
         """
-        self.model.selection_item_data[self.path][self.view.selection_index].is_inverted = bool(
-            self.view.sidepanel.is_inverted.get())
+        if self.loading_selection:
+            return
+        item = self.model.selection_item_data[self.path][self.view.selection_index]
+        is_inverted = bool(self.view.sidepanel.is_inverted.get())
+        if item.is_inverted == is_inverted:
+            return
+        item.is_inverted = is_inverted
+        self.model.record_update(self.path, item)
 
     def update_is_vertical_data(self, varname=None, idx=None, mode=None):
         """
@@ -1279,8 +6162,14 @@ class Controller:
         ------------
             Updates the model's selection item data
         """
-        self.model.selection_item_data[self.path][self.view.selection_index].is_vertical = bool(
-            self.view.sidepanel.is_vertical.get())
+        if self.loading_selection:
+            return
+        item = self.model.selection_item_data[self.path][self.view.selection_index]
+        is_vertical = bool(self.view.sidepanel.is_vertical.get())
+        if item.is_vertical == is_vertical:
+            return
+        item.is_vertical = is_vertical
+        self.model.record_update(self.path, item)
 
     def run_ocr_button_clicked(self, event=None):
         """
@@ -1316,18 +6205,80 @@ class Controller:
             * The value of model's selection_item_data is changed
         """
         ocr_output = self.view.sidepanel.ocr_area.get("1.0", END)
-        self.model.selection_item_data[self.path][self.view.selection_index].ocr_output = ocr_output
-        self.update_translation(ocr_output)
+        item = self.model.selection_item_data[self.path][self.view.selection_index]
+        item.ocr_output = ocr_output
+        self.model.record_update(self.path, item)
+        self.ocr_jobs.submit(self.path, item, ocr_output=ocr_output)
 
     def run_all_ops_on_current_selection(self):
         """
-        Gets an image cropped to the bounds of the current selection box.
-        Calls run_ocr on the cropped image.
-        Updates the ocr area with the result of run_ocr.
-        Calls run_translation on the ocr output.
-        Updates the translation area with the result of run_translation.
+        Starts a background job for the current selection box, which
+        scans the image inside it and translates the result.
+        The ocr and translation areas are updated by apply_job_result
+        when the job finishes.
         Updates preview image with the cropped image.
 
+        Side Effects
+        ------------
+            The value of model's selection_item_data is changed
+            A job is submitted to ocr_jobs
+            The preview image is updated
+        """
+        item = self.model.selection_item_data[self.path][self.view.selection_index]
+        threshold = self.view.sidepanel.threshold.get()
+        if item.threshold != threshold:
+            item.threshold = threshold
+            self.model.record_update(self.path, item)
+        if self.path in self.page_ocr and has_default_settings(item):
+            # read the text from the page scan, rather than scanning again
+            text, confidence = self.page_ocr[self.path].get_text(item.coords)
+            if text != "" and confidence >= MIN_PAGE_OCR_CONFIDENCE:
+                item.ocr_output = text
+                self.model.record_update(self.path, item)
+                self.set_ocr_output(text)
+                self.ocr_jobs.submit(self.path, item, ocr_output=text)
+                self.update_preview_image()
+                return
+        self.ocr_jobs.submit(self.path, item, self.page.crop([self.view.box_x_position.get(), self.view.box_y_position.get(
+        ), self.view.box_x_position.get()+self.view.box_width.get(), self.view.box_y_position.get()+self.view.box_height.get()]))
+        self.update_preview_image()
+
+    def open_translation_memory_clicked(self):
+        """
+        Asks for a translation memory database to use instead of the
+        project's own, such as one shared by every chapter of a series
+
+        Side Effects
+        ------------
+            The translation memory is replaced
+        """
+        file_path = filedialog.asksaveasfilename(title="Open Translation Memory", filetypes=(
+            ("sqlite files", ".sqlite3"),), initialdir=self.source_directory, confirmoverwrite=False)
+        if file_path:
+            open_translation_memory(file_path)
+
+    def translate_items(self, path_items: list[tuple[str, SelectionItem]]):
+        """
+        Translates many selection boxes in the background, in batches
+
+        Parameters
+        ----------
+        path_items: list[tuple[str, SelectionItem]]
+            the boxes to translate, with the file path each belongs to
+
+        Side Effects
+        ------------
+            A job is submitted to ocr_jobs
+        """
+        if len(path_items) > 0:
+            self.ocr_jobs.submit_translations(path_items)
+
+    def auto_threshold_button_clicked(self, event=None):
+        """
+        Finds the threshold and inversion that give the most confident
+        scan of the current selection box, in the background. The box is
+        scanned again with them once they're found.
+
         Parameters
         ----------
         event: event
@@ -1336,32 +6287,119 @@ class Controller:
 
         Side Effects
         ------------
-            The ocr area is updated
-            The translation area is updated
-            The value of model's selection_item_data is changed
-            The preview image is updated
+            A job is submitted to ocr_jobs
         """
-        img2 = self.image.crop([self.view.box_x_position.get(), self.view.box_y_position.get(
-        ), self.view.box_x_position.get()+self.view.box_width.get(), self.view.box_y_position.get()+self.view.box_height.get()])
-        ocr_output = run_ocr(img2, self.model.selection_item_data[self.path][self.view.selection_index].is_inverted,
-                             self.model.selection_item_data[self.path][self.view.selection_index].is_vertical, self.view.sidepanel.threshold.get())
-        self.update_ocr(ocr_output)
-        self.update_translation(ocr_output)
-        self.model.selection_item_data[self.path][self.view.selection_index].threshold = self.view.sidepanel.threshold.get(
-        )
-        self.update_preview_image()
+        item = self.get_current_item()
+        if item is not None:
+            self.ocr_jobs.submit_auto_threshold(
+                self.path, item, self.page.crop(item.coords))
 
-    def update_translation(self, ocr_output: str):
-        self.view.sidepanel.translation_area.delete("1.0", END)
-        if ocr_output != '':
-            translation = get_translation(ocr_output)
-            self.model.selection_item_data[self.path][self.view.selection_index].translation = translation
-            self.view.sidepanel.translation_area.insert(END, translation)
+    def get_current_item(self) -> SelectionItem:
+        """
+        Returns the active selection box, or None if the image has none
+        """
+        items = self.model.selection_item_data[self.path]
+        if self.view.selection_index < len(items):
+            return items[self.view.selection_index]
+        return None
 
-    def update_ocr(self, ocr_output: str):
-        self.model.selection_item_data[self.path][self.view.selection_index].ocr_output = ocr_output
-        self.view.sidepanel.ocr_area.delete("1.0", END)
-        self.view.sidepanel.ocr_area.insert(END, ocr_output)
+    def apply_job_result(self, kind: str, path: str, item: SelectionItem, value):
+        """
+        Stores the result of a background job and shows it if its box is
+        the active one. Called by ocr_jobs on the Tk thread.
+
+        Parameters
+        ----------
+        kind: str
+            'ocr', 'translation', 'threshold' or 'error'
+
+        path: str
+            the file path of the image the box belongs to
+
+        item: SelectionItem
+            the box the result is for
+
+        value: str | tuple[int, bool] | Exception
+            the ocr output, translation, (threshold, is_inverted) or error
+
+        Side Effects
+        ------------
+            * The value of model's selection_item_data is changed
+            * The ocr area or translation area may be updated
+            * An error is shown in the status label
+        """
+        if kind == 'error':
+            # the same failure for many boxes is shown once, see show_status
+            self.show_status(f"OCR or translation failed: {value}")
+            return
+        is_active = path == self.path and self.get_current_item() is item
+        if kind == 'threshold':
+            item.threshold, item.is_inverted = value
+            self.model.record_update(path, item)
+            if is_active:
+                self.view.sidepanel.is_inverted.set(int(item.is_inverted))
+                self.view.sidepanel.threshold.set(item.threshold)
+            if path == self.path:
+                # scan again with the settings that were found
+                self.ocr_jobs.submit(path, item, self.page.crop(item.coords))
+            return
+        if kind == 'ocr':
+            item.ocr_output = value
+            self.model.record_update(path, item)
+            self.view.sidepanel.cache_stats_label.configure(
+                text=format_cache_stats(ocr_cache.stats()))
+            if is_active:
+                self.set_ocr_output(value)
+        elif kind == 'translation':
+            item.translation = value
+            self.model.record_update(path, item)
+            self.view.sidepanel.translation_memory_stats_label.configure(
+                text=format_translation_memory_stats(translation_memory.stats()))
+            if is_active:
+                self.set_translation(value)
+
+    def show_box_busy(self, path: str, item: SelectionItem, busy: bool):
+        """
+        Shows or hides the busy indicator of a selection box.
+        Called by ocr_jobs when a job starts or stops.
+
+        Parameters
+        ----------
+        path: str
+            the file path of the image the box belongs to
+
+        item: SelectionItem
+            the box that started or stopped working
+
+        busy: bool
+            whether the box has a job running
+        """
+        index = self.model.index_of(path, item) if path == self.path else None
+        if index is not None:
+            self.view.show_busy(index, busy)
+
+    def refresh_busy_indicators(self):
+        """
+        Shows the busy indicator on every box of the current image that
+        has a job running, after the boxes have been redrawn or reordered
+        """
+        # rows keep their highlight when the boxes below them shift up
+        for row in list(self.view.busy_rows):
+            self.view.show_busy(row, False)
+        for item in self.ocr_jobs.get_busy_items(self.path):
+            index = self.model.index_of(self.path, item)
+            if index is not None:
+                self.view.show_busy(index, True)
+
+    def cancel_rethresholded_job(self, varname=None, idx=None, mode=None):
+        """
+        Cancels the job of the current selection box if the threshold
+        slider has moved away from the threshold it is scanning with
+        """
+        item = self.get_current_item()
+        job_threshold = None if item is None else self.ocr_jobs.get_threshold(item)
+        if job_threshold is not None and job_threshold != self.view.sidepanel.threshold.get():
+            self.ocr_jobs.cancel(item)
 
     def update_preview_image(self, varname=None, idx=None, mode=None):
         """
@@ -1372,17 +6410,33 @@ class Controller:
         ----------
         ???
 
+        Bursts of calls, such as dragging the threshold slider, are
+        coalesced into at most one render per frame by render_preview_image.
+
+        Side Effects
+        ------------
+            A call to render_preview_image is scheduled
+        """
+        if self.preview_render_pending is None:
+            self.preview_render_pending = self.root.after(
+                16, self.render_preview_image)
+
+    def render_preview_image(self):
+        """
+        Renders the preview image scheduled by update_preview_image
+
         Side Effects
         ------------
             The preview image is updated
         """
-        img = self.image.crop([self.view.box_x_position.get(), self.view.box_y_position.get(
+        self.preview_render_pending = None
+        item = self.get_current_item()
+        if item is None:
+            return
+        img = self.page.crop([self.view.box_x_position.get(), self.view.box_y_position.get(
         ), self.view.box_x_position.get()+self.view.box_width.get(), self.view.box_y_position.get()+self.view.box_height.get()])
-        img = ImageTk.PhotoImage(make_ocr_ready(
-            img, self.model.selection_item_data[self.path][self.view.selection_index].is_inverted, self.view.sidepanel.threshold.get()))
-        self.view.sidepanel.preview_image.create_image(
-            0, 0, image=img, anchor=tk.NW, tag="img")
-        self.view.sidepanel.preview_image.img = img  # Keep reference.
+        self.view.sidepanel.show_preview(make_ocr_ready(
+            img, item.is_inverted, self.view.sidepanel.threshold.get()))
 
     def export_button_clicked(self, event=None):
         """
@@ -1399,15 +6453,27 @@ class Controller:
         ------------
             An image file is created.
         """
-        img = self.image.copy()
-        draw = ImageDraw.Draw(img)
-        for i in self.model.selection_item_data[self.path]:
-            draw.rectangle([(i.coords[0], i.coords[1]),
-                           (i.coords[2], i.coords[3])], fill='white', width=0)
-            draw.text(((i.coords[0]+i.coords[2])/2, (i.coords[1]+i.coords[3])/2), text=self.text_wrap(i.translation,ImageFont.truetype("arial", 20),max_width=i.coords[2]-i.coords[0]),
-                      font=ImageFont.truetype("arial", 20), fill='black', anchor='mm')
-        img.save(self.source_directory + '/output/' +
-                 self.path.replace('.png', '-output.png'))
+        export_image(self.image, self.model.selection_item_data[self.path],
+                     get_output_path(self.source_directory, self.path))
+
+    def quit(self):
+        """
+        Saves any unsaved changes and closes the window. Bound to the
+        window's close button.
+
+        Side Effects
+        ------------
+            * the autosave thread is stopped
+            * the model is saved and its store closed
+            * the window is destroyed
+        """
+        if self.autosaver is not None:
+            self.autosaver.stop()
+        try:
+            self.model.close()
+        finally:
+            # the changes are in the journal even if it couldn't be compacted
+            self.root.destroy()
 
     def toggle_display_mode_button_clicked(self, event=None):
         """
@@ -1427,11 +6493,15 @@ class Controller:
             self.display_mode = "preview"
         else:
             self.display_mode = "box"
+        self.clear_boxes()
         self.set_boxes(self.path)
 
     def get_bounding_boxes_button_clicked(self, event=None):
         """
-        TODO
+        Adds a selection box for each block of text found by the detector
+        and scans them. With the tesseract detector the text comes from
+        the same whole page scan that found the boxes, and only boxes the
+        scan wasn't confident about are scanned again on their own.
 
         Parameters
         ----------
@@ -1441,79 +6511,133 @@ class Controller:
 
         Side Effects
         ------------
-            TODO
+            * selection boxes are added to model's selection_item_data
+            * page_ocr is updated
+            * jobs are submitted to ocr_jobs
         """
-        self.view.box_ids.clear()
-        self.view.canvas.delete('selection')
-        img = make_ocr_ready(self.image, False, 127)
-        custom_config = r'-l jpn+eng --psm 6'
-        d = pytesseract.image_to_data(
-            img, output_type=Output.DICT, config=custom_config)
-        n_boxes = len(d['text'])
-        for i in range(n_boxes):
-            # if int(float(d['conf'][i])) > 60:
-            if int(d['level'][i]) == 4:
-                (x, y, w, h) = (d['left'][i], d['top']
-                                [i], d['width'][i], d['height'][i])
-                self.model.add_row(self.path)
-                self.model.selection_item_data[self.path][len(
-                    self.model.selection_item_data[self.path])-1].coords = (x,y,x+w,y+h)
+        new_items, page_ocr = detect_selection_items(self.page, self.detector)
+        remaining = new_items
+        if page_ocr is not None:
+            self.page_ocr[self.path] = page_ocr
+            # the page scan already read most boxes, only the rest are scanned again
+            remaining = fill_from_page_ocr(new_items, page_ocr)
+        self.model.add_items(self.path, new_items)
+        # scanned together, packed onto as few sheets as possible
+        self.ocr_jobs.submit_batch(
+            self.path, [(item, self.page.crop(item.coords)) for item in remaining])
+        self.update_gui_with_file_data(self.path)
+        self.translate_items([(self.path, item) for item in new_items
+                              if item.ocr_output != "" and not self.ocr_jobs.is_busy(item)])
+
+    def group_boxes_clicked(self, event=None):
+        """
+        Joins the boxes of the current image that are pieces of the same
+        block of text into one box each, with group_fragments. The joined
+        box keeps the place and settings of the first of its pieces, and
+        their text, and is translated again.
+
+        Parameters
+        ----------
+        event: event
+            the key press event
+                not used
+
+        Side Effects
+        ------------
+            * selection boxes in model's selection_item_data are moved and deleted
+            * jobs are submitted to ocr_jobs
+        """
+        groups = [group for group in group_fragments(
+            self.model.selection_item_data[self.path]) if len(group) > 1]
+        deleted = []
+        for group in groups:
+            for item in group:
+                self.ocr_jobs.cancel(item)
+            coords, ocr_output = merge_fragments(group)
+            self.model.set_coords(self.path, group[0], coords)
+            group[0].ocr_output = ocr_output
+            group[0].translation = ""
+            self.model.record_update(self.path, group[0])
+            deleted.extend(group[1:])
+        self.model.delete_items(self.path, deleted)
         self.update_gui_with_file_data(self.path)
+        self.translate_items([(self.path, group[0]) for group in groups
+                              if group[0].ocr_output != ""])
 
-    def crop_intersecting_boxes(self, box: tuple[float, float, float, float], intersecting_boxes: list[int]):
-        for box_id in intersecting_boxes:
-            x0, y0, x1, y1 = self.view.canvas.coords(box_id)
+    def crop_intersecting_boxes(self, box: tuple[float, float, float, float], intersecting_boxes: list[SelectionItem]):
+        for item in intersecting_boxes:
+            x0, y0, x1, y1 = item.coords
             x0 = max(x0, box[0])
             y0 = max(y0, box[1])
             x1 = min(x1, box[2])
             y1 = min(y1, box[3])
-            self.model.selection_item_data[self.path][self.get_data_index_from_box_id(
-            box_id)].coords = (x0, y0, x1, y1)
+            self.model.set_coords(self.path, item, (x0, y0, x1, y1))
         self.update_gui_with_file_data(self.path)
 
-    def join_intersecting_boxes(self, intersecting_boxes: list[int]):
-        x0, y0, x1, y1 = self.get_bounding_box(intersecting_boxes)
-        self.model.selection_item_data[self.path][self.get_data_index_from_box_id(
-            intersecting_boxes[0])].coords = (x0, y0, x1, y1)
-        for box_id in intersecting_boxes:
-            if box_id != intersecting_boxes[0]:
-                self.model.delete_row(
-                    self.path, self.get_data_index_from_box_id(box_id))
-                self.view.box_ids.remove(box_id)
+    def join_intersecting_boxes(self, intersecting_boxes: list[SelectionItem]):
+        if len(intersecting_boxes) == 0:
+            return
+        self.model.set_coords(self.path, intersecting_boxes[0],
+                              self.get_bounding_box(intersecting_boxes))
+        for item in intersecting_boxes[1:]:
+            self.ocr_jobs.cancel(item)
+        self.model.delete_items(self.path, intersecting_boxes[1:])
         self.update_gui_with_file_data(self.path)
 
-    def get_bounding_box(self, intersecting_boxes: list[int]):
-        x0,y0,x1,y1 = self.view.canvas.coords(intersecting_boxes[0])
-        for box_id in intersecting_boxes:
-            box = self.view.canvas.coords(box_id)
+    def get_bounding_box(self, intersecting_boxes: list[SelectionItem]):
+        x0,y0,x1,y1 = intersecting_boxes[0].coords
+        for item in intersecting_boxes:
+            box = item.coords
             x0 = min(x0, box[0])
             y0 = min(y0, box[1])
             x1 = max(x1, box[2])
             y1 = max(y1, box[3])
         return (x0,y0,x1,y1)
 
-    def get_data_index_from_box_id(self, box_id):
-        return self.view.box_ids.index(box_id)
+    def delete_intersecting_boxes(self, intersecting_boxes: list[SelectionItem]):
+        for item in intersecting_boxes:
+            self.ocr_jobs.cancel(item)
+        self.model.delete_items(self.path, intersecting_boxes)
+        self.update_gui_with_file_data(self.path)
 
-    def delete_intersecting_boxes(self, intersecting_boxes: list[int]):
-        for box_id in intersecting_boxes:
-            self.model.delete_row(self.path, self.get_data_index_from_box_id(box_id))
-            self.view.box_ids.remove(box_id)
+    def split_intersecting_boxes(self, x: float, intersecting_boxes: list[SelectionItem]):
+        for item in intersecting_boxes:
+            x0, y0, x1, y1 = item.coords
+            self.model.set_coords(self.path, item, (x0, y0, x, y1))
+            self.model.add_row(self.path, (x, y0, x1, y1))
         self.update_gui_with_file_data(self.path)
 
-    def split_intersecting_boxes(self, x: float, intersecting_boxes: list[int]):
-        for box_id in intersecting_boxes:
-            x0, y0, x1, y1 = self.view.canvas.coords(box_id)
-            self.model.selection_item_data[self.path][self.get_data_index_from_box_id(
-                box_id)].coords = (x0, y0, x, y1)
-            self.model.add_row(self.path)
-            self.add_box((x, y0, x1, y1))
+    def fill_box(self, x: int, y: int):
+        """
+        Adds a box around the text of the speech balloon at a point, found
+        with find_balloon on the page thresholded at the current slider
+        settings, then scans and translates it once
+
+        Parameters
+        ----------
+        x, y: int
+            the clicked point, in page pixels
+
+        Side Effects
+        ------------
+            * a selection box is added to model's selection_item_data
+            * a job is submitted to ocr_jobs
+        """
+        threshold = self.view.sidepanel.threshold.get()
+        is_inverted = bool(self.view.sidepanel.is_inverted.get())
+        coords = find_balloon(self.page.get_binary(threshold, is_inverted), int(x), int(y))
+        if coords is None:
+            return
+        item = self.model.add_row(self.path, coords)
+        item.threshold = threshold
+        item.is_inverted = is_inverted
+        item.is_vertical = is_vertical_region(coords)
+        self.model.record_update(self.path, item)
         self.update_gui_with_file_data(self.path)
+        self.run_all_ops_on_current_selection()
 
     def add_box(self, box: tuple[float, float, float, float]):
-        self.model.add_row(self.path)
-        self.model.selection_item_data[self.path][len(
-            self.model.selection_item_data[self.path])-1].coords = box
+        self.model.add_row(self.path, box)
         self.update_gui_with_file_data(self.path)
 
     def next_tool_type(self):
@@ -1530,11 +6654,15 @@ class Controller:
         elif self.tool_type == ToolType.SPLIT:
             self.tool_type = ToolType.TRANSFORM
         elif self.tool_type == ToolType.TRANSFORM:
+            self.tool_type = ToolType.FILL
+        elif self.tool_type == ToolType.FILL:
             self.tool_type = ToolType.SELECT
         self.view.sidepanel.tool_type_label.configure(text=self.tool_type.name)
 
     def prev_tool_type(self):
         if self.tool_type == ToolType.SELECT:
+            self.tool_type = ToolType.FILL
+        elif self.tool_type == ToolType.FILL:
             self.tool_type = ToolType.TRANSFORM
         elif self.tool_type == ToolType.ADD:
             self.tool_type = ToolType.SELECT
@@ -1553,32 +6681,412 @@ class Controller:
     def set_tool_type(self, tool_type):
         self.tool_type = tool_type
         self.view.sidepanel.tool_type_label.configure(text=self.tool_type.name)
-    
-    def text_wrap(self, text:str, font: ImageFont, max_width):
-        lines = ""
-        # If the width of the text is smaller than image width
-        # we don't need to split it, just add it to the lines array
-        # and return
-        if font.getlength(text) <= max_width:
-            lines = text
-        else:
-            # split the line by spaces to get words
-            words = text.split(' ')  
-            i = 0
-            # append every word to a line while its width is shorter than image width
-            while i < len(words):
-                line = ''         
-                while i < len(words) and font.getlength(line + words[i]) <= max_width:                
-                    line = line + words[i] + " "
-                    i += 1
-                if not line:
-                    line = words[i]
-                    i += 1
-                # when the line gets longer than the max width do not append the word, 
-                # add the line to the lines array
-                lines = lines + "\n" + line if lines else line
-        return lines
+
+
+def process_page(source_directory: str, path: str, page_data: list[dict], detect: bool = True,
+                 translate: bool = True, export: bool = True, auto_threshold: bool = False,
+                 detector: str = 'regions', group: bool = False) -> tuple[str, list[dict], dict]:
+    """
+    Runs every step of scanlating a single page without the GUI.
+    Boxes are found with detect_selection_items if the page has none, then
+    any box without ocr output is scanned, any box without a translation
+    is translated, and finally the page is exported.
+    Runs in a worker process, so takes and returns plain dicts.
+
+    Parameters
+    ----------
+    source_directory: str
+        the path of the directory containing all the files to be translated
+
+    path: str
+        the file path of the image to be processed
+
+    page_data: list[dict]
+        the saved selection boxes of the page, as made by SelectionItem.to_dict
+
+    detect: bool
+        whether to find boxes on pages that have none
+
+    translate: bool
+        whether to translate boxes that have no translation
+
+    export: bool
+        whether to export the translated page
+
+    auto_threshold: bool
+        whether to pick the threshold of each box scanned with
+        find_best_threshold
+
+    detector: str
+        how boxes are found, one of DETECTORS
+
+    group: bool
+        whether to join the boxes found into one box per block of text
+        with group_fragments
+
+    Returns
+    -------
+        the file path, the updated selection boxes of the page and the
+        OCR cache and translation memory counts for this page
+    """
+    stats_before = {"ocr_cache": ocr_cache.stats(
+    ), "translation_memory": translation_memory.stats()}
+    image = ig.open(source_directory + "/" + path)
+    page = GrayscalePage(image)
+    # set_directory gives every page a single empty box, which isn't real data
+    selection_items = [SelectionItem.from_dict(d) for d in page_data
+                       if tuple(d["coords"]) != (0, 0, 0, 0)]
+    page_ocr = None
+    detected = False
+    if detect and len(selection_items) == 0:
+        selection_items, page_ocr = detect_selection_items(page, detector)
+        detected = True
+        if group:
+            merged = []
+            for fragments in group_fragments(selection_items):
+                fragments[0].coords = merge_fragments(fragments)[0]
+                merged.append(fragments[0])
+            selection_items = merged
+    remaining = [s for s in selection_items if s.ocr_output == ""]
+    # boxes from detect_text_regions are scanned on their own, that's the point of it
+    if not auto_threshold and not detected and len([s for s in remaining if has_default_settings(s)]) >= MIN_BOXES_FOR_PAGE_OCR:
+        page_ocr = scan_page(page.gray)
+    if not auto_threshold and page_ocr is not None:
+        # one scan of the page fills most boxes
+        remaining = fill_from_page_ocr(remaining, page_ocr)
+    remaining = [s for s in remaining if s.ocr_output == ""]
+    if auto_threshold:
+        for s in remaining:
+            s.threshold, s.is_inverted, confidence = find_best_threshold(
+                page.crop(s.coords), s.is_vertical)
+    # scanned together, packed onto as few sheets as possible
+    ocr_outputs = run_ocr_batch([(page.crop(s.coords), s.is_inverted, s.is_vertical, s.threshold)
+                                 for s in remaining])
+    for s, ocr_output in zip(remaining, ocr_outputs):
+        s.ocr_output = ocr_output
+    if translate:
+        translate_selection_items(selection_items)
+    if export:
+        export_image(image, selection_items,
+                     get_output_path(source_directory, path))
+    stats = {"ocr_cache": ocr_cache.stats(
+    ), "translation_memory": translation_memory.stats()}
+    stats = {name: {key: value - stats_before[name][key] for key, value in counts.items()}
+             for name, counts in stats.items()}
+    return path, [s.to_dict() for s in selection_items], stats
+
+
+def init_batch_worker(source_directory: str, translator: str, translator_options: dict, translation_memory_path: str):
+    """
+    Sets up the OCR cache, translation backend and translation memory of a
+    batch worker process
+
+    Parameters
+    ----------
+    source_directory: str
+        the path of the directory containing all the files to be translated
+
+    translator: str
+        the name of the translation backend, a key of TRANSLATION_BACKENDS
+
+    translator_options: dict
+        passed on to the translation backend
+
+    translation_memory_path: str
+        the path of the translation memory database
+    """
+    open_ocr_cache(source_directory)
+    set_translation_backend(make_translation_backend(
+        translator, **translator_options))
+    open_translation_memory(translation_memory_path)
+
+
+def get_batch_key(page_hash: str, page_data: list[dict], options: list) -> str:
+    """
+    Returns a hash of everything run_batch's result for a page depends
+    on, stored in the page index so unchanged pages can be skipped
+
+    Parameters
+    ----------
+    page_hash: str
+        the hash of the image file, from PageIndex
+
+    page_data: list[dict]
+        the page's boxes, in the form made by SelectionItem.to_dict
+
+    options: list
+        the run_batch options that change what is done to a page
+    """
+    return hashlib.sha256(json.dumps([page_hash, page_data, options], sort_keys=True,
+                                     ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def run_batch(source_directory: str, workers: int = None, detect: bool = True,
+              translate: bool = True, export: bool = True, translator: str = 'google',
+              translator_options: dict = None, translation_memory_path: str = None,
+              auto_threshold: bool = False, detector: str = 'regions', group: bool = False,
+              store_type: str = 'journal', reprocess: bool = False):
+    """
+    Processes every page in a directory on a process pool, then merges
+    the results into json-data.json. Pages whose image and boxes haven't
+    changed since they were last processed with the same options are
+    skipped.
+
+    Parameters
+    ----------
+    source_directory: str
+        the path of the directory containing all the files to be translated
+
+    workers: int
+        the number of worker processes, defaults to the number of cores
+
+    detect: bool
+        whether to find boxes on pages that have none
+
+    translate: bool
+        whether to translate boxes that have no translation
+
+    export: bool
+        whether to export the translated pages
+
+    translator: str
+        the name of the translation backend, a key of TRANSLATION_BACKENDS
+
+    translator_options: dict
+        passed on to the translation backend, see TranslationBackend
+
+    translation_memory_path: str
+        the path of the translation memory database, defaults to the
+        one in source_directory
+
+    auto_threshold: bool
+        whether to pick the threshold of each box scanned with
+        find_best_threshold
+
+    detector: str
+        how boxes are found on pages that have none, one of DETECTORS
+
+    group: bool
+        whether to join the boxes found into one box per block of text
+
+    store_type: str
+        where the project is saved, a key of PROJECT_STORES
+
+    reprocess: bool
+        whether to process unchanged pages as well
+
+    Side Effects
+    ------------
+        * json-data.json, or project.sqlite3, is created or updated
+        * the batch keys in page-index.json are updated
+        * translated images are created in the output directory
+    """
+    model = Model(store_type)
+    model.set_directory(source_directory)
+    # hash the pages, to find the ones that haven't changed
+    model.refresh_directory()
+    model.startup_check(source_directory)
+    if translation_memory_path is None:
+        translation_memory_path = get_translation_memory_path(source_directory)
+    # create the database before the workers race to
+    TranslationMemory(translation_memory_path).close()
+    failed = []
+    stats = {"ocr_cache": {"memory_hits": 0, "disk_hits": 0, "misses": 0},
+             "translation_memory": {"hits": 0, "misses": 0}}
+    options = [detect, translate, export, translator, auto_threshold, detector, group]
+    pages = {}
+    for path in model.paths:
+        page_data = [s.to_dict() for s in model.selection_item_data[path]]
+        entry = model.page_index.entries[path]
+        if (not reprocess and entry.get("batch_key") == get_batch_key(entry["hash"], page_data, options)
+                and (not export or os.path.isfile(get_output_path(source_directory, path)))):
+            continue
+        pages[path] = page_data
+    if len(pages) < len(model.paths):
+        print(f"Skipping {len(model.paths) - len(pages)} pages that haven't changed")
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                             initargs=(source_directory, translator, translator_options or {},
+                                       translation_memory_path)) as executor:
+        futures = {executor.submit(process_page, source_directory, path, page_data,
+                                   detect, translate, export, auto_threshold, detector, group): path
+                   for path, page_data in pages.items()}
+        for done, future in enumerate(as_completed(futures), 1):
+            path = futures[future]
+            try:
+                path, page_data, page_stats = future.result()
+            except Exception as e:
+                # keep whatever was already saved for this page
+                failed.append(path)
+                print(f"[{done}/{len(futures)}] {path} failed: {e!r}")
+                continue
+            model.set_items(path, [SelectionItem.from_dict(d) for d in page_data])
+            entry = model.page_index.entries[path]
+            entry["batch_key"] = get_batch_key(entry["hash"], page_data, options)
+            for name, counts in page_stats.items():
+                for key, value in counts.items():
+                    stats[name][key] += value
+            print(f"[{done}/{len(futures)}] {path}: {len(page_data)} boxes")
+    model.page_index.save()
+    # the journal store folds the results into json-data.json, exiting waits for it
+    model.close()
+    print(format_cache_stats(stats["ocr_cache"]))
+    print(format_translation_memory_stats(stats["translation_memory"]))
+    if failed:
+        print(f"{len(failed)} pages failed: {', '.join(sorted(failed))}")
+
+
+def run_store_benchmark(box_count: int = 100000, boxes_per_page: int = 50):
+    """
+    Times saving and loading a project of made up boxes with each way
+    of storing it, and prints the throughput in boxes per second
+
+    Parameters
+    ----------
+    box_count: int
+        the number of boxes in the project
+
+    boxes_per_page: int
+        the number of boxes on each page
+    """
+    rng = random.Random(0)
+    items = {}
+    for i in range(box_count):
+        s = SelectionItem()
+        x, y = rng.randrange(2000), rng.randrange(3000)
+        s.coords = (x, y, x + rng.randrange(20, 300), y + rng.randrange(20, 300))
+        s.ocr_output = "テキスト" * rng.randrange(1, 10)
+        s.translation = "text " * rng.randrange(1, 10)
+        s.is_vertical = rng.random() < 0.5
+        items.setdefault(f"page-{i // boxes_per_page:05d}.png", []).append(s)
+
+    def report(name: str, seconds: float):
+        print(f"{name:<28}{seconds * 1000:9.1f} ms {box_count / seconds:12,.0f} boxes/s")
+
+    start = time.perf_counter()
+    pages = {path: [s.to_dict() for s in page] for path, page in items.items()}
+    report("to_dict", time.perf_counter() - start)
+    start = time.perf_counter()
+    for page in pages.values():
+        for d in page:
+            SelectionItem.from_dict(d)
+    report("from_dict", time.perf_counter() - start)
+    with tempfile.TemporaryDirectory() as source_directory:
+        for name in ('journal', 'binary'):
+            journal = PROJECT_STORES[name](source_directory)
+            start = time.perf_counter()
+            journal.write_snapshot_file(journal.snapshot_path, dict(pages), 0)
+            report(f"{name} snapshot save", time.perf_counter() - start)
+            start = time.perf_counter()
+            loaded, _ = journal.read_snapshot()
+            report(f"{name} snapshot load", time.perf_counter() - start)
+            if loaded != pages:
+                print(f"{name} snapshot doesn't match what was saved")
+        store = SqliteProjectStore(source_directory)
+        store.open()
+        start = time.perf_counter()
+        for path, page in items.items():
+            store.record_page(path, page)
+        report("sqlite save, page by page", time.perf_counter() - start)
+        start = time.perf_counter()
+        for path in items:
+            store.load_page(path)
+        report("sqlite load, page by page", time.perf_counter() - start)
+        store.close()
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    """
+    Parses the command line arguments
+
+    Parameters
+    ----------
+    argv: list[str]
+        the arguments to parse, defaults to sys.argv
+    """
+    parser = argparse.ArgumentParser(
+        description='Scans, translates and exports manga pages.')
+    parser.add_argument('--batch', metavar='DIRECTORY',
+                        help='process every page in DIRECTORY without opening the GUI')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='number of pages processed in parallel (default: number of cores)')
+    parser.add_argument('--no-detect', dest='detect', action='store_false',
+                        help="don't find boxes on pages that have none")
+    parser.add_argument('--no-translate', dest='translate', action='store_false',
+                        help="don't translate boxes")
+    parser.add_argument('--no-export', dest='export', action='store_false',
+                        help="don't export translated pages")
+    parser.add_argument('--detector', choices=DETECTORS, default='regions',
+                        help="how boxes are found, 'tesseract' uses the text lines of a whole page scan "
+                        "(default: regions)")
+    parser.add_argument('--reprocess', action='store_true',
+                        help="process pages even if they haven't changed since the last batch run")
+    parser.add_argument('--group', action='store_true',
+                        help='join the boxes found on a page into one box per block of text, '
+                        'useful with --detector tesseract')
+    parser.add_argument('--store', choices=sorted(PROJECT_STORES), default='journal',
+                        help="where boxes are saved, 'sqlite' keeps them in project.sqlite3 and only reads "
+                        "the pages that are opened, importing json-data.json the first time, 'binary' "
+                        "compacts the journal into project.bin instead of json-data.json (default: journal)")
+    parser.add_argument('--benchmark-store', type=int, nargs='?', const=100000, metavar='BOXES',
+                        help='time saving and loading a project of BOXES made up boxes with each --store '
+                        '(default: 100000), then exit')
+    parser.add_argument('--autosave', type=float, default=30, metavar='SECONDS',
+                        help='seconds between background saves in the GUI, 0 to only save by hand (default: 30)')
+    parser.add_argument('--prefetch-pages', type=int, default=2,
+                        help='pages either side of the open one decoded ahead in the GUI (default: 2)')
+    parser.add_argument('--page-cache-size', type=int, default=512, metavar='MB',
+                        help='memory kept for decoded pages in the GUI (default: 512)')
+    parser.add_argument('--auto-threshold', action='store_true',
+                        help='pick the threshold of each box scanned by trying several')
+    parser.add_argument('--translator', choices=sorted(TRANSLATION_BACKENDS), default='google',
+                        help="translation backend, 'mock' works offline (default: google)")
+    parser.add_argument('--dictionary', metavar='FILE',
+                        help="dictionary for the 'dictionary' translator, a JSON object or tab separated pairs")
+    parser.add_argument('--source-language', default='ja',
+                        help='language translated from (default: ja)')
+    parser.add_argument('--target-language', default='en',
+                        help='language translated to (default: en)')
+    parser.add_argument('--max-in-flight', type=int, default=4,
+                        help='most translation requests waiting for a reply at once (default: 4)')
+    parser.add_argument('--rate', type=float,
+                        help='most translation requests sent per second (default: no limit)')
+    parser.add_argument('--timeout', type=float, default=30,
+                        help='seconds before a translation request is retried (default: 30)')
+    parser.add_argument('--retries', type=int, default=4,
+                        help='times a failed translation request is retried (default: 4)')
+    parser.add_argument('--translation-memory', metavar='FILE',
+                        help='translation memory database, can be shared by every chapter of a series '
+                        '(default: translation-memory.sqlite3 in DIRECTORY)')
+    return parser.parse_args(argv)
+
+
+def get_translator_options(args: argparse.Namespace) -> dict:
+    """
+    Returns the translation backend options given on the command line
+
+    Parameters
+    ----------
+    args: argparse.Namespace
+        the result of parse_args
+    """
+    options = dict(src=args.source_language, dest=args.target_language, max_in_flight=args.max_in_flight,
+                   rate=args.rate, timeout=args.timeout, max_retries=args.retries)
+    if args.translator == 'dictionary':
+        options['dictionary_path'] = args.dictionary
+    return options
+
 
 if __name__ == '__main__':
-    c = Controller()
-    c.root.mainloop()
+    args = parse_args()
+    translator_options = get_translator_options(args)
+    if args.benchmark_store:
+        run_store_benchmark(args.benchmark_store)
+    elif args.batch:
+        run_batch(args.batch, args.workers, args.detect, args.translate, args.export,
+                  args.translator, translator_options, args.translation_memory, args.auto_threshold,
+                  args.detector, args.group, args.store, args.reprocess)
+    else:
+        set_translation_backend(make_translation_backend(
+            args.translator, **translator_options))
+        c = Controller(args.detector, args.prefetch_pages, args.page_cache_size, args.store, args.autosave)
+        c.root.mainloop()
@@ -0,0 +1,66 @@
+"""
+Drives MockTranslationBackend through translate_batch, checking how texts
+are split into requests, that repeated texts are sent once and that failed
+requests are retried.
+"""
+import importlib.util
+import os
+
+import pytest
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "novice-scanlator.py")
+
+
+@pytest.fixture(scope="module")
+def scanlator():
+    # the script's name isn't a valid module name, so it is loaded by path
+    spec = importlib.util.spec_from_file_location("novice_scanlator", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def no_translation_memory(scanlator):
+    # translations remembered by one test would keep the next from sending them
+    scanlator.translation_memory = None
+
+
+def test_batches_split_by_size(scanlator):
+    backend = scanlator.MockTranslationBackend(max_batch_size=2, max_in_flight=1)
+    texts = ["one", "two", "three", "four", "five"]
+    assert backend.translate_batch(texts) == ["[en] " + text for text in texts]
+    assert backend.batches == [["one", "two"], ["three", "four"], ["five"]]
+    assert backend.requests == 3
+
+
+def test_batches_split_by_chars(scanlator):
+    # each text counts its length and a separator
+    backend = scanlator.MockTranslationBackend(max_batch_chars=8, max_in_flight=1)
+    assert backend.translate_batch(["aaa", "bbb", "ccc"]) == ["[en] aaa", "[en] bbb", "[en] ccc"]
+    assert backend.batches == [["aaa", "bbb"], ["ccc"]]
+
+
+def test_repeated_texts_sent_once(scanlator):
+    backend = scanlator.MockTranslationBackend()
+    # fullwidth forms and extra whitespace normalize to the same text
+    texts = ["ＡＢＣ", "ABC", " ABC\n", "def", "ABC", ""]
+    assert backend.translate_batch(texts) == ["[en] ABC"] * 3 + ["[en] def", "[en] ABC", ""]
+    assert backend.batches == [["ABC", "def"]]
+    assert backend.requests == 1
+
+
+def test_failed_requests_retried(scanlator):
+    backend = scanlator.MockTranslationBackend(fail_first=2, max_retries=2)
+    assert backend.translate_batch(["hello"]) == ["[en] hello"]
+    assert backend.batches == [["hello"]] * 3
+    assert backend.requests == 3
+    assert backend.failures == 2
+
+
+def test_gives_up_after_max_retries(scanlator):
+    backend = scanlator.MockTranslationBackend(fail_first=3, max_retries=2)
+    with pytest.raises(ConnectionError):
+        backend.translate_batch(["hello"])
+    assert backend.requests == 3
+    assert backend.failures == 3